@@ -1,6 +1,16 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import attach, attach_group, client, login, request, user
+from app.api.v1.endpoints import (
+    attach,
+    attach_group,
+    client,
+    events,
+    login,
+    request,
+    stats,
+    sync,
+    user,
+)
 
 api_router = APIRouter()
 api_router.include_router(login.router, prefix="/login", tags=["login"])
@@ -11,3 +21,6 @@ api_router.include_router(
     attach_group.router, prefix="/attachs/groups", tags=["attachs"]
 )
 api_router.include_router(attach.router, prefix="/attachs", tags=["attachs"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
@@ -19,6 +19,7 @@ from sqlalchemy import exc
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.response_cache import read_through
 from app.core.security import get_auth_user
 from app.crud.attach import CRUDAttach
 from app.db import get_session
@@ -57,11 +58,16 @@ async def get_attach_data(
     _: Annotated["User", Security(get_auth_user, scopes=("attach.get",))],
     session: Annotated[AsyncSession, Depends(get_session)],
 ):
-    attach = await CRUDAttach(session).fetch(attach_id, selectinload_fields=["*"])
-    if attach is None:
+    response = await read_through(
+        "get_attach_data",
+        attach_id,
+        AttachRead,
+        lambda: CRUDAttach(session).fetch(attach_id, selectinload_fields=["*"]),
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Attach not found")
 
-    return attach
+    return response
 
 
 @router.get("", response_model=list[AttachRead])
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Security
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.response_cache import read_through
 from app.core.security import get_auth_user
 from app.crud.attach_group import CRUDAttachGroup
 from app.db import get_session
@@ -23,10 +24,15 @@ async def get_attach_group(
     _: Annotated["User", Security(get_auth_user, scopes=("attach.get",))],
     session: Annotated[AsyncSession, Depends(get_session)],
 ):
-    attach_group = await CRUDAttachGroup(session).fetch(attach_group_id)
-    if attach_group is None:
+    response = await read_through(
+        "get_attach_group",
+        attach_group_id,
+        AttachGroupRead,
+        lambda: CRUDAttachGroup(session).fetch(attach_group_id),
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Attach Group not found")
-    return attach_group
+    return response
 
 
 @router.get("", response_model=list[AttachGroupRead])
@@ -1,19 +1,108 @@
+import csv
+from itertools import islice
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Security
-from sqlmodel import col, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Security,
+    UploadFile,
+)
+from pydantic import ValidationError
+from pydantic_extra_types.phone_numbers import PhoneNumber
 from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
+from app.core.notify import change_listener
+from app.core.response_cache import read_through
 from app.core.security import get_auth_user
 from app.crud.client import CRUDClient
 from app.crud.user import CRUDUser
 from app.db import get_session
 from app.models import Client, User
-from app.schemas.client import ClientCreate, ClientRead, ClientUpdate
+from app.schemas.client import (
+    ClientCallerRead,
+    ClientCreate,
+    ClientFilter,
+    ClientImportResult,
+    ClientImportRowResult,
+    ClientImportStatus,
+    ClientRead,
+    ClientUpdate,
+)
+from app.utils.cache import LRUCache
+from app.utils.rows import RowsFormat, read_rows, rows_response
 
 router = APIRouter()
 
+# Caller ID lookups by E.164 phone, evicted on changes of their rows by any
+# worker and expiring in time for new requests of clients
+caller_cache: LRUCache[str, ClientCallerRead] = LRUCache(
+    settings.CALLER_ID_CACHE_SIZE, settings.CALLER_ID_CACHE_TTL
+)
+change_listener.register_cache(caller_cache, ("client", "user", "request"))
+
+
+@router.get("/by-phone/{number}", response_model=ClientCallerRead)
+async def get_client_by_phone(
+    number: PhoneNumber,
+    _: Annotated["User", Security(get_auth_user, scopes=("client.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """
+    Caller ID: the oldest client having the phone number, with their open
+    requests, most recently updated first.
+    """
+    client = caller_cache.get(number)
+    if client is None:
+        found = await CRUDClient(session).fetch_by_phone(number)
+        if found is None:
+            raise HTTPException(status_code=404, detail="Client not found")
+        client, requests = found
+        client = ClientCallerRead.model_validate(
+            client, update={"open_requests": requests}
+        )
+        caller_cache.set(
+            number,
+            client,
+            tags=(
+                ("client", str(client.id)),
+                ("user", str(client.user.id)),
+                *(("request", str(request.id)) for request in requests),
+            ),
+        )
+    return client
+
+
+@router.get("/export")
+async def export_clients(
+    _: Annotated["User", Security(get_auth_user, scopes=("client.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    rows_format: Annotated[RowsFormat, Query(alias="format")] = RowsFormat.csv,
+    ids: Annotated[list[UUID] | None, Query()] = None,
+    first_name: Annotated[str | None, Query()] = None,
+    last_name: Annotated[str | None, Query()] = None,
+):
+    """
+    All clients matching the filters of `GET /clients` as a CSV or NDJSON
+    file, streamed from the database in constant memory.
+    """
+    crud_client = CRUDClient(session)
+    query = crud_client.export_query(
+        ClientFilter(ids=ids, first_name=first_name, last_name=last_name)
+    )
+    return rows_response(
+        crud_client.stream_many(query),
+        list(query.selected_columns.keys()),
+        rows_format,
+        "clients",
+    )
+
 
 @router.get("/{client_id}", response_model=ClientRead)
 async def get_client(
@@ -21,12 +110,17 @@ async def get_client(
     _: Annotated["User", Security(get_auth_user, scopes=("client.get",))],
     session: Annotated[AsyncSession, Depends(get_session)],
 ):
-    client = await CRUDClient(session).fetch(
-        obj_id=client_id, selectinload_fields=[Client.user]
+    response = await read_through(
+        "get_client",
+        client_id,
+        ClientRead,
+        lambda: CRUDClient(session).fetch(
+            obj_id=client_id, selectinload_fields=[Client.user]
+        ),
     )
-    if client is None:
+    if response is None:
         raise HTTPException(status_code=404, detail="Client not found")
-    return client
+    return response
 
 
 @router.get("", response_model=list[ClientRead])
@@ -39,19 +133,12 @@ async def get_clients(
     first_name: Annotated[str | None, Query()] = None,
     last_name: Annotated[str | None, Query()] = None,
 ):
-    statement = select(Client)
-
-    if ids is not None:
-        statement = statement.where(col(Client.id).in_(ids))
-    if first_name or last_name:
-        statement = statement.join(User)
-        if first_name:
-            statement = statement.where(col(User.first_name).contains(first_name))
-        if last_name:
-            statement = statement.where(col(User.last_name).contains(last_name))
-
-    return await CRUDClient(session).fetch_many(
-        skip, limit, statement, selectinload_fields=[Client.user]
+    crud_client = CRUDClient(session)
+    query = crud_client.filter_query(
+        ClientFilter(ids=ids, first_name=first_name, last_name=last_name)
+    )
+    return await crud_client.fetch_many(
+        skip, limit, query, selectinload_fields=[Client.user]
     )
 
 
@@ -66,9 +153,13 @@ async def update_client(
     client = await crud_client.fetch(client_id, selectinload_fields=[Client.user])
     if client is None:
         raise HTTPException(status_code=404, detail="Client not found")
+    old_phone = client.user.phone
 
     client = await crud_client.update(client, updated_client)
     await client.awaitable_attrs.user
+    for phone in (old_phone, client.user.phone):
+        if phone:
+            caller_cache.pop(phone)
     return client
 
 
@@ -87,6 +178,8 @@ async def remove_client(
     client_read = ClientRead.model_validate(client)
 
     await CRUDUser(session).remove(client.user)
+    if client_read.user.phone:
+        caller_cache.pop(client_read.user.phone)
 
     return client_read
 
@@ -100,3 +193,85 @@ async def create_client(
     client = await CRUDClient(session).create(new_user)
     await client.awaitable_attrs.user
     return client
+
+
+def _guess_rows_format(file: UploadFile) -> RowsFormat:
+    filename = (file.filename or "").lower()
+    if filename.endswith(".csv") or file.content_type == "text/csv":
+        return RowsFormat.csv
+    if filename.endswith((".ndjson", ".jsonl")) or file.content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return RowsFormat.ndjson
+    raise HTTPException(
+        status_code=400, detail="Unknown file format, specify it explicitly"
+    )
+
+
+@router.post("/import", response_model=ClientImportResult)
+async def import_clients(
+    file: Annotated[UploadFile, File()],
+    _: Annotated[
+        "User", Security(get_auth_user, scopes=("client.create", "client.update"))
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    rows_format: Annotated[RowsFormat | None, Query(alias="format")] = None,
+):
+    rows = read_rows(file.file, rows_format or _guess_rows_format(file))
+    crud_client = CRUDClient(session)
+    results: list[ClientImportRowResult] = []
+
+    try:
+        # The file is read in a thread pool, as it may be spooled to disk
+        while batch := await run_in_threadpool(
+            list, islice(rows, settings.CLIENT_IMPORT_BATCH_SIZE)
+        ):
+            valid_rows = []
+            for row_number, row in batch:
+                try:
+                    if isinstance(row, ValueError):
+                        raise row
+                    valid_rows.append(
+                        (
+                            row_number,
+                            ClientCreate.model_validate({"phone": None, **row}),
+                        )
+                    )
+                except ValidationError as err:
+                    results.append(
+                        ClientImportRowResult(
+                            row=row_number,
+                            status=ClientImportStatus.invalid,
+                            errors=[
+                                f"{'.'.join(map(str, e['loc']))}: {e['msg']}"
+                                for e in err.errors()
+                            ],
+                        )
+                    )
+                except ValueError as err:
+                    results.append(
+                        ClientImportRowResult(
+                            row=row_number,
+                            status=ClientImportStatus.invalid,
+                            errors=[str(err)],
+                        )
+                    )
+            if valid_rows:
+                results.extend(await crud_client.import_batch(valid_rows))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Can't read the file after row {len(results)}: {e}",
+        ) from e
+    finally:
+        await file.close()
+
+    results.sort(key=lambda result: result.row)
+    return ClientImportResult(
+        **{
+            status.value: sum(result.status == status for result in results)
+            for status in ClientImportStatus
+        },
+        rows=results,
+    )
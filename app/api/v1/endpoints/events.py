@@ -0,0 +1,96 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.notify import change_listener
+from app.core.revocation import revocation_filter
+from app.core.security import get_auth_user, get_token_data
+from app.crud.user import CRUDUser
+from app.db import get_session
+from app.models import User
+from app.schemas.security import TokenData
+
+router = APIRouter()
+
+# Scopes required to get events of entities
+EVENT_ENTITY_SCOPES = {
+    "request": "request.get",
+    "client": "client.get",
+    "attach": "attach.get",
+}
+
+
+async def stream_events(
+    entities: frozenset[str],
+    login_id: UUID,
+    expires_at: datetime,
+    keepalive_interval: int = settings.EVENTS_KEEPALIVE_INTERVAL,
+) -> AsyncIterator[str]:
+    with change_listener.subscribe(entities) as subscription:
+        while (timeout := (expires_at - datetime.now()).total_seconds()) > 0:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), min(timeout, keepalive_interval)
+                )
+            except TimeoutError:
+                # Keeps idle connections open through proxies
+                frame = ": keepalive\n\n"
+            else:
+                if event is None:
+                    frame = "event: reset\ndata: {}\n\n"
+                else:
+                    frame = f"event: change\ndata: {event.payload}\n\n"
+            # Tokens are checked once, when the stream opens, so it ends when
+            # its login is revoked meanwhile, e.g. on logout
+            if login_id in revocation_filter:
+                return
+            yield frame
+
+
+@router.get("")
+async def get_events(
+    user: Annotated["User", Security(get_auth_user)],
+    token_data: Annotated[TokenData, Depends(get_token_data)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    """
+    Server-Sent Events stream of changes of requests, clients and attachs the
+    user has permissions to get.
+
+    `change` events have the `entity`, the `action` (insert, update or delete)
+    and `ids` of changed objects. `reset` events mean that events were lost
+    (the client was too slow or the server reconnected to the database), so
+    data should be reloaded, e.g. by GET /sync. The stream ends when the
+    access token expires or its login is revoked.
+    """
+    if user.id == settings.SUPERUSER_ID:
+        scopes = set(EVENT_ENTITY_SCOPES.values())
+    else:
+        scopes = await CRUDUser(session).fetch_granted_scopes(
+            user.id, list(EVENT_ENTITY_SCOPES.values())
+        )
+    entities = frozenset(
+        entity for entity, scope in EVENT_ENTITY_SCOPES.items() if scope in scopes
+    )
+    if not entities:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not enough permissions",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Dependencies with yield may only be closed after the response is sent
+    # (FastAPI >= 0.118), the connection isn't to be held for the stream
+    await session.close()
+    return StreamingResponse(
+        stream_events(entities, token_data.login_id, token_data.expires_at),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
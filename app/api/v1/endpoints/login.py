@@ -1,18 +1,24 @@
 from datetime import timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, requests
+from fastapi import APIRouter, Depends, Form, HTTPException, Security, requests, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.audit import login_audit
 from app.core.config import settings
+from app.core.revocation import revocation_filter
 from app.core.security import (
     authenticate_user,
     create_access_token,
+    get_auth_user,
+    get_token_data,
 )
+from app.crud.refresh_token import CRUDRefreshToken
+from app.crud.user import CRUDUser
 from app.db import get_session
-from app.models import UserLoginSucceed
-from app.schemas.security import TokenScheme
+from app.models import User, UserLoginSucceed
+from app.schemas.security import TokenData, TokenScheme
 from app.utils.rate_limit import limiter
 
 router = APIRouter()
@@ -33,8 +39,6 @@ async def login_for_access_token(
             "user_agent": request.headers.get("User-Agent"),
         },
     )
-    session.add(user_login_succeed)
-    await session.flush()
     access_token = create_access_token(
         data={
             "sub": str(user.id),
@@ -42,7 +46,65 @@ async def login_for_access_token(
         },
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
+    # Falls back to the session, committed together with the login attempts reset
+    login_audit.write(user_login_succeed, session)
+    refresh_token = CRUDRefreshToken(session).issue(user_login_succeed.id, user.id)
 
     await session.commit()
 
-    return TokenScheme(access_token=access_token, token_type="bearer")
+    return TokenScheme(
+        access_token=access_token, token_type="bearer", refresh_token=refresh_token
+    )
+
+
+@router.post("/refresh")
+async def refresh_access_token(
+    refresh_token: Annotated[str, Form()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> TokenScheme:
+    """
+    Exchange the refresh token for new access and refresh tokens of the same
+    login. A refresh token can be used only once, reusing it revokes the login.
+    """
+    invalid_exc = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    crud_refresh_token = CRUDRefreshToken(session)
+
+    result = await crud_refresh_token.use(refresh_token)
+    if result is None:
+        if revoked := await crud_refresh_token.revoke_reused(refresh_token):
+            revocation_filter.add(*revoked)
+        raise invalid_exc
+
+    user, login_id = result
+    if not user.is_active or login_id in revocation_filter:
+        raise invalid_exc
+
+    access_token = create_access_token(
+        data={"sub": str(user.id), "login_id": str(login_id)},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    new_refresh_token = crud_refresh_token.issue(login_id, user.id)
+
+    await session.commit()
+
+    return TokenScheme(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=new_refresh_token,
+    )
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+    _: Annotated[User, Security(get_auth_user)],
+    token_data: Annotated[TokenData, Depends(get_token_data)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> None:
+    await CRUDUser(session).revoke_login(
+        token_data.login_id, token_data.id, token_data.expires_at
+    )
+    revocation_filter.add(token_data.login_id, token_data.expires_at)
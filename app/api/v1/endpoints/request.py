@@ -1,36 +1,227 @@
-from typing import Annotated
+from collections.abc import Callable
+from datetime import datetime
+from typing import Annotated, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Security
-from sqlmodel import col, select
+from sqlalchemy import exc
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.response_cache import read_through
 from app.core.security import get_auth_user
+from app.crud.base import IOrderEnum
 from app.crud.request import CRUDRequest
+from app.crud.request_history import CRUDRequestHistory
 from app.db import get_session
-from app.models import Client, Request, User
+from app.models import User
+from app.models.request import RequestStatus
 from app.schemas.request import (
+    RequestBoardColumn,
+    RequestBulkResult,
+    RequestBulkStatus,
+    RequestBulkUpdate,
     RequestCreate,
     RequestCreateWithNewClient,
+    RequestFilter,
+    RequestHistoryCreate,
+    RequestHistoryPage,
+    RequestHistoryRead,
+    RequestOrderBy,
     RequestRead,
+    RequestSearchResult,
     RequestUpdate,
 )
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.rows import RowsFormat, rows_response
 
 router = APIRouter()
 
 
+def parse_cursor(cursor: str, *types: Callable[[Any], Any]) -> tuple[Any, ...]:
+    """Values of a cursor converted by `types`, 400 if it's malformed."""
+    try:
+        values = decode_cursor(cursor)
+        return tuple(type_(value) for type_, value in zip(types, values, strict=True))
+    # Values of a wrong JSON type may raise any of them, e.g. UUID(5)
+    except (ValueError, TypeError, AttributeError) as err:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from err
+
+
+def parse_board_cursor(cursor: str) -> tuple[RequestStatus, datetime, UUID]:
+    return parse_cursor(cursor, RequestStatus, datetime.fromisoformat, UUID)
+
+
+@router.get("/board", response_model=list[RequestBoardColumn])
+async def get_requests_board(
+    _: Annotated["User", Security(get_auth_user, scopes=("request.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    statuses: Annotated[list[RequestStatus] | None, Query()] = None,
+    cursors: Annotated[list[str] | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    """
+    Pipeline board: the number of requests and the most recently updated ones
+    for each status. To load more requests of a column, pass its `next_cursor`
+    in `cursors`. Returns columns of `statuses`, by default of all statuses
+    or only of the passed `cursors`.
+    """
+    keysets = {
+        status: (updated_at, request_id)
+        for status, updated_at, request_id in map(parse_board_cursor, cursors or ())
+    }
+    columns = dict.fromkeys(statuses or keysets or RequestStatus)
+    columns.update((status, keysets[status]) for status in columns & keysets.keys())
+
+    board = await CRUDRequest(session).fetch_board(columns, limit)
+
+    result = []
+    for status, (count, requests) in board.items():
+        next_cursor = None
+        if len(requests) > limit:
+            requests = requests[:limit]
+            next_cursor = encode_cursor(
+                status, requests[-1].updated_at, requests[-1].id
+            )
+        result.append(
+            RequestBoardColumn(
+                status=status,
+                count=count,
+                requests=requests,
+                next_cursor=next_cursor,
+            )
+        )
+    return result
+
+
+@router.get("/search", response_model=list[RequestSearchResult])
+async def search_requests(
+    _: Annotated["User", Security(get_auth_user, scopes=("request.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    """
+    Full-text search by beginnings of words in notes and numbers in program,
+    or by an exact number in program, most relevant requests first.
+    """
+    return [
+        RequestSearchResult(
+            request=request,
+            rank=rank,
+            note_headline=note_headline,
+            number_in_program_headline=number_in_program_headline,
+        )
+        for request, rank, note_headline, number_in_program_headline in (
+            await CRUDRequest(session).search(q, skip, limit)
+        )
+    ]
+
+
+@router.get("/export")
+async def export_requests(
+    _: Annotated["User", Security(get_auth_user, scopes=("request.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    rows_format: Annotated[RowsFormat, Query(alias="format")] = RowsFormat.csv,
+    ids: Annotated[list[UUID] | None, Query()] = None,
+    first_name: Annotated[str | None, Query()] = None,
+    status: Annotated[list[RequestStatus] | None, Query()] = None,
+    closed: Annotated[bool | None, Query()] = None,
+    request_service_id: Annotated[int | None, Query()] = None,
+    client_id: Annotated[UUID | None, Query()] = None,
+    created_from: Annotated[datetime | None, Query()] = None,
+    created_to: Annotated[datetime | None, Query()] = None,
+    updated_from: Annotated[datetime | None, Query()] = None,
+    updated_to: Annotated[datetime | None, Query()] = None,
+    order_by: Annotated[RequestOrderBy, Query()] = RequestOrderBy.id,
+    order: Annotated[IOrderEnum, Query()] = IOrderEnum.ascendent,
+):
+    """
+    All requests matching the filters of `GET /requests`, with the names and
+    contacts of their clients, as a CSV or NDJSON file streamed from the
+    database in constant memory.
+    """
+    crud_request = CRUDRequest(session)
+    query = crud_request.export_query(
+        RequestFilter(
+            ids=ids,
+            first_name=first_name,
+            status=status,
+            closed=closed,
+            request_service_id=request_service_id,
+            client_id=client_id,
+            created_from=created_from,
+            created_to=created_to,
+            updated_from=updated_from,
+            updated_to=updated_to,
+        )
+    )
+    return rows_response(
+        crud_request.stream_many(query, order_by.value, order),
+        list(query.selected_columns.keys()),
+        rows_format,
+        "requests",
+    )
+
+
 @router.get("/{request_id}", response_model=RequestRead)
 async def get_request(
     request_id: UUID,
     _: Annotated["User", Security(get_auth_user, scopes=("request.get",))],
     session: Annotated[AsyncSession, Depends(get_session)],
 ):
-    request = await CRUDRequest(session).fetch(
-        obj_id=request_id, selectinload_fields=["*"]
+    response = await read_through(
+        "get_request",
+        request_id,
+        RequestRead,
+        lambda: CRUDRequest(session).fetch(
+            obj_id=request_id, selectinload_fields=["*"]
+        ),
     )
-    if request is None:
+    if response is None:
         raise HTTPException(status_code=404, detail="Request not found")
-    return request
+    return response
+
+
+def parse_history_cursor(cursor: str) -> tuple[datetime, UUID]:
+    return parse_cursor(cursor, datetime.fromisoformat, UUID)
+
+
+@router.get("/{request_id}/history", response_model=RequestHistoryPage)
+async def get_request_history(
+    request_id: UUID,
+    _: Annotated["User", Security(get_auth_user, scopes=("request.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
+):
+    """Request history, latest records first."""
+    before = parse_history_cursor(cursor) if cursor else None
+    if await CRUDRequest(session).fetch(request_id) is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+
+    records = await CRUDRequestHistory(session).fetch_page(
+        request_id, limit + 1, before
+    )
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor(records[-1].created_at, records[-1].id)
+    return RequestHistoryPage(items=records, next_cursor=next_cursor)
+
+
+@router.post(
+    "/{request_id}/history", status_code=201, response_model=RequestHistoryRead
+)
+async def create_request_history(
+    request_id: UUID,
+    new_record: RequestHistoryCreate,
+    user: Annotated["User", Security(get_auth_user, scopes=("request.update",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    return await CRUDRequestHistory(session).create(
+        new_record, request_id, author_id=user.id
+    )
 
 
 @router.get("", response_model=list[RequestRead])
@@ -41,20 +232,38 @@ async def get_requests(
     limit: Annotated[int, Query()] = 100,
     ids: Annotated[list[UUID] | None, Query()] = None,
     first_name: Annotated[str | None, Query()] = None,
+    status: Annotated[list[RequestStatus] | None, Query()] = None,
+    closed: Annotated[bool | None, Query()] = None,
+    request_service_id: Annotated[int | None, Query()] = None,
+    client_id: Annotated[UUID | None, Query()] = None,
+    created_from: Annotated[datetime | None, Query()] = None,
+    created_to: Annotated[datetime | None, Query()] = None,
+    updated_from: Annotated[datetime | None, Query()] = None,
+    updated_to: Annotated[datetime | None, Query()] = None,
+    order_by: Annotated[RequestOrderBy, Query()] = RequestOrderBy.id,
+    order: Annotated[IOrderEnum, Query()] = IOrderEnum.ascendent,
 ):
-    statement = select(Request)
-
-    if ids is not None:
-        statement = statement.where(col(Request.id).in_(ids))
-    if first_name:
-        statement = (
-            statement.join(Client)
-            .join(User)
-            .where(col(User.first_name).contains(first_name))
+    """
+    `closed` filters by `CLOSED_REQUEST_STATUSES`, `*_from` bounds are
+    inclusive and `*_to` bounds are exclusive.
+    """
+    crud_request = CRUDRequest(session)
+    query = crud_request.filter_query(
+        RequestFilter(
+            ids=ids,
+            first_name=first_name,
+            status=status,
+            closed=closed,
+            request_service_id=request_service_id,
+            client_id=client_id,
+            created_from=created_from,
+            created_to=created_to,
+            updated_from=updated_from,
+            updated_to=updated_to,
         )
-
-    return await CRUDRequest(session).fetch_many(
-        skip, limit, statement, selectinload_fields=["*"]
+    )
+    return await crud_request.fetch_many_ordered(
+        skip, limit, order_by.value, order, query, selectinload_fields=["*"]
     )
 
 
@@ -76,6 +285,76 @@ async def update_request(
     return request
 
 
+@router.patch("/bulk", response_model=list[RequestBulkResult])
+async def update_requests_bulk(
+    updated_requests: RequestBulkUpdate,
+    _: Annotated["User", Security(get_auth_user, scopes=("request.update",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    crud_request = CRUDRequest(session)
+    ids = list(dict.fromkeys(updated_requests.ids))
+
+    try:
+        updated_ids = await crud_request.update_many(ids, updated_requests.data)
+    except exc.IntegrityError as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Provided client or request service not exists",
+        ) from e
+
+    requests = {
+        request.id: request
+        for request in await crud_request.fetch_by_ids(
+            updated_ids, selectinload_fields=["*"]
+        )
+    }
+    return [
+        RequestBulkResult(
+            id=request_id,
+            status=RequestBulkStatus.updated,
+            request=requests[request_id],
+        )
+        if request_id in requests
+        else RequestBulkResult(id=request_id, status=RequestBulkStatus.not_found)
+        for request_id in ids
+    ]
+
+
+@router.delete("/bulk", response_model=list[RequestBulkResult])
+async def remove_requests_bulk(
+    ids: Annotated[list[UUID], Query(min_length=1, max_length=1000)],
+    _: Annotated["User", Security(get_auth_user, scopes=("request.remove",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+):
+    crud_request = CRUDRequest(session)
+    ids = list(dict.fromkeys(ids))
+
+    requests = {
+        request.id: RequestRead.model_validate(request)
+        for request in await crud_request.fetch_by_ids(ids, selectinload_fields=["*"])
+    }
+    try:
+        removed_ids = set(await crud_request.remove_many(list(requests)))
+    except exc.IntegrityError as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Some of the requests still have attachs",
+        ) from e
+
+    return [
+        RequestBulkResult(
+            id=request_id,
+            status=RequestBulkStatus.removed,
+            request=requests[request_id],
+        )
+        if request_id in removed_ids
+        else RequestBulkResult(id=request_id, status=RequestBulkStatus.not_found)
+        for request_id in ids
+    ]
+
+
 @router.delete("/{request_id}", response_model=RequestRead)
 async def remove_request(
     request_id: UUID,
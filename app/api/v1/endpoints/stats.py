@@ -0,0 +1,42 @@
+from datetime import date, datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Security
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security import get_auth_user
+from app.crud.request_stats import CRUDRequestStats
+from app.crud.request_status_transition import CRUDRequestStatusTransition
+from app.db import get_session
+from app.models import User
+from app.schemas.stats import RequestStatsRead, RequestStatusTime
+
+router = APIRouter()
+
+
+@router.get("/requests", response_model=RequestStatsRead)
+async def get_requests_stats(
+    _: Annotated["User", Security(get_auth_user, scopes=("request.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    month_from: Annotated[date | None, Query()] = None,
+    month_to: Annotated[date | None, Query()] = None,
+):
+    """
+    Numbers of requests per status, request service and month of creation,
+    read from counters maintained on every change of requests.
+    """
+    return await CRUDRequestStats(session).fetch_summary(month_from, month_to)
+
+
+@router.get("/requests/statuses", response_model=list[RequestStatusTime])
+async def get_requests_status_times(
+    _: Annotated["User", Security(get_auth_user, scopes=("request.get",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    since: Annotated[datetime | None, Query()] = None,
+    until: Annotated[datetime | None, Query()] = None,
+):
+    """
+    Time requests spent in each status entered in the period, and the share
+    of them moved to each next status, from the log of status transitions.
+    """
+    return await CRUDRequestStatusTransition(session).fetch_status_times(since, until)
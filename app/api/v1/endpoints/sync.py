@@ -0,0 +1,134 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Security
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.security import get_auth_user
+from app.crud.attach import CRUDAttach
+from app.crud.attach_group import CRUDAttachGroup
+from app.crud.client import CRUDClient
+from app.crud.request import CRUDRequest
+from app.crud.tombstone import CRUDTombstone
+from app.db import get_session
+from app.models import Client, User
+from app.schemas.sync import SyncRead
+from app.utils.cursor import decode_cursor, encode_cursor
+
+router = APIRouter()
+
+# Types of ids in keysets of sync tokens
+SYNC_KEYSET_IDS = {
+    "requests": UUID,
+    "clients": UUID,
+    "attachs": UUID,
+    "attach_groups": int,
+    "deleted": int,
+}
+
+# Fields of SyncDeleted for tables of tombstones
+SYNC_DELETED_FIELDS = {
+    "request": "requests",
+    "client": "clients",
+    "attach": "attachs",
+    "attach_group": "attach_groups",
+}
+
+
+def parse_sync_token(
+    token: str,
+) -> tuple[datetime | None, datetime | None, dict[str, tuple[datetime, Any]]]:
+    try:
+        since, until, keysets = decode_cursor(token)
+        return (
+            datetime.fromisoformat(since) if since is not None else None,
+            datetime.fromisoformat(until) if until is not None else None,
+            {
+                name: (
+                    datetime.fromisoformat(changed_at),
+                    SYNC_KEYSET_IDS[name](obj_id),
+                )
+                for name, (changed_at, obj_id) in keysets.items()
+            },
+        )
+    except (ValueError, TypeError, KeyError, AttributeError) as err:
+        raise HTTPException(status_code=400, detail="Invalid token") from err
+
+
+@router.get("", response_model=SyncRead)
+async def sync(
+    _: Annotated[
+        "User",
+        Security(get_auth_user, scopes=("request.get", "client.get", "attach.get")),
+    ],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    token: Annotated[str | None, Query(alias="since")] = None,
+    limit: Annotated[int, Query(ge=1, le=10_000)] = 1000,
+):
+    """
+    Requests, clients, attachs and attach groups changed since the sync that
+    returned the `since` token (all of them without it) and ids of the
+    deleted ones.
+
+    Up to `limit` objects of each kind and deletions are returned at a time,
+    while `has_more` is true the sync should be continued with the returned
+    `token` as `since`. Changes of the last `SYNC_OVERLAP` seconds before a
+    sync are returned again by the next one, to catch transactions committed
+    late, so changes are to be applied as upserts and deletions after them.
+
+    Tokens older than `SYNC_TOMBSTONE_RETENTION` days are rejected with 410,
+    as deletions since then are forgotten: the client should sync all over.
+    """
+    since, until, keysets = parse_sync_token(token) if token else (None, None, {})
+    # Pages of a sync share the upper bound, so that it's reached eventually.
+    # It's taken from the clock of the database, which dates tombstones.
+    now = (await session.exec(select(func.localtimestamp()))).one()
+    until = until or now
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION)
+    if since is not None and since < now - retention:
+        raise HTTPException(status_code=410, detail="Sync token expired")
+
+    changes: dict[str, Any] = {}
+    for name, crud, selectinload_fields in (
+        ("requests", CRUDRequest(session), None),
+        ("clients", CRUDClient(session), [Client.user]),
+        ("attachs", CRUDAttach(session), None),
+        ("attach_groups", CRUDAttachGroup(session), None),
+    ):
+        changes[name] = await crud.fetch_changed(
+            since, until, keysets.get(name), limit + 1, selectinload_fields
+        )
+    # Nothing to delete on the first sync
+    changes["deleted"] = []
+    if since is not None:
+        changes["deleted"] = await CRUDTombstone(session).fetch_deleted(
+            since, until, keysets.get("deleted"), limit + 1
+        )
+
+    has_more = False
+    for name, objs in changes.items():
+        if len(objs) > limit:
+            has_more = True
+            changes[name] = objs = objs[:limit]
+        if objs:
+            last = objs[-1]
+            keysets[name] = (
+                last.deleted_at if name == "deleted" else last.updated_at,
+                last.id,
+            )
+
+    deleted: dict[str, list[str]] = defaultdict(list)
+    for tombstone in changes.pop("deleted"):
+        deleted[SYNC_DELETED_FIELDS[tombstone.table_name]].append(tombstone.row_id)
+
+    if has_more:
+        next_token = encode_cursor(since, until, keysets)
+    else:
+        overlap = timedelta(seconds=settings.SYNC_OVERLAP)
+        next_token = encode_cursor(until - overlap, None, {})
+
+    return {**changes, "deleted": deleted, "token": next_token, "has_more": has_more}
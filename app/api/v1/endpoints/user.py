@@ -6,6 +6,8 @@ from fastapi.params import Depends, Query, Security
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.response_cache import read_through
+from app.core.revocation import revocation_filter
 from app.core.security import get_auth_user
 from app.crud.user import CRUDUser
 from app.db import get_session
@@ -27,10 +29,12 @@ async def get_user(
     _: Annotated[User, Security(get_auth_user, scopes=("user.get",))],
     session: Annotated[AsyncSession, Depends(get_session)],
 ):
-    user = await CRUDUser(session).fetch(obj_id=user_id)
-    if user is None:
+    response = await read_through(
+        "get_user", user_id, UserRead, lambda: CRUDUser(session).fetch(obj_id=user_id)
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return response
 
 
 @router.get("", response_model=list[UserRead])
@@ -98,3 +102,18 @@ async def create_user(
 ):
     new_user.password = get_password_hash(new_user.password)
     return await CRUDUser(session).create(new_user)
+
+
+@router.delete("/{user_id}/logins", status_code=204)
+async def revoke_user_logins(
+    user_id: UUID,
+    _: Annotated[User, Security(get_auth_user, scopes=("user.update",))],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> None:
+    crud_user = CRUDUser(session)
+    user = await crud_user.fetch(obj_id=user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    for login_id, expires_at in await crud_user.revoke_logins(user_id):
+        revocation_filter.add(login_id, expires_at)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from contextlib import suppress
+from pathlib import Path
+from uuid import uuid4
+
+import aiofiles
+import structlog
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db import engine
+from app.models import UserLoginSucceed
+
+logger = structlog.stdlib.get_logger("core.audit")
+
+
+class LoginAuditWriter:
+    """
+    Write-behind buffer for login audit records.
+
+    Records are queued in memory and inserted by a background task with a
+    single multi-row insert every `batch_size` records or `flush_interval`
+    milliseconds, whichever comes first. While the writer isn't running or the
+    queue is full, records are added to the request session instead.
+
+    Records that can't be inserted (including the ones left on shutdown when
+    the database is unavailable) are appended to the `spool_path` file and
+    replayed on the next start.
+    """
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        batch_size: int = settings.LOGIN_AUDIT_BATCH_SIZE,
+        flush_interval: int = settings.LOGIN_AUDIT_FLUSH_INTERVAL,
+        max_size: int = settings.LOGIN_AUDIT_QUEUE_SIZE,
+        spool_path: str = settings.LOGIN_AUDIT_SPOOL_PATH,
+    ):
+        self.engine = db_engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval / 1000
+        self.max_size = max_size
+        self.spool_path = Path(spool_path)
+        self._queue: asyncio.Queue[UserLoginSucceed] | None = None
+        self._task: asyncio.Task | None = None
+        # Batch taken from the queue, but not inserted yet
+        self._batch: list[UserLoginSucceed] = []
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def write(self, record: UserLoginSucceed, session: AsyncSession) -> None:
+        if self.is_running:
+            try:
+                self._queue.put_nowait(record)
+                return
+            except asyncio.QueueFull:
+                logger.warning("Login audit queue is full, writing synchronously")
+        session.add(record)
+
+    async def start(self) -> None:
+        await self._replay_spool()
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        while not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+        await self._flush()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(
+                            self._queue.get(), deadline - loop.time()
+                        )
+                    )
+                except TimeoutError:
+                    break
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._batch:
+            return
+
+        try:
+            await self._insert([record.model_dump() for record in self._batch])
+        except Exception:
+            logger.exception(
+                f"Can't insert {len(self._batch)} login audit records, "
+                f"spooling them to {self.spool_path}"
+            )
+            await self._spool()
+        self._batch = []
+
+    async def _insert(self, rows: list[dict]) -> None:
+        async with self.engine.begin() as conn:
+            # Records are idempotent, a batch may be retried after a failure
+            await conn.execute(
+                insert(UserLoginSucceed).values(rows).on_conflict_do_nothing()
+            )
+
+    async def _spool(self) -> None:
+        async with aiofiles.open(self.spool_path, "a") as spool:
+            await spool.writelines(
+                record.model_dump_json() + "\n" for record in self._batch
+            )
+
+    async def _replay_spool(self) -> None:
+        # Spool files are shared by workers, so they are claimed by an atomic
+        # rename before being replayed: each file is replayed by one of the
+        # workers starting together, and records spooled meanwhile go to a
+        # new spool file. Claimed files that failed to be replayed (or were
+        # left by a crash) are claimed again, records are idempotent.
+        name = self.spool_path.name
+        spooled = [self.spool_path, *self.spool_path.parent.glob(f"{name}.*.replay")]
+        for path in spooled:
+            claimed = path.with_name(f"{name}.{uuid4().hex}.replay")
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue
+            await self._replay(claimed)
+
+    async def _replay(self, path: Path) -> None:
+        rows = []
+        async with aiofiles.open(path) as spool:
+            async for line in spool:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(
+                        UserLoginSucceed.model_validate(json.loads(line)).model_dump()
+                    )
+                except ValueError:
+                    logger.warning(f"Malformed spooled login audit record: {line}")
+        try:
+            for offset in range(0, len(rows), self.batch_size):
+                await self._insert(rows[offset : offset + self.batch_size])
+        except Exception:
+            logger.exception(f"Can't replay spooled login audit records of {path}")
+            return
+        logger.info(f"Replayed {len(rows)} spooled login audit records")
+        path.unlink(missing_ok=True)
+
+
+login_audit = LoginAuditWriter(engine)
@@ -30,11 +30,35 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     STORAGE_CLEANUP_INTERVAL: int = 10  # minutes
     DEFAULT_RATE_LIMIT: int = 10
     MAX_LOGIN_ATTEMPTS: int = 3
     MAX_LOGIN_ATTEMPTS_BLOCK_TIME: int = 5
     MAX_LOGIN_ATTEMPTS_PERIOD: int = 15  # minutes
+    CLIENT_IMPORT_BATCH_SIZE: int = 500
+    EXPORT_BATCH_SIZE: int = 1000
+    LOGIN_AUDIT_BATCH_SIZE: int = 100
+    LOGIN_AUDIT_FLUSH_INTERVAL: int = 500  # milliseconds
+    LOGIN_AUDIT_QUEUE_SIZE: int = 10_000
+    LOGIN_AUDIT_SPOOL_PATH: str = "login_audit.ndjson"
+    LOGIN_PARTITIONS_AHEAD: int = 3  # months
+    LOGIN_RETENTION_MONTHS: int = 12
+    # Keep expired partitions as standalone tables instead of dropping them
+    LOGIN_PARTITIONS_ARCHIVE: bool = False
+    REVOCATION_REFRESH_INTERVAL: int = 5  # seconds
+    REVOCATION_REFRESH_OVERLAP: int = 60  # seconds
+    CALLER_ID_CACHE_SIZE: int = 1024
+    CALLER_ID_CACHE_TTL: int = 10  # seconds
+    RESPONSE_CACHE_SIZE: int = 0  # responses, 0 disables the cache
+    RESPONSE_CACHE_TTL: int = 60  # seconds
+    SYNC_OVERLAP: int = 60  # seconds
+    # Older sync tokens are rejected, as tombstones of their deletions are gone
+    SYNC_TOMBSTONE_RETENTION: int = 30  # days
+    CHANGES_CHECK_INTERVAL: int = 10  # seconds
+    CHANGES_RECONNECT_INTERVAL: int = 5  # seconds
+    EVENTS_BUFFER_SIZE: int = 100
+    EVENTS_KEEPALIVE_INTERVAL: int = 15  # seconds
 
     SUPERUSER_ID: UUID | None = None
 
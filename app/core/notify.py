@@ -0,0 +1,183 @@
+import asyncio
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager, suppress
+from typing import NamedTuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db import engine
+from app.models.change_notification import CHANGES_CHANNEL
+from app.utils.cache import LRUCache
+
+logger = structlog.stdlib.get_logger("core.notify")
+
+
+class ChangeEvent(NamedTuple):
+    entity: str
+    action: str
+    ids: list[str | int]
+    # As sent by the trigger, so that it's serialized once for all subscribers
+    payload: str
+
+
+class Subscription:
+    """
+    Bounded buffer of change events of the given entities for a subscriber.
+
+    When the buffer is full, buffered events are dropped and the subscriber
+    gets None instead, meaning that events were lost and data should be
+    reloaded.
+    """
+
+    def __init__(self, entities: frozenset[str], max_size: int):
+        self.entities = entities
+        self._queue: asyncio.Queue[ChangeEvent | None] = asyncio.Queue(max_size)
+
+    def put(self, event: ChangeEvent) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.reset()
+
+    def reset(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> ChangeEvent | None:
+        return await self._queue.get()
+
+
+class ChangeListener:
+    """
+    Per-worker listener of change notifications sent by triggers, see
+    app.models.change_notification.
+
+    A single connection `LISTEN`s to the channel, fans events out to
+    subscribers and evicts values of registered caches tagged with
+    (table, id) of changed rows, so that caches of all workers are
+    invalidated by changes made by any of them.
+
+    The connection is checked every `check_interval` seconds and reconnected
+    after `reconnect_interval` seconds when lost. Notifications sent while
+    reconnecting are lost, so subscribers are reset and caches are cleared
+    after every connection.
+    """
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        channel: str = CHANGES_CHANNEL,
+        buffer_size: int = settings.EVENTS_BUFFER_SIZE,
+        check_interval: float = settings.CHANGES_CHECK_INTERVAL,
+        reconnect_interval: float = settings.CHANGES_RECONNECT_INTERVAL,
+    ):
+        self.engine = db_engine
+        self.channel = channel
+        self.buffer_size = buffer_size
+        self.check_interval = check_interval
+        self.reconnect_interval = reconnect_interval
+        self._subscriptions: set[Subscription] = set()
+        self._caches: dict[str, list[LRUCache]] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @contextmanager
+    def subscribe(self, entities: frozenset[str]) -> Iterator[Subscription]:
+        subscription = Subscription(entities, self.buffer_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def register_cache(self, cache: LRUCache, tables: Iterable[str]) -> None:
+        """Invalidate the cache by changes of rows of the tables."""
+        for table in tables:
+            self._caches.setdefault(table, []).append(cache)
+
+    def evict(self, entity: str, ids: Sequence[str | int | UUID]) -> None:
+        """
+        Evict values of registered caches tagged with the changed rows, e.g.
+        right after a commit not to wait for the notification.
+        """
+        for cache in self._caches.get(entity, ()):
+            for obj_id in ids:
+                cache.evict((entity, str(obj_id)))
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception(
+                    f"Lost connection listening to {self.channel}, "
+                    f"reconnecting in {self.reconnect_interval}s"
+                )
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def _listen(self) -> None:
+        async with self.engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            try:
+                await driver_connection.add_listener(
+                    self.channel, self._on_notification
+                )
+                for subscription in self._subscriptions:
+                    subscription.reset()
+                for cache in {
+                    id(cache): cache
+                    for caches in self._caches.values()
+                    for cache in caches
+                }.values():
+                    cache.clear()
+                while True:
+                    await asyncio.sleep(self.check_interval)
+                    await asyncio.wait_for(
+                        driver_connection.execute("SELECT 1"), self.check_interval
+                    )
+            except Exception:
+                # Not to return a broken connection to the pool
+                await connection.invalidate()
+                raise
+            finally:
+                if not driver_connection.is_closed():
+                    await driver_connection.remove_listener(
+                        self.channel, self._on_notification
+                    )
+
+    def _on_notification(self, _connection, _pid, _channel, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            event = ChangeEvent(data["entity"], data["action"], data["ids"], payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Malformed change notification: {payload}")
+            return
+
+        self.evict(event.entity, event.ids)
+        for subscription in self._subscriptions:
+            if event.entity in subscription.entities:
+                subscription.put(event)
+
+
+change_listener = ChangeListener(engine)
@@ -0,0 +1,73 @@
+"""
+Read-through cache of serialized responses of GET-by-id endpoints.
+
+Responses are cached by (route, id) and tagged with (table, id) of all rows
+they were serialized from, so that they are evicted on changes of any of
+these rows by any worker, see app.core.notify. Permission checks of the
+endpoints still run on every request, only the database round trips reading
+the object are saved.
+"""
+
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+from app.core.notify import change_listener
+from app.utils.cache import LRUCache
+
+RESPONSE_CACHE_TABLES = ("request", "client", "user", "attach", "attach_group")
+
+response_cache: LRUCache[tuple[str, str], str] = LRUCache(
+    settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL
+)
+change_listener.register_cache(response_cache, RESPONSE_CACHE_TABLES)
+
+
+def row_tags(obj: SQLModel) -> set[tuple[str, str]]:
+    """(table, id) of the object and of its loaded related objects."""
+    tags: set[tuple[str, str]] = set()
+    pending = [obj]
+    while pending:
+        state = inspect(pending.pop())
+        tag = (state.mapper.local_table.name, str(state.identity[0]))
+        if tag in tags:
+            continue
+        tags.add(tag)
+        for relationship in state.mapper.relationships:
+            if relationship.key in state.unloaded:
+                continue
+            related = state.dict.get(relationship.key)
+            if isinstance(related, list):
+                pending.extend(related)
+            elif related is not None:
+                pending.append(related)
+    return tags
+
+
+async def read_through(
+    route: str,
+    obj_id: UUID | int,
+    response_model: type[BaseModel],
+    fetch: Callable[[], Awaitable[SQLModel | None]],
+) -> Response | None:
+    """
+    JSON response of the object fetched by `fetch` as `response_model`, or
+    None if it's not found. Not found objects aren't cached.
+    """
+    key: tuple[str, str] = (route, str(obj_id))
+    content = response_cache.get(key)
+    if content is None:
+        version = response_cache.version
+        obj = await fetch()
+        if obj is None:
+            return None
+        content = response_model.model_validate(obj).model_dump_json()
+        # Not to cache a response read while its rows were changed
+        if response_cache.version == version:
+            response_cache.set(key, content, row_tags(obj))
+    return Response(content, media_type="application/json")
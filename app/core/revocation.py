@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.db import engine
+from app.models import RevokedLogin
+
+
+class RevocationFilter:
+    """
+    Per-worker in-memory set of revoked login ids, checked on every
+    authenticated request without a database query.
+
+    It's refreshed incrementally from `revoked_login` by a scheduled task.
+    Rows created since the previous refresh (minus `overlap` seconds, to catch
+    transactions committed late) are loaded, expired entries are dropped.
+    Logins revoked by this worker are added immediately.
+    """
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        overlap: int = settings.REVOCATION_REFRESH_OVERLAP,
+    ):
+        self.engine = db_engine
+        self.overlap = timedelta(seconds=overlap)
+        self._revoked: dict[UUID, datetime] = {}
+        self._refreshed_at: datetime | None = None
+
+    def __contains__(self, login_id: UUID) -> bool:
+        return login_id in self._revoked
+
+    def add(self, login_id: UUID, expires_at: datetime) -> None:
+        self._revoked[login_id] = expires_at
+
+    async def refresh(self) -> None:
+        dt_now = datetime.now()
+        query = select(RevokedLogin.login_id, RevokedLogin.expires_at).where(
+            col(RevokedLogin.expires_at) > dt_now
+        )
+        if self._refreshed_at is not None:
+            query = query.where(
+                col(RevokedLogin.created_at) >= self._refreshed_at - self.overlap
+            )
+
+        async with AsyncSession(self.engine) as session:
+            revoked = (await session.exec(query)).all()
+
+        self._revoked = {
+            login_id: expires_at
+            for login_id, expires_at in self._revoked.items()
+            if expires_at > dt_now
+        }
+        self._revoked.update(revoked)
+        self._refreshed_at = dt_now
+
+
+revocation_filter = RevocationFilter(engine)
@@ -7,14 +7,13 @@ import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
 from jwt.exceptions import InvalidTokenError
-from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from structlog.stdlib import get_logger
 
 from app.core.config import settings
+from app.core.revocation import revocation_filter
 from app.crud.user import CRUDUser
 from app.db import get_session
-from app.models import Permission, RolePermission, User, UserLogin, UserRoles
+from app.models import User
 from app.schemas.security import TokenData
 from app.utils.bcrypt import verify_password
 
@@ -24,67 +23,39 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PATH}/login")
 async def authenticate_user(
     username: str, password: str, session: AsyncSession
 ) -> User:
-    user = await CRUDUser(session).fetch_by_username(username=username)
+    """
+    Check the credentials, counting the attempt. On success the attempts are
+    reset, but the transaction is left for the caller to commit.
+    """
+    dt_now = datetime.now()
+    crud_user = CRUDUser(session)
+    result = await crud_user.fetch_by_username_for_login(
+        username=username, dt_now=dt_now
+    )
     incorrect_exc = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Incorrect username or password",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    if not user:
+    if result is None:
         raise incorrect_exc
 
-    await user.awaitable_attrs.user_login
-
-    dt_now = datetime.now()
-    user_login = user.user_login
-
-    def __format_security_exc() -> HTTPException:
-        nonlocal dt_now, user_login
-        wait_time = ceil((user_login.blocked_before - dt_now).total_seconds() / 60)
-        return HTTPException(
+    user, blocked_before = result
+    if blocked_before is not None and dt_now <= blocked_before:
+        await session.commit()
+        wait_time = ceil((blocked_before - dt_now).total_seconds() / 60)
+        raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Account blocked. Too many login attempts. "
             f"Try again in {wait_time} minutes.",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if user_login is not None:
-        user_login.attempts += 1
-        if (
-            user_login.blocked_before is not None
-            and dt_now <= user_login.blocked_before
-        ):
-            # If the account is blocked, we raise an exception
-            raise __format_security_exc()
-        elif user_login.attempts >= settings.MAX_LOGIN_ATTEMPTS:
-            if (
-                dt_now - max(user_login.last_attempt_at, user_login.blocked_before)
-            ).total_seconds() <= settings.MAX_LOGIN_ATTEMPTS_PERIOD * 60:
-                # If the account has reached the maximum number of attempts, we block it
-                user_login.blocked_before = dt_now + timedelta(
-                    minutes=settings.MAX_LOGIN_ATTEMPTS_BLOCK_TIME * user_login.attempts
-                )
-
-                session.add(user_login)
-                await session.commit()
-                await user.awaitable_attrs.user_login
-
-                raise __format_security_exc()
-            else:
-                # If the last unsuccessful login attempt was a long time ago,
-                # reset the counter
-                user.user_login.attempts = 1
-    else:
-        user_login = UserLogin(
-            user_id=user.id,
-        )
-    session.add(user_login)
-    await session.commit()
-    await user.awaitable_attrs.user_login
-
-    if not verify_password(password, user.password):
+    if user.password is None or not verify_password(password, user.password):
+        await session.commit()
         raise incorrect_exc
     if user.is_active is False:
+        await session.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Account is not active. Contact the administrator.",
@@ -92,11 +63,7 @@ async def authenticate_user(
         )
 
     # If auth is successful, we reset the number of attempts and blocked_before
-    user_login.attempts = 0
-    user_login.blocked_before = None
-    session.add(user_login)
-    await session.commit()
-    await user.awaitable_attrs.user_login
+    await crud_user.reset_login_attempts(user.id)
 
     return user
 
@@ -111,11 +78,9 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-async def __get_current_user(
-    security_scopes: SecurityScopes,
+async def get_token_data(
     token: Annotated[str, Depends(oauth2_scheme)],
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> User | None:
+) -> TokenData:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -123,53 +88,53 @@ async def __get_current_user(
     )
     try:
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["exp"]},
         )
         if (user_id := payload.get("sub")) is None or (
             login_id := payload.get("login_id")
         ) is None:
             raise credentials_exception
         token_data = TokenData.model_validate(
-            {"id": UUID(user_id), "login_id": UUID(login_id)}
+            {
+                "id": UUID(user_id),
+                "login_id": UUID(login_id),
+                "expires_at": datetime.fromtimestamp(payload["exp"]),
+            }
         )
     except InvalidTokenError as err:
         raise credentials_exception from err
 
-    user = await CRUDUser(session).fetch(obj_id=token_data.id)
-    if not user:
+    if token_data.login_id in revocation_filter:
         raise credentials_exception
+    return token_data
 
-    statement = (
-        select(Permission)
-        .where(User.id == token_data.id)
-        .where(
-            col(Permission.id).in_(
-                select(RolePermission.permission_id).where(
-                    col(RolePermission.role_id).in_(
-                        select(UserRoles.role_id).where(
-                            UserRoles.user_id == token_data.id
-                        )
-                    )
-                )
-            )
-        )
-    )
-
-    logger = get_logger(__name__)
 
-    res = (await session.exec(statement)).all()
-
-    permissions = {perm.name for perm in res}
+async def __get_current_user(
+    security_scopes: SecurityScopes,
+    token_data: Annotated[TokenData, Depends(get_token_data)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> User | None:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    result = await CRUDUser(session).fetch_with_scopes(
+        token_data.id, security_scopes.scopes
+    )
+    if not result:
+        raise credentials_exception
 
-    logger.debug(str(permissions))
-    if user.id != settings.SUPERUSER_ID:
-        for scope in security_scopes.scopes:
-            if scope not in permissions:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Not enough permissions",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+    user, has_scopes = result
+    if not has_scopes and user.id != settings.SUPERUSER_ID:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not enough permissions",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
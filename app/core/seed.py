@@ -0,0 +1,422 @@
+import random
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from hashlib import md5
+from itertools import islice
+from typing import Any
+
+import aiofiles
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.request import RequestStatus
+from app.utils.bcrypt import get_password_hash
+from app.utils.filepath import get_filepath
+from app.utils.uuid7 import uuid7
+
+SCOPES = tuple(
+    f"{resource}.{action}"
+    for resource in ("user", "client", "request", "attach")
+    for action in ("get", "create", "update", "remove")
+)
+FIRST_NAMES = (
+    "Иван",
+    "Пётр",
+    "Алексей",
+    "Сергей",
+    "Дмитрий",
+    "Олег",
+    "Анна",
+    "Мария",
+    "Елена",
+    "Ольга",
+    "Наталья",
+    "Татьяна",
+)
+LAST_NAMES = (
+    "Иванов",
+    "Петров",
+    "Сидоров",
+    "Смирнов",
+    "Кузнецов",
+    "Попов",
+    "Васильев",
+    "Соколов",
+    "Михайлов",
+    "Новиков",
+)
+NOTE_WORDS = (
+    "окно",
+    "дверь",
+    "балкон",
+    "замер",
+    "монтаж",
+    "откосы",
+    "подоконник",
+    "москитная",
+    "сетка",
+    "перезвонить",
+    "скидка",
+    "доставка",
+)
+
+
+@dataclass
+class SeedSize:
+    users: int = 100
+    roles: int = 5
+    permissions: int = 16
+    clients: int = 10_000
+    request_services: int = 5
+    requests: int = 50_000
+    attach_groups: int = 10
+    attachs: int = 20_000
+    files: int = 1_000
+
+    def validate(self) -> None:
+        if self.requests and not (self.clients and self.request_services):
+            raise ValueError("Requests need at least one client and request service")
+        if self.attachs and not (self.requests and self.users and self.files):
+            raise ValueError("Attachs need at least one request, user and file")
+        if self.roles and not self.permissions:
+            raise ValueError("Roles need at least one permission")
+        if self.permissions > 63:
+            raise ValueError("There can't be more than 63 permissions")
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+USER_COLUMNS = (
+    "id",
+    "username",
+    "password",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+
+class Seeder:
+    """
+    Bulk synthetic data generator for load testing.
+
+    Rows are streamed to PostgreSQL with binary `COPY` through the raw asyncpg
+    connection, so only the ids needed for foreign keys are kept in memory.
+    Everything is inserted in a single transaction.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        size: SeedSize,
+        password: str,
+        batch_size: int = 50_000,
+        rnd: random.Random | None = None,
+        echo: Callable[[str], Any] = lambda _: None,
+    ):
+        size.validate()
+        self.engine = engine
+        self.size = size
+        self.password = password
+        self.batch_size = batch_size
+        self.rnd = rnd or random.Random()
+        self.echo = echo
+        self.now = datetime.now()
+        # Unique per run, so seeding can be repeated on the same database
+        self.prefix = uuid.uuid4().hex[:6]
+        self.counts: dict[str, int] = {}
+
+    def _timestamp(self) -> datetime:
+        return self.now - timedelta(seconds=self.rnd.randint(0, 2 * 365 * 24 * 3600))
+
+    async def _copy(
+        self, connection, table: str, columns: tuple[str, ...], rows: Iterable[tuple]
+    ) -> None:
+        start = time.perf_counter()
+        count = 0
+        for batch in _batched(rows, self.batch_size):
+            await connection.copy_records_to_table(
+                table, records=batch, columns=columns
+            )
+            count += len(batch)
+        self.counts[table] = self.counts.get(table, 0) + count
+        self.echo(f"{table}: {count} rows in {time.perf_counter() - start:.2f}s")
+
+    async def _write_files(self) -> list[tuple[str, int]]:
+        """Write content-addressed files, returns list of (path, size)."""
+        files = []
+        for i in range(self.size.files):
+            content = f"avcrm seed file {i}\n".encode() * self.rnd.randint(1, 64)
+            path, filename = get_filepath(md5(content).hexdigest())
+            path.mkdir(parents=True, exist_ok=True)
+            path = path.joinpath(filename)
+            if not path.exists():
+                async with aiofiles.open(path, "wb") as out_file:
+                    await out_file.write(content)
+            files.append((str(path), len(content)))
+        return files
+
+    async def _seed_roles(self, connection) -> list[uuid.UUID]:
+        names = SCOPES[: self.size.permissions] + tuple(
+            f"seed.permission_{i}" for i in range(self.size.permissions - len(SCOPES))
+        )
+        existing = {
+            row["name"] for row in await connection.fetch("SELECT name FROM permission")
+        }
+        await self._copy(
+            connection,
+            "permission",
+            ("name", "created_at", "updated_at"),
+            ((name, self.now, self.now) for name in names if name not in existing),
+        )
+        permission_ids = [
+            row["id"]
+            for row in await connection.fetch(
+                "SELECT id FROM permission WHERE name = any($1::text[])", names
+            )
+        ]
+
+        role_ids = [uuid7() for _ in range(self.size.roles)]
+        await self._copy(
+            connection,
+            "role",
+            ("id", "name", "created_at", "updated_at"),
+            (
+                (role_id, f"seed_{self.prefix}_role_{i}", self.now, self.now)
+                for i, role_id in enumerate(role_ids)
+            ),
+        )
+        await self._copy(
+            connection,
+            "rolepermission",
+            ("role_id", "permission_id", "created_at", "updated_at"),
+            (
+                (role_id, permission_id, self.now, self.now)
+                for role_id in role_ids
+                for permission_id in self.rnd.sample(
+                    permission_ids, self.rnd.randint(1, len(permission_ids))
+                )
+            ),
+        )
+        return role_ids
+
+    async def _seed_staff(self, connection, role_ids: list[uuid.UUID]):
+        password = get_password_hash(self.password)
+        staff_ids = [uuid7() for _ in range(self.size.users)]
+
+        def users() -> Iterator[tuple]:
+            for i, user_id in enumerate(staff_ids):
+                created_at = self._timestamp()
+                yield (
+                    user_id,
+                    f"seed_{self.prefix}_staff_{i}",
+                    password,
+                    self.rnd.choice(FIRST_NAMES),
+                    self.rnd.choice(LAST_NAMES),
+                    None,
+                    None,
+                    True,
+                    created_at,
+                    created_at,
+                )
+
+        await self._copy(connection, "user", USER_COLUMNS, users())
+        await self._copy(
+            connection,
+            "userroles",
+            ("user_id", "role_id", "created_at", "updated_at"),
+            (
+                (user_id, role_id, self.now, self.now)
+                for user_id in staff_ids
+                for role_id in self.rnd.sample(role_ids, min(2, len(role_ids)))
+            ),
+        )
+        return staff_ids
+
+    async def _seed_clients(self, connection) -> list[uuid.UUID]:
+        client_ids = [uuid7() for _ in range(self.size.clients)]
+
+        def users() -> Iterator[tuple]:
+            for i in range(self.size.clients):
+                created_at = self._timestamp()
+                yield (
+                    uuid7(),
+                    f"seed_{self.prefix}_client_{i}",
+                    None,
+                    self.rnd.choice(FIRST_NAMES),
+                    self.rnd.choice(LAST_NAMES) if self.rnd.random() < 0.8 else None,
+                    f"seed{i}@example.com" if self.rnd.random() < 0.3 else None,
+                    f"+79{i:09d}",
+                    False,
+                    created_at,
+                    created_at,
+                )
+
+        # Client users are copied in batches together with their clients,
+        # so that their ids don't have to be kept in memory.
+        offset = 0
+        for batch in _batched(users(), self.batch_size):
+            await self._copy(connection, "user", USER_COLUMNS, batch)
+            await self._copy(
+                connection,
+                "client",
+                ("id", "user_id", "created_at", "updated_at"),
+                (
+                    (client_ids[offset + i], user[0], user[-2], user[-1])
+                    for i, user in enumerate(batch)
+                ),
+            )
+            offset += len(batch)
+        return client_ids
+
+    async def _seed_requests(
+        self, connection, client_ids: list[uuid.UUID]
+    ) -> list[uuid.UUID]:
+        service_ids = [
+            row["id"]
+            for row in await connection.fetch(
+                "INSERT INTO request_service "
+                "(name, display_name, created_at, updated_at) "
+                "SELECT 'seed_' || $1 || '_service_' || i, 'Service ' || i, $2, $2 "
+                "FROM generate_series(1, $3) AS i RETURNING id",
+                self.prefix,
+                self.now,
+                self.size.request_services,
+            )
+        ]
+        self.counts["request_service"] = len(service_ids)
+
+        request_ids = [uuid7() for _ in range(self.size.requests)]
+        statuses = [status.name for status in RequestStatus]
+
+        def requests() -> Iterator[tuple[tuple, list[tuple]]]:
+            for i, request_id in enumerate(request_ids):
+                created_at = moment = self._timestamp()
+                history = []
+                for _ in range(self.rnd.randint(1, 5)):
+                    text = " ".join(self.rnd.sample(NOTE_WORDS, 3))
+                    history.append((uuid7(), request_id, text, moment))
+                    moment += timedelta(hours=self.rnd.randint(1, 72))
+                request = (
+                    request_id,
+                    self.rnd.choice(statuses),
+                    " ".join(self.rnd.sample(NOTE_WORDS, self.rnd.randint(2, 6))),
+                    str(1_000_000 + i),
+                    self.rnd.choice(client_ids),
+                    self.rnd.choice(service_ids),
+                    created_at,
+                    moment,
+                )
+                yield request, history
+
+        # History records are copied in batches together with their requests
+        for batch in _batched(requests(), self.batch_size):
+            await self._copy(
+                connection,
+                "request",
+                (
+                    "id",
+                    "status",
+                    "note",
+                    "number_in_program",
+                    "client_id",
+                    "request_service_id",
+                    "created_at",
+                    "updated_at",
+                ),
+                (request for request, _ in batch),
+            )
+            await self._copy(
+                connection,
+                "request_history",
+                ("id", "request_id", "text", "created_at"),
+                (record for _, history in batch for record in history),
+            )
+        return request_ids
+
+    async def _seed_attachs(
+        self,
+        connection,
+        request_ids: list[uuid.UUID],
+        staff_ids: list[uuid.UUID],
+        files: list[tuple[str, int]],
+    ) -> None:
+        group_ids = [
+            row["id"]
+            for row in await connection.fetch(
+                "INSERT INTO attach_group (title, created_at, updated_at) "
+                "SELECT 'Group ' || i, $1, $1 "
+                "FROM generate_series(1, $2) AS i RETURNING id",
+                self.now,
+                self.size.attach_groups,
+            )
+        ]
+        self.counts["attach_group"] = len(group_ids)
+
+        def attachs() -> Iterator[tuple]:
+            for _ in range(self.size.attachs):
+                path, file_size = self.rnd.choice(files)
+                created_at = self._timestamp()
+                yield (
+                    uuid7(),
+                    path,
+                    f"{path.rsplit('/', 1)[-1]}.txt",
+                    "text/plain",
+                    file_size,
+                    self.rnd.choice(staff_ids),
+                    self.rnd.choice(group_ids)
+                    if group_ids and self.rnd.random() < 0.7
+                    else None,
+                    self.rnd.choice(request_ids),
+                    created_at,
+                    created_at,
+                )
+
+        await self._copy(
+            connection,
+            "attach",
+            (
+                "id",
+                "path",
+                "original_name",
+                "content_type",
+                "size",
+                "creator_id",
+                "group_id",
+                "request_id",
+                "created_at",
+                "updated_at",
+            ),
+            attachs(),
+        )
+
+    async def run(self) -> dict[str, int]:
+        files = await self._write_files()
+
+        async with self.engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            connection = raw_connection.driver_connection
+            async with connection.transaction():
+                role_ids = await self._seed_roles(connection)
+                staff_ids = await self._seed_staff(connection, role_ids)
+                client_ids = await self._seed_clients(connection)
+                request_ids = await self._seed_requests(connection, client_ids)
+                await self._seed_attachs(connection, request_ids, staff_ids, files)
+
+            await connection.execute(
+                'ANALYZE permission, role, rolepermission, "user", userroles, '
+                "client, request_service, request, request_history, "
+                "request_status_transition, attach_group, attach"
+            )
+
+        return self.counts
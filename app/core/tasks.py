@@ -1,12 +1,16 @@
+import re
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import structlog
-from sqlmodel import col, select
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import col, delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.db import engine
-from app.models import Attach
+from app.models import Attach, RefreshToken, RevokedLogin, Tombstone
 
 
 async def unlink_unused_files() -> None:
@@ -56,3 +60,109 @@ async def unlink_unused_files() -> None:
             except OSError:
                 # If the directory is not empty, we can't remove it
                 break
+
+
+LOGIN_PARTITION_RE = re.compile(r"^user_login_succeed_y(\d{4})m(\d{2})$")
+
+
+def _shift_month(month: date, months: int) -> date:
+    month_index = month.year * 12 + month.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+async def _create_login_partition(conn: AsyncConnection, month: date) -> None:
+    """
+    Create the partition as a standalone table, move rows of its range from
+    the default partition there and attach it, as a partition can't be created
+    while the default one has rows for its range.
+    """
+    name = f"user_login_succeed_y{month:%Y}m{month:%m}"
+    bounds = f"'{month}' AND created_at < '{_shift_month(month, 1)}'"
+    await conn.execute(
+        text(
+            f"CREATE TABLE {name} "
+            "(LIKE user_login_succeed INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    await conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM user_login_succeed_default "
+            f"WHERE created_at >= {bounds} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE user_login_succeed ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{month}') TO ('{_shift_month(month, 1)}')"
+        )
+    )
+
+
+async def maintain_login_partitions() -> None:
+    """
+    Pre-create monthly partitions of `user_login_succeed` for
+    `LOGIN_PARTITIONS_AHEAD` months and drop (or only detach, if
+    `LOGIN_PARTITIONS_ARCHIVE` is set) the ones older than
+    `LOGIN_RETENTION_MONTHS`.
+    """
+    logger = structlog.stdlib.get_logger("tasks.maintain_login_partitions")
+    current_month = date.today().replace(day=1)
+    retention_start = _shift_month(current_month, -settings.LOGIN_RETENTION_MONTHS)
+
+    async with engine.begin() as conn:
+        # Every worker runs the job, the others wait and then find the
+        # partitions created
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('user_login_succeed'))")
+        )
+        partitions = {}
+        for name in await conn.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = 'user_login_succeed'::regclass"
+            )
+        ):
+            if match := LOGIN_PARTITION_RE.match(name):
+                partitions[date(int(match[1]), int(match[2]), 1)] = name
+
+        for months in range(settings.LOGIN_PARTITIONS_AHEAD + 1):
+            month = _shift_month(current_month, months)
+            if month not in partitions:
+                logger.info(f"Creating partition for {month:%Y-%m}")
+                await _create_login_partition(conn, month)
+
+        for month, name in sorted(partitions.items()):
+            if month >= retention_start:
+                break
+            logger.info(f"Detaching partition {name}")
+            await conn.execute(
+                text(f"ALTER TABLE user_login_succeed DETACH PARTITION {name}")
+            )
+            if not settings.LOGIN_PARTITIONS_ARCHIVE:
+                await conn.execute(text(f"DROP TABLE {name}"))
+
+        await conn.execute(
+            text("DELETE FROM user_login_succeed_default WHERE created_at < :start"),
+            {"start": retention_start},
+        )
+
+
+async def delete_expired_tokens() -> None:
+    dt_now = datetime.now()
+    async with AsyncSession(engine) as session:
+        await session.exec(
+            delete(RevokedLogin).where(col(RevokedLogin.expires_at) < dt_now)
+        )
+        await session.exec(
+            delete(RefreshToken).where(col(RefreshToken.expires_at) < dt_now)
+        )
+        await session.commit()
+
+
+async def delete_expired_tombstones() -> None:
+    expired = datetime.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION)
+    async with AsyncSession(engine) as session:
+        await session.exec(delete(Tombstone).where(col(Tombstone.deleted_at) < expired))
+        await session.commit()
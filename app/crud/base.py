@@ -1,16 +1,20 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from enum import Enum
 from typing import Any, Generic, Literal, TypeVar
 from uuid import UUID
 
 from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlalchemy import exc
+from sqlalchemy import Row, exc, tuple_
 from sqlalchemy.orm import selectinload
-from sqlmodel import SQLModel, func, select
+from sqlmodel import SQLModel, col, delete, func, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.sql.expression import Select
 
+from app.core.config import settings
+from app.core.notify import change_listener
+
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
@@ -54,12 +58,16 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def fetch_by_ids(
         self,
         list_ids: list[UUID | str | int],
+        selectinload_fields: list[SQLModel | Literal["*"]] | None = None,
         db_session: AsyncSession | None = None,
     ) -> Sequence[ModelType] | None:
         db_session = db_session or self.session
-        response = await db_session.exec(
-            select(self.model).where(self.model.id.in_(list_ids))
-        )
+        query = select(self.model).where(self.model.id.in_(list_ids))
+
+        if selectinload_fields is not None:
+            query = query.options(selectinload(*selectinload_fields))
+
+        response = await db_session.exec(query)
         return response.all()
 
     async def fetch_count(self, db_session: AsyncSession | None = None) -> int | None:
@@ -88,6 +96,29 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         response = await db_session.exec(query)
         return response.all()
 
+    def order_query(
+        self,
+        query: Select,
+        order_by: str | None = None,
+        order: IOrderEnum | None = IOrderEnum.ascendent,
+    ) -> Select:
+        columns = self.model.__table__.columns
+
+        if order_by is None or order_by not in columns:
+            order_by = "id"
+
+        # Ordered by id as well, so that pages are stable and the index of
+        # the ordered column (if it includes id) serves the whole order
+        order_columns = [columns[order_by]]
+        if order_by != "id":
+            order_columns.append(columns["id"])
+        return query.order_by(
+            *(
+                column.asc() if order == IOrderEnum.ascendent else column.desc()
+                for column in order_columns
+            )
+        )
+
     async def fetch_many_ordered(
         self,
         skip: int = 0,
@@ -100,21 +131,38 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> Sequence[ModelType]:
         db_session = db_session or self.session
 
-        columns = self.model.__table__.columns
+        query = query if query is not None else select(self.model)
+        query = self.order_query(query, order_by, order).offset(skip).limit(limit)
 
-        if order_by is None or order_by not in columns:
-            order_by = "id"
+        if selectinload_fields is not None:
+            query = query.options(selectinload(*selectinload_fields))
 
-        query = query if query is not None else select(self.model)
-        query = (
-            query.offset(skip)
-            .limit(limit)
-            .order_by(
-                columns[order_by].asc()
-                if order == IOrderEnum.ascendent
-                else columns[order_by].desc()
-            )
-        )
+        response = await db_session.exec(query)
+        return response.all()
+
+    async def fetch_changed(
+        self,
+        since: datetime | None,
+        until: datetime,
+        after: tuple[datetime, Any] | None = None,
+        limit: int = 100,
+        selectinload_fields: list[SQLModel | Literal["*"]] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> Sequence[ModelType]:
+        """
+        Objects updated after `since` up to `until`, ordered by (updated_at, id)
+        and following the `after` keyset if given, read from the index of
+        these columns.
+        """
+        db_session = db_session or self.session
+
+        updated_at, obj_id = col(self.model.updated_at), col(self.model.id)
+        query = select(self.model).where(updated_at <= until)
+        if since is not None:
+            query = query.where(updated_at > since)
+        if after is not None:
+            query = query.where(tuple_(updated_at, obj_id) > tuple_(*after))
+        query = query.order_by(updated_at, obj_id).limit(limit)
 
         if selectinload_fields is not None:
             query = query.options(selectinload(*selectinload_fields))
@@ -122,6 +170,26 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         response = await db_session.exec(query)
         return response.all()
 
+    async def stream_many(
+        self,
+        query: Select,
+        order_by: str | None = None,
+        order: IOrderEnum | None = IOrderEnum.ascendent,
+        batch_size: int = settings.EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream rows of a query, ordered as by `fetch_many_ordered`, in batches
+        of `batch_size` rows fetched through a server-side cursor.
+
+        Runs in its own session on the same engine, so that rows can still be
+        read after the request's session is closed, e.g. by a StreamingResponse.
+        """
+        query = self.order_query(query, order_by, order)
+        async with AsyncSession(self.session.bind) as session:
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+            async for batch in result.partitions():
+                yield batch
+
     async def create(
         self,
         obj_in: CreateSchemaType | ModelType,
@@ -164,14 +232,66 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             setattr(obj_current, field, update_data[field])
 
         db_session.add(obj_current)
+        obj_id = obj_current.id
         await db_session.commit()
+        change_listener.evict(self.model.__tablename__, [obj_id])
         await db_session.refresh(obj_current)
         return obj_current
 
+    async def update_many(
+        self,
+        list_ids: list[UUID | str | int],
+        obj_new: UpdateSchemaType | dict[str, Any],
+        db_session: AsyncSession | None = None,
+    ) -> Sequence[UUID | str | int]:
+        """
+        Set-based update of all objects with the given ids in a single statement.
+        Returns ids of the objects that were actually updated.
+        """
+        db_session = db_session or self.session
+
+        if isinstance(obj_new, dict):
+            update_data = obj_new
+        else:
+            update_data = obj_new.model_dump(exclude_unset=True)
+
+        response = await db_session.exec(
+            update(self.model)
+            .where(col(self.model.id).in_(list_ids))
+            .values(update_data)
+            .returning(self.model.id)
+        )
+        updated_ids = response.scalars().all()
+        await db_session.commit()
+        change_listener.evict(self.model.__tablename__, updated_ids)
+        return updated_ids
+
+    async def remove_many(
+        self,
+        list_ids: list[UUID | str | int],
+        db_session: AsyncSession | None = None,
+    ) -> Sequence[UUID | str | int]:
+        """
+        Set-based delete of all objects with the given ids in a single statement.
+        Returns ids of the objects that were actually deleted.
+        """
+        db_session = db_session or self.session
+        response = await db_session.exec(
+            delete(self.model)
+            .where(col(self.model.id).in_(list_ids))
+            .returning(self.model.id)
+        )
+        removed_ids = response.scalars().all()
+        await db_session.commit()
+        change_listener.evict(self.model.__tablename__, removed_ids)
+        return removed_ids
+
     async def remove(
         self, obj: ModelType, db_session: AsyncSession | None = None
     ) -> ModelType:
         db_session = db_session or self.session
+        obj_id = obj.id
         await db_session.delete(obj)
         await db_session.commit()
+        change_listener.evict(self.model.__tablename__, [obj_id])
         return obj
@@ -1,14 +1,36 @@
-from random import randint
+import re
+from collections import Counter
+from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import exc
+from sqlalchemy import and_, bindparam, exc, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import contains_eager
+from sqlmodel import col, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
 
+from app.core.notify import change_listener
 from app.crud.base import CRUDBase
-from app.models import Client, User
-from app.schemas.client import ClientCreate, ClientUpdate
+from app.models import Client, Request, User, UsernameCounter
+from app.models.request import CLOSED_REQUEST_STATUSES
+from app.schemas.client import (
+    ClientCreate,
+    ClientFilter,
+    ClientImportRowResult,
+    ClientImportStatus,
+    ClientUpdate,
+)
 from app.utils.translit import transliterate
 
+USERNAME_ALLOCATION_ATTEMPTS = 3
+
+
+def get_username_base(first_name: str, last_name: str | None) -> str:
+    username = transliterate(first_name + (last_name or "")).lower()
+    username = re.sub(r"[^a-z0-9_]", "", username)[:40]
+    return username if len(username) >= 3 else f"client_{username}"
+
 
 class CRUDClient(CRUDBase[Client, ClientCreate, ClientUpdate]):
     model = Client
@@ -21,26 +43,13 @@ class CRUDClient(CRUDBase[Client, ClientCreate, ClientUpdate]):
     ) -> Client:
         db_session = db_session or self.session
 
-        def get_username(first_name: str, last_name: str | None) -> str:
-            username = first_name + str(randint(1, 100000))
-            if last_name:
-                username += last_name
-            return transliterate(username).lower()
-
         try:
             user = User.model_validate(
-                obj_in,
-                update={
-                    "username": get_username(obj_in.first_name, obj_in.last_name),
-                    "password": None,
-                },
+                obj_in, update={"username": "pending", "password": None}
             )
-            db_session.add(user)
-            await db_session.flush()
+            await self._insert_users([user], db_session)
 
             db_obj = self.model.model_validate(obj_in, update={"user_id": user.id})
-            db_obj.user = user
-
             db_session.add(db_obj)
             await db_session.flush()
         except exc.IntegrityError as err:
@@ -73,6 +82,232 @@ class CRUDClient(CRUDBase[Client, ClientCreate, ClientUpdate]):
 
         db_session.add(obj_current.user)
         db_session.add(obj_current)
+        obj_id, user_id = obj_current.id, obj_current.user_id
         await db_session.commit()
+        change_listener.evict(self.model.__tablename__, [obj_id])
+        change_listener.evict(User.__tablename__, [user_id])
         await db_session.refresh(obj_current)
         return obj_current
+
+    @staticmethod
+    def filter_query(filters: ClientFilter, query: Select | None = None) -> Select:
+        """Filter `query` of clients, by default of Client objects."""
+        query = query if query is not None else select(Client)
+
+        if filters.ids is not None:
+            query = query.where(col(Client.id).in_(filters.ids))
+        if filters.first_name or filters.last_name:
+            users = select(User.id)
+            if filters.first_name:
+                users = users.where(col(User.first_name).contains(filters.first_name))
+            if filters.last_name:
+                users = users.where(col(User.last_name).contains(filters.last_name))
+            query = query.where(col(Client.user_id).in_(users))
+
+        return query
+
+    @staticmethod
+    def export_query(filters: ClientFilter) -> Select:
+        """Filtered clients flattened with fields of their users in a single join."""
+        return CRUDClient.filter_query(
+            filters,
+            select(
+                Client.id,
+                User.first_name,
+                User.last_name,
+                User.phone,
+                User.email,
+                Client.note,
+                Client.created_at,
+                Client.updated_at,
+            )
+            .select_from(Client)
+            .join(User),
+        )
+
+    async def fetch_by_phone(
+        self, phone: str, db_session: AsyncSession | None = None
+    ) -> tuple[Client, list[Request]] | None:
+        """
+        Fetch the oldest client having the normalized phone, with the user and
+        open requests (most recently updated first) in a single query.
+        """
+        db_session = db_session or self.session
+
+        client_id = (
+            select(Client.id)
+            .join(User)
+            .where(User.phone == phone)
+            .order_by(col(Client.created_at), col(Client.id))
+            .limit(1)
+            .scalar_subquery()
+        )
+        closed = bindparam(
+            "closed_statuses",
+            CLOSED_REQUEST_STATUSES,
+            expanding=True,
+            literal_execute=True,
+        )
+        response = await db_session.exec(
+            select(Client, Request)
+            .join(Client.user)
+            .outerjoin(
+                Request,
+                and_(
+                    col(Request.client_id) == Client.id,
+                    col(Request.status).not_in(closed),
+                ),
+            )
+            .where(Client.id == client_id)
+            .order_by(col(Request.updated_at).desc(), col(Request.id).desc())
+            .options(contains_eager(Client.user))
+        )
+        rows = response.all()
+        if not rows:
+            return None
+        return rows[0][0], [request for _, request in rows if request is not None]
+
+    async def _allocate_usernames(
+        self, bases: list[str], db_session: AsyncSession
+    ) -> list[str]:
+        """
+        Allocate `<base>_<n>` usernames by atomically reserving suffixes in
+        `username_counter`, so concurrent allocations never get the same one.
+        """
+        counts = Counter(bases)
+        query = insert(UsernameCounter).values(
+            # Sorted to lock counter rows in the same order in all transactions
+            [{"base": base, "value": counts[base]} for base in sorted(counts)]
+        )
+        response = await db_session.exec(
+            query.on_conflict_do_update(
+                index_elements=[UsernameCounter.base],
+                set_={"value": UsernameCounter.value + query.excluded.value},
+            ).returning(UsernameCounter.base, UsernameCounter.value)
+        )
+        next_suffix = {base: value - counts[base] + 1 for base, value in response.all()}
+
+        usernames = []
+        for base in bases:
+            usernames.append(f"{base}_{next_suffix[base]}")
+            next_suffix[base] += 1
+        return usernames
+
+    async def _insert_users(self, users: list[User], db_session: AsyncSession) -> None:
+        """
+        Bulk insert users with generated usernames. Usernames already taken
+        (e.g. by a manually created user) are re-allocated and inserted again.
+        """
+        pending = users
+        for _ in range(USERNAME_ALLOCATION_ATTEMPTS):
+            usernames = await self._allocate_usernames(
+                [get_username_base(u.first_name, u.last_name) for u in pending],
+                db_session,
+            )
+            for user, username in zip(pending, usernames, strict=True):
+                user.username = username
+
+            response = await db_session.exec(
+                insert(User)
+                .values([user.model_dump() for user in pending])
+                .on_conflict_do_nothing(index_elements=[User.username])
+                .returning(User.id)
+            )
+            inserted_ids = set(response.scalars().all())
+            pending = [user for user in pending if user.id not in inserted_ids]
+            if not pending:
+                return
+
+        raise HTTPException(status_code=409, detail="Can't allocate usernames")
+
+    async def _fetch_by_contacts(
+        self, phones: set[str], emails: set[str], db_session: AsyncSession
+    ) -> dict[str, Client]:
+        """Map normalized phones and emails to the oldest client having them."""
+        clients: dict[str, Client] = {}
+        if not (phones or emails):
+            return clients
+
+        response = await db_session.exec(
+            select(Client)
+            .join(User)
+            .options(contains_eager(Client.user))
+            .where(
+                or_(
+                    col(User.phone).in_(phones),
+                    func.lower(User.email).in_(emails),
+                )
+            )
+            .order_by(col(Client.created_at))
+        )
+        for client in response.all():
+            for key in (client.user.phone, client.user.email):
+                if key:
+                    clients.setdefault(key.lower(), client)
+        return clients
+
+    async def import_batch(
+        self,
+        rows: list[tuple[int, ClientCreate]],
+        db_session: AsyncSession | None = None,
+    ) -> list[ClientImportRowResult]:
+        """
+        Upsert a batch of clients, matching existing ones by phone or email.
+        New users and clients are inserted with bulk statements, the batch is
+        committed as a whole.
+        """
+        db_session = db_session or self.session
+
+        for _, obj_in in rows:
+            if obj_in.email:
+                obj_in.email = obj_in.email.lower()
+
+        existing = await self._fetch_by_contacts(
+            {obj_in.phone for _, obj_in in rows if obj_in.phone},
+            {obj_in.email for _, obj_in in rows if obj_in.email},
+            db_session,
+        )
+
+        results = []
+        seen: dict[str, UUID] = {}
+        new_users: list[User] = []
+        new_clients: list[Client] = []
+        for row_number, obj_in in rows:
+            keys = [key for key in (obj_in.phone, obj_in.email) if key]
+
+            if client_id := next((seen[key] for key in keys if key in seen), None):
+                status = ClientImportStatus.duplicate
+            elif client := next(
+                (existing[key] for key in keys if key in existing), None
+            ):
+                status = ClientImportStatus.updated
+                client_id = client.id
+                update_data = obj_in.model_dump(exclude_unset=True, exclude_none=True)
+                for field, value in update_data.items():
+                    target = client if field in client.model_fields else client.user
+                    setattr(target, field, value)
+            else:
+                status = ClientImportStatus.created
+                user = User.model_validate(
+                    obj_in, update={"username": "pending", "password": None}
+                )
+                client = self.model.model_validate(obj_in, update={"user_id": user.id})
+                client_id = client.id
+                new_users.append(user)
+                new_clients.append(client)
+
+            seen.update(dict.fromkeys(keys, client_id))
+            results.append(
+                ClientImportRowResult(
+                    row=row_number, status=status, client_id=client_id
+                )
+            )
+
+        if new_users:
+            await self._insert_users(new_users, db_session)
+            await db_session.exec(
+                insert(Client).values([client.model_dump() for client in new_clients])
+            )
+        await db_session.commit()
+
+        return results
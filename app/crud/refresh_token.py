@@ -0,0 +1,103 @@
+import secrets
+from datetime import datetime, timedelta
+from hashlib import sha256
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.crud.base import CRUDBase
+from app.models import RefreshToken, RevokedLogin, User
+
+
+def hash_refresh_token(token: str) -> str:
+    # Tokens are random, so a fast hash is enough to not store them as is
+    return sha256(token.encode()).hexdigest()
+
+
+class CRUDRefreshToken(CRUDBase[RefreshToken, RefreshToken, RefreshToken]):
+    model = RefreshToken
+
+    def issue(
+        self, login_id: UUID, user_id: UUID, db_session: AsyncSession | None = None
+    ) -> str:
+        """Add a new token of the login family to the session, returns the token."""
+        db_session = db_session or self.session
+
+        token = secrets.token_urlsafe(32)
+        db_session.add(
+            RefreshToken(
+                token_hash=hash_refresh_token(token),
+                login_id=login_id,
+                user_id=user_id,
+                expires_at=datetime.now()
+                + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        return token
+
+    async def use(
+        self, token: str, db_session: AsyncSession | None = None
+    ) -> tuple[User, UUID] | None:
+        """
+        Mark the unused and unexpired token as used and fetch its user in a
+        single statement. Returns the user and the login id.
+        """
+        db_session = db_session or self.session
+
+        used_token = (
+            update(RefreshToken)
+            .where(
+                col(RefreshToken.token_hash) == hash_refresh_token(token),
+                col(RefreshToken.used_at).is_(None),
+                col(RefreshToken.expires_at) > datetime.now(),
+            )
+            .values(used_at=datetime.now())
+            .returning(RefreshToken.login_id, RefreshToken.user_id)
+            .cte("used_token")
+        )
+        response = await db_session.exec(
+            select(User, used_token.c.login_id).join(
+                used_token, used_token.c.user_id == User.id
+            )
+        )
+        return response.one_or_none()
+
+    async def revoke_reused(
+        self, token: str, db_session: AsyncSession | None = None
+    ) -> tuple[UUID, datetime] | None:
+        """
+        If the token was already used, it may be stolen, so the whole family
+        is revoked. Returns (login id, expires at) of the revoked login.
+        """
+        db_session = db_session or self.session
+
+        response = await db_session.exec(
+            select(RefreshToken.login_id, RefreshToken.user_id).where(
+                col(RefreshToken.token_hash) == hash_refresh_token(token),
+                col(RefreshToken.used_at).is_not(None),
+            )
+        )
+        if (reused := response.one_or_none()) is None:
+            return None
+
+        login_id, user_id = reused
+        # Outlives all the access tokens issued for the login
+        expires_at = datetime.now() + timedelta(
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES + 1
+        )
+        await db_session.exec(
+            insert(RevokedLogin)
+            .values(login_id=login_id, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_update(
+                index_elements=[RevokedLogin.login_id],
+                set_={"expires_at": expires_at},
+            )
+        )
+        await db_session.exec(
+            delete(RefreshToken).where(col(RefreshToken.login_id) == login_id)
+        )
+        await db_session.commit()
+        return login_id, expires_at
@@ -1,14 +1,41 @@
+import re
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import exc
+from sqlalchemy import (
+    DateTime,
+    Uuid,
+    bindparam,
+    cast,
+    column,
+    exc,
+    literal,
+    or_,
+    true,
+    tuple_,
+    values,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSQUERY
+from sqlalchemy.orm import aliased, selectinload
+from sqlmodel import col, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
 
 from app.crud.base import CRUDBase
 from app.crud.client import CRUDClient
-from app.models import Request
+from app.models import Client, Request, User
+from app.models.request import CLOSED_REQUEST_STATUSES, RequestStatus
 from app.schemas.client import ClientCreate
-from app.schemas.request import RequestCreate, RequestCreateWithNewClient, RequestUpdate
+from app.schemas.request import (
+    RequestCreate,
+    RequestCreateWithNewClient,
+    RequestFilter,
+    RequestUpdate,
+)
+
+# Keyset of a board column without a cursor, greater than any request's one
+BOARD_START = (datetime.max, UUID(int=(1 << 128) - 1))
 
 
 class CRUDRequest(CRUDBase[Request, RequestCreate, RequestUpdate]):
@@ -33,17 +60,7 @@ class CRUDRequest(CRUDBase[Request, RequestCreate, RequestUpdate]):
                 raise HTTPException(status_code=404, detail="Client not found")
 
         try:
-            db_obj = self.model.model_validate(
-                obj_in,
-                update={
-                    "client_id": client.id,
-                    "changes_history": {
-                        k.isoformat(): v for k, v in obj_in.changes_history.items()
-                    }
-                    if "changes_history" in obj_in
-                    else None,
-                },
-            )
+            db_obj = self.model.model_validate(obj_in, update={"client_id": client.id})
 
             db_session.add(db_obj)
             await db_session.commit()
@@ -56,3 +73,195 @@ class CRUDRequest(CRUDBase[Request, RequestCreate, RequestUpdate]):
 
         await db_session.refresh(db_obj)
         return db_obj
+
+    @staticmethod
+    def filter_query(filters: RequestFilter, query: Select | None = None) -> Select:
+        """Filter `query` of requests, by default of Request objects."""
+        query = query if query is not None else select(Request)
+
+        if filters.ids is not None:
+            query = query.where(col(Request.id).in_(filters.ids))
+        if filters.first_name:
+            query = query.where(
+                col(Request.client_id).in_(
+                    select(Client.id)
+                    .join(User)
+                    .where(col(User.first_name).contains(filters.first_name))
+                )
+            )
+        if filters.status:
+            query = query.where(col(Request.status).in_(filters.status))
+        if filters.closed is not None:
+            # Rendered inline, so the planner can match the open requests index
+            closed = bindparam(
+                "closed_statuses",
+                CLOSED_REQUEST_STATUSES,
+                expanding=True,
+                literal_execute=True,
+            )
+            query = query.where(
+                col(Request.status).in_(closed)
+                if filters.closed
+                else col(Request.status).not_in(closed)
+            )
+
+        for field, value in (
+            (Request.request_service_id, filters.request_service_id),
+            (Request.client_id, filters.client_id),
+        ):
+            if value is not None:
+                query = query.where(field == value)
+        for field, since, until in (
+            (Request.created_at, filters.created_from, filters.created_to),
+            (Request.updated_at, filters.updated_from, filters.updated_to),
+        ):
+            if since is not None:
+                query = query.where(field >= since)
+            if until is not None:
+                query = query.where(field < until)
+
+        return query
+
+    @staticmethod
+    def export_query(filters: RequestFilter) -> Select:
+        """Filtered requests flattened with fields of clients in a single join."""
+        return CRUDRequest.filter_query(
+            filters,
+            select(
+                Request.id,
+                Request.status,
+                Request.note,
+                Request.number_in_program,
+                Request.request_service_id,
+                Request.client_id,
+                col(User.first_name).label("client_first_name"),
+                col(User.last_name).label("client_last_name"),
+                col(User.phone).label("client_phone"),
+                col(User.email).label("client_email"),
+                Request.created_at,
+                Request.updated_at,
+            )
+            .select_from(Request)
+            .join(Client)
+            .join(User),
+        )
+
+    async def fetch_board(
+        self,
+        columns: dict[RequestStatus, tuple[datetime, UUID] | None],
+        limit: int,
+        db_session: AsyncSession | None = None,
+    ) -> dict[RequestStatus, tuple[int, list[Request]]]:
+        """
+        Fetch the number of requests and up to `limit` + 1 most recently
+        updated ones (to tell if there are more) for each status, after its
+        (updated_at, id) keyset if given.
+
+        A single query with lateral joins per status, so each column is read
+        from the (status, updated_at, id) index and stops at the limit.
+        """
+        db_session = db_session or self.session
+
+        board = values(
+            column("status", Request.__table__.c.status.type),
+            column("updated_at", DateTime()),
+            column("id", Uuid()),
+            name="board",
+        ).data(
+            [(status, *(keyset or BOARD_START)) for status, keyset in columns.items()]
+        )
+        count = (
+            select(func.count().label("count"))
+            .select_from(Request)
+            .where(col(Request.status) == board.c.status)
+            .lateral()
+        )
+        top = (
+            select(Request)
+            .where(
+                col(Request.status) == board.c.status,
+                tuple_(col(Request.updated_at), col(Request.id))
+                < tuple_(board.c.updated_at, board.c.id),
+            )
+            .order_by(col(Request.updated_at).desc(), col(Request.id).desc())
+            .limit(limit + 1)
+            .lateral()
+        )
+        board_request = aliased(Request, top)
+
+        response = await db_session.exec(
+            select(board.c.status, count.c.count, board_request)
+            .select_from(board)
+            .join(count, true())
+            .outerjoin(top, true())
+            .order_by(top.c.updated_at.desc(), top.c.id.desc())
+            .options(selectinload(board_request.client).selectinload(Client.user))
+        )
+
+        result = {status: (0, []) for status in columns}
+        for status, status_count, request in response.all():
+            requests = result[status][1]
+            if request is not None:
+                requests.append(request)
+            result[status] = (status_count, requests)
+        return result
+
+    async def search(
+        self,
+        text: str,
+        skip: int,
+        limit: int,
+        db_session: AsyncSession | None = None,
+    ) -> list[tuple[Request, float, str | None, str | None]]:
+        """
+        Find requests by prefixes of all words of `text` in the note or the
+        number in program, or by the exact number in program. Returns
+        requests with their rank and highlighted note and number, exact
+        matches and then the most relevant first.
+
+        Matches are found with the search vector GIN and number indexes, and
+        highlights are made only for the returned page.
+        """
+        db_session = db_session or self.session
+
+        words = re.findall(r"\w+", text)
+        if not words:
+            return []
+        # Words are only letters and digits, so can't break the query syntax
+        prefixes = " & ".join(f"{word}:*" for word in words)
+        simple = cast(literal("simple"), REGCONFIG)
+        russian = cast(literal("russian"), REGCONFIG)
+        # A subquery is computed once, not for every matched request, as the
+        # configuration names are only resolved at execution
+        query = select(
+            func.to_tsquery(simple, prefixes, type_=TSQUERY).op("||")(
+                func.to_tsquery(russian, prefixes, type_=TSQUERY)
+            )
+        ).scalar_subquery()
+
+        search_vector = Request.__table__.c.search_vector
+        exact = col(Request.number_in_program) == text
+        # Requests without number aren't exact matches either
+        exact_first = func.coalesce(exact, False).desc()
+        rank = func.ts_rank(search_vector, query)
+        found = (
+            select(col(Request.id).label("id"), rank.label("rank"))
+            .where(or_(search_vector.op("@@")(query), exact))
+            .order_by(exact_first, rank.desc(), col(Request.id))
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+
+        response = await db_session.exec(
+            select(
+                Request,
+                found.c.rank,
+                func.ts_headline(russian, Request.note, query),
+                func.ts_headline(simple, Request.number_in_program, query),
+            )
+            .join(found, col(Request.id) == found.c.id)
+            .order_by(exact_first, found.c.rank.desc(), col(Request.id))
+            .options(selectinload(Request.client).selectinload(Client.user))
+        )
+        return list(response.all())
@@ -0,0 +1,70 @@
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import exc, tuple_
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models import RequestHistory
+from app.schemas.request import RequestHistoryCreate
+
+
+class CRUDRequestHistory(
+    CRUDBase[RequestHistory, RequestHistoryCreate, RequestHistoryCreate]
+):
+    model = RequestHistory
+
+    async def create(
+        self,
+        obj_in: RequestHistoryCreate,
+        request_id: UUID,
+        author_id: UUID | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> RequestHistory:
+        db_session = db_session or self.session
+
+        db_obj = self.model.model_validate(
+            obj_in, update={"request_id": request_id, "author_id": author_id}
+        )
+        try:
+            db_session.add(db_obj)
+            await db_session.commit()
+        except exc.IntegrityError as err:
+            await db_session.rollback()
+            raise HTTPException(status_code=404, detail="Request not found") from err
+
+        await db_session.refresh(db_obj)
+        return db_obj
+
+    async def fetch_page(
+        self,
+        request_id: UUID,
+        limit: int,
+        before: tuple[datetime, UUID] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> Sequence[RequestHistory]:
+        """
+        Fetch up to `limit` latest records of the request, older than the
+        (created_at, id) keyset if given.
+        """
+        db_session = db_session or self.session
+
+        query = (
+            select(RequestHistory)
+            .where(RequestHistory.request_id == request_id)
+            .order_by(
+                col(RequestHistory.created_at).desc(), col(RequestHistory.id).desc()
+            )
+            .limit(limit)
+        )
+        if before is not None:
+            query = query.where(
+                tuple_(col(RequestHistory.created_at), col(RequestHistory.id))
+                < tuple_(*before)
+            )
+
+        response = await db_session.exec(query)
+        return response.all()
@@ -0,0 +1,79 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, cast, tuple_
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models import RequestStats
+from app.schemas.stats import (
+    RequestMonthCount,
+    RequestServiceCount,
+    RequestStatsRead,
+    RequestStatusCount,
+)
+
+
+class CRUDRequestStats(CRUDBase[RequestStats, RequestStats, RequestStats]):
+    model = RequestStats
+
+    async def fetch_summary(
+        self,
+        month_from: date | None = None,
+        month_to: date | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> RequestStatsRead:
+        """
+        Sum counters per status, per request service, per month and in total
+        with a single grouping sets query, for requests created in the given
+        months (inclusive).
+        """
+        db_session = db_session or self.session
+
+        status = col(RequestStats.status)
+        request_service_id = col(RequestStats.request_service_id)
+        month = col(RequestStats.month)
+        query = (
+            select(
+                # Bit mask of the columns not in the grouping set
+                func.grouping(status, request_service_id, month),
+                status,
+                request_service_id,
+                month,
+                # The empty grouping set sums no rows to NULL
+                cast(func.coalesce(func.sum(RequestStats.count), 0), BigInteger),
+            )
+            .where(RequestStats.count != 0)
+            .group_by(
+                func.grouping_sets(
+                    tuple_(status), tuple_(request_service_id), tuple_(month), tuple_()
+                )
+            )
+            .order_by(status, request_service_id, month)
+        )
+        if month_from is not None:
+            query = query.where(month >= month_from.replace(day=1))
+        if month_to is not None:
+            query = query.where(month <= month_to.replace(day=1))
+
+        summary = RequestStatsRead(
+            total=0, by_status=[], by_request_service=[], by_month=[]
+        )
+        response = await db_session.exec(query)
+        for grouping, *row, count in response.all():
+            match grouping:
+                case 0b011:
+                    summary.by_status.append(
+                        RequestStatusCount(status=row[0], count=count)
+                    )
+                case 0b101:
+                    summary.by_request_service.append(
+                        RequestServiceCount(request_service_id=row[1], count=count)
+                    )
+                case 0b110:
+                    summary.by_month.append(
+                        RequestMonthCount(month=row[2], count=count)
+                    )
+                case 0b111:
+                    summary.total = count
+        return summary
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from sqlalchemy import tuple_
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models import RequestStatusTransition
+from app.schemas.stats import RequestStatusConversion, RequestStatusTime
+
+
+class CRUDRequestStatusTransition(
+    CRUDBase[RequestStatusTransition, RequestStatusTransition, RequestStatusTransition]
+):
+    model = RequestStatusTransition
+
+    async def fetch_status_times(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> list[RequestStatusTime]:
+        """
+        Time spent in each status and the statuses requests moved to next,
+        for statuses entered in the given period.
+
+        Stays are paired with the next transition of the same request by
+        window functions, reading transitions in the order of the request id
+        index, so requests themselves aren't scanned.
+        """
+        db_session = db_session or self.session
+
+        to_status = col(RequestStatusTransition.to_status)
+        created_at = col(RequestStatusTransition.created_at)
+        window = {
+            "partition_by": RequestStatusTransition.request_id,
+            "order_by": (created_at, col(RequestStatusTransition.id)),
+        }
+        stays = select(
+            to_status.label("status"),
+            created_at.label("entered_at"),
+            func.lead(created_at, type_=created_at.type)
+            .over(**window)
+            .label("left_at"),
+            func.lead(to_status, type_=to_status.type)
+            .over(**window)
+            .label("next_status"),
+        )
+        if since is not None:
+            # Later transitions are still read to know when the stays ended
+            stays = stays.where(created_at >= since)
+        stays = stays.subquery()
+
+        duration = func.extract("epoch", stays.c.left_at - stays.c.entered_at)
+        query = (
+            select(
+                # 1 for the totals of a status, 0 per next status
+                func.grouping(stays.c.next_status),
+                stays.c.status,
+                stays.c.next_status,
+                func.count(),
+                func.count(stays.c.left_at),
+                func.avg(duration),
+                func.percentile_cont(0.5).within_group(duration),
+                func.percentile_cont(0.9).within_group(duration),
+            )
+            .group_by(
+                func.grouping_sets(
+                    tuple_(stays.c.status), tuple_(stays.c.status, stays.c.next_status)
+                )
+            )
+            .order_by(
+                stays.c.status,
+                func.grouping(stays.c.next_status).desc(),
+                func.count().desc(),
+                stays.c.next_status,
+            )
+        )
+        if until is not None:
+            query = query.where(stays.c.entered_at < until)
+
+        times: list[RequestStatusTime] = []
+        response = await db_session.exec(query)
+        for grouping, status, next_status, count, left, *durations in response.all():
+            if grouping:
+                times.append(
+                    RequestStatusTime(
+                        status=status,
+                        entered=count,
+                        left=left,
+                        avg_seconds=durations[0],
+                        median_seconds=durations[1],
+                        p90_seconds=durations[2],
+                        next_statuses=[],
+                    )
+                )
+            elif next_status is not None:
+                times[-1].next_statuses.append(
+                    RequestStatusConversion(
+                        status=next_status, count=count, rate=count / times[-1].left
+                    )
+                )
+        return times
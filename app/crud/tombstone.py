@@ -0,0 +1,35 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import tuple_
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models import Tombstone
+
+
+class CRUDTombstone(CRUDBase[Tombstone, Tombstone, Tombstone]):
+    model = Tombstone
+
+    async def fetch_deleted(
+        self,
+        since: datetime | None,
+        until: datetime,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 100,
+        db_session: AsyncSession | None = None,
+    ) -> Sequence[Tombstone]:
+        """Tombstones as objects of `fetch_changed`, by (deleted_at, id)."""
+        db_session = db_session or self.session
+
+        deleted_at, tombstone_id = col(Tombstone.deleted_at), col(Tombstone.id)
+        query = select(Tombstone).where(deleted_at <= until)
+        if since is not None:
+            query = query.where(deleted_at > since)
+        if after is not None:
+            query = query.where(tuple_(deleted_at, tombstone_id) > tuple_(*after))
+        query = query.order_by(deleted_at, tombstone_id).limit(limit)
+
+        response = await db_session.exec(query)
+        return response.all()
@@ -1,8 +1,22 @@
-from sqlmodel import select
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import BigInteger, case, func, literal, true, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, delete, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import settings
 from app.crud.base import CRUDBase
-from app.models import User
+from app.models import (
+    Permission,
+    RefreshToken,
+    RevokedLogin,
+    User,
+    UserLogin,
+    UserLoginSucceed,
+)
 from app.schemas.user import UserCreate, UserUpdate
 
 
@@ -16,3 +30,197 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         query = select(User).where(User.username == username)
         response = await db_session.exec(query)
         return response.one_or_none()
+
+    async def fetch_with_scopes(
+        self,
+        user_id: UUID,
+        scopes: Sequence[str],
+        db_session: AsyncSession | None = None,
+    ) -> tuple[User, bool] | None:
+        """
+        Fetch the user and check if they have all the scopes, comparing the
+        user permissions mask with the mask of the scopes in the same query.
+        """
+        db_session = db_session or self.session
+
+        required_scopes = set(scopes)
+        required = (
+            select(
+                func.coalesce(
+                    func.bit_or(literal(1, BigInteger).op("<<")(Permission.bit)), 0
+                ).label("mask"),
+                func.count().label("found"),
+            )
+            .where(col(Permission.name).in_(required_scopes))
+            .subquery("required")
+        )
+
+        has_scopes = (required.c.found == len(required_scopes)) & (
+            User.permissions_mask.op("&")(required.c.mask) == required.c.mask
+        )
+        response = await db_session.exec(
+            select(User, has_scopes)
+            .join(required, true())
+            .where(col(User.id) == user_id)
+        )
+        return response.one_or_none()
+
+    async def fetch_granted_scopes(
+        self,
+        user_id: UUID,
+        scopes: Sequence[str],
+        db_session: AsyncSession | None = None,
+    ) -> set[str]:
+        """Which of the scopes the user has, by the user permissions mask."""
+        db_session = db_session or self.session
+
+        bit = literal(1, BigInteger).op("<<")(Permission.bit)
+        response = await db_session.exec(
+            select(Permission.name)
+            .join(User, User.permissions_mask.op("&")(bit) != 0)
+            .where(col(User.id) == user_id, col(Permission.name).in_(scopes))
+        )
+        return set(response.all())
+
+    async def fetch_by_username_for_login(
+        self,
+        *,
+        username: str,
+        dt_now: datetime,
+        db_session: AsyncSession | None = None,
+    ) -> tuple[User, datetime | None] | None:
+        """
+        Count a login attempt and fetch the user in a single statement.
+        Returns the user and the time the account is blocked before.
+
+        The counter row is locked until the end of the transaction, so
+        concurrent attempts for the same user are counted one after another.
+        An already blocked account is left as is. If the maximum number of
+        attempts is reached within `MAX_LOGIN_ATTEMPTS_PERIOD` minutes, the
+        account is blocked, otherwise the counter is restarted.
+        """
+        db_session = db_session or self.session
+
+        attempts = UserLogin.attempts + 1
+        is_blocked = col(UserLogin.blocked_before) >= dt_now
+        is_exceeded = attempts >= settings.MAX_LOGIN_ATTEMPTS
+        is_recent = dt_now - func.greatest(
+            UserLogin.last_attempt_at, UserLogin.blocked_before
+        ) <= timedelta(minutes=settings.MAX_LOGIN_ATTEMPTS_PERIOD)
+
+        query = insert(UserLogin).from_select(
+            ["user_id", "attempts", "last_attempt_at"],
+            select(User.id, literal(1), literal(dt_now)).where(
+                User.username == username
+            ),
+        )
+        login_attempt = (
+            query.on_conflict_do_update(
+                index_elements=[UserLogin.user_id],
+                set_={
+                    "attempts": case(
+                        (is_blocked, UserLogin.attempts),
+                        (is_exceeded & ~is_recent, 1),
+                        else_=attempts,
+                    ),
+                    "last_attempt_at": case(
+                        (is_blocked, UserLogin.last_attempt_at), else_=dt_now
+                    ),
+                    "blocked_before": case(
+                        (is_blocked, UserLogin.blocked_before),
+                        (
+                            is_exceeded & is_recent,
+                            literal(dt_now)
+                            + literal(
+                                timedelta(
+                                    minutes=settings.MAX_LOGIN_ATTEMPTS_BLOCK_TIME
+                                )
+                            )
+                            * attempts,
+                        ),
+                        else_=UserLogin.blocked_before,
+                    ),
+                },
+            )
+            .returning(UserLogin.user_id, UserLogin.blocked_before)
+            .cte("login_attempt")
+        )
+
+        response = await db_session.exec(
+            select(User, login_attempt.c.blocked_before).join(
+                login_attempt, login_attempt.c.user_id == User.id
+            )
+        )
+        return response.one_or_none()
+
+    async def reset_login_attempts(
+        self, user_id: UUID, db_session: AsyncSession | None = None
+    ) -> None:
+        db_session = db_session or self.session
+        await db_session.exec(
+            update(UserLogin)
+            .where(col(UserLogin.user_id) == user_id)
+            .values(attempts=0, blocked_before=None)
+        )
+
+    async def revoke_login(
+        self,
+        login_id: UUID,
+        user_id: UUID,
+        expires_at: datetime,
+        db_session: AsyncSession | None = None,
+    ) -> None:
+        """Revoke the login and its refresh tokens."""
+        db_session = db_session or self.session
+        await db_session.exec(
+            insert(RevokedLogin)
+            .values(login_id=login_id, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing()
+        )
+        await db_session.exec(
+            delete(RefreshToken).where(col(RefreshToken.login_id) == login_id)
+        )
+        await db_session.commit()
+
+    async def revoke_logins(
+        self, user_id: UUID, db_session: AsyncSession | None = None
+    ) -> list[tuple[UUID, datetime]]:
+        """
+        Revoke all logins of the user with possibly unexpired access or refresh
+        tokens. Returns (login id, expires at) of the revoked logins.
+        """
+        db_session = db_session or self.session
+
+        dt_now = datetime.now()
+        lifetime = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        login_ids = union(
+            select(UserLoginSucceed.id).where(
+                UserLoginSucceed.user_id == user_id,
+                col(UserLoginSucceed.created_at) > dt_now - lifetime,
+            ),
+            select(RefreshToken.login_id).where(
+                RefreshToken.user_id == user_id,
+                col(RefreshToken.expires_at) > dt_now,
+            ),
+        ).subquery()
+        response = await db_session.exec(
+            insert(RevokedLogin)
+            .from_select(
+                ["login_id", "user_id", "expires_at", "created_at"],
+                select(
+                    login_ids.c.id,
+                    literal(user_id),
+                    # Outlives all the access tokens issued for the logins
+                    literal(dt_now + lifetime + timedelta(minutes=1)),
+                    literal(dt_now),
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(RevokedLogin.login_id, RevokedLogin.expires_at)
+        )
+        revoked = response.all()
+        await db_session.exec(
+            delete(RefreshToken).where(col(RefreshToken.user_id) == user_id)
+        )
+        await db_session.commit()
+        return revoked
@@ -4,8 +4,21 @@ from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.utils.timezone import local_timezone
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+
+def connect_args() -> dict:
+    """
+    Sessions in the time zone of the app, so that naive timestamps of the
+    database, e.g. `localtimestamp` in triggers, compare to the ones of
+    datetime.now().
+    """
+    return {"server_settings": {"TimeZone": local_timezone()}}
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL, echo=True, future=True, connect_args=connect_args()
+)
 
 
 # async def init_db():
@@ -1,5 +1,6 @@
 import time
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from datetime import datetime
 
 import structlog
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -13,8 +14,16 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from app.api.v1.api import api_router as api_router_v1
+from app.core.audit import login_audit
 from app.core.config import ModeEnum, settings
-from app.core.tasks import unlink_unused_files
+from app.core.notify import change_listener
+from app.core.revocation import revocation_filter
+from app.core.tasks import (
+    delete_expired_tokens,
+    delete_expired_tombstones,
+    maintain_login_partitions,
+    unlink_unused_files,
+)
 from app.utils.custom_logging import setup_logging
 from app.utils.rate_limit import limiter
 
@@ -30,13 +39,43 @@ async def schedule_tasks() -> None:
         minutes=settings.STORAGE_CLEANUP_INTERVAL,
         id="unlink_unused_files",
     )
+    scheduler.add_job(
+        maintain_login_partitions,
+        "interval",
+        hours=24,
+        next_run_time=datetime.now(),
+        id="maintain_login_partitions",
+    )
+    scheduler.add_job(
+        revocation_filter.refresh,
+        "interval",
+        seconds=settings.REVOCATION_REFRESH_INTERVAL,
+        id="refresh_revocation_filter",
+    )
+    scheduler.add_job(
+        delete_expired_tokens,
+        "interval",
+        hours=1,
+        id="delete_expired_tokens",
+    )
+    scheduler.add_job(
+        delete_expired_tombstones,
+        "interval",
+        hours=24,
+        id="delete_expired_tombstones",
+    )
 
 
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI) -> AbstractAsyncContextManager[None]:
+    await revocation_filter.refresh()
     await schedule_tasks()
     scheduler.start()
+    await login_audit.start()
+    await change_listener.start()
     yield
+    await change_listener.stop()
+    await login_audit.stop()
     scheduler.shutdown()
 
 
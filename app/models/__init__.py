@@ -1,9 +1,21 @@
 from .attach import Attach
 from .attach_group import AttachGroup
+from .change_notification import CHANGE_NOTIFICATION_DDL
 from .client import Client
 from .permission import Permission
+from .permission_mask import PERMISSION_MASK_DDL
+from .refresh_token import RefreshToken
 from .request import Request
+from .request_history import RequestHistory
 from .request_service import RequestService
+from .request_stats import REQUEST_STATS_DDL, RequestStats
+from .request_status_transition import (
+    REQUEST_STATUS_TRANSITION_DDL,
+    RequestStatusTransition,
+)
+from .revoked_login import RevokedLogin
 from .role import Role, RolePermission
+from .tombstone import TOMBSTONE_DDL, Tombstone
 from .user import User, UserRoles
 from .user_login import UserLogin, UserLoginSucceed
+from .username_counter import UsernameCounter
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.attach_group import AttachGroup
@@ -12,13 +13,18 @@ class AttachBase(SQLModel):
     content_type: str = Field(nullable=True, default=None)
     size: int
 
-    creator_id: UUID = Field(foreign_key="user.id")
+    creator_id: UUID = Field(foreign_key="user.id", index=True)
     group_id: int | None = Field(
-        foreign_key="attach_group.id", nullable=True, default=None
+        foreign_key="attach_group.id", nullable=True, default=None, index=True
     )
 
-    request_id: UUID = Field(foreign_key="request.id", default=None, nullable=True)
+    request_id: UUID = Field(
+        foreign_key="request.id", default=None, nullable=True, index=True
+    )
 
 
 class Attach(BaseUUIDModel, AttachBase, table=True):
+    # Changes for GET /sync
+    __table_args__ = (Index("ix_attach_updated_at", "updated_at", "id"),)
+
     group: AttachGroup | None = Relationship()
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 from app.models.base import BaseIDModel
@@ -9,5 +10,5 @@ class AttachGroupBase(SQLModel):
 
 class AttachGroup(BaseIDModel, AttachGroupBase, table=True):
     __tablename__ = "attach_group"
-
-    pass
+    # Changes for GET /sync
+    __table_args__ = (Index("ix_attach_group_updated_at", "updated_at", "id"),)
@@ -4,6 +4,8 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlmodel import Field, SQLModel
 
+from app.utils.uuid7 import uuid7
+
 
 class BaseCUTimeModel(AsyncAttrs, SQLModel):
     updated_at: datetime | None = Field(
@@ -14,9 +16,8 @@ class BaseCUTimeModel(AsyncAttrs, SQLModel):
 
 class BaseUUIDModel(BaseCUTimeModel):
     id: uuid.UUID = Field(
-        default_factory=uuid.uuid4,
+        default_factory=uuid7,
         primary_key=True,
-        index=True,
         nullable=False,
     )
 
@@ -25,6 +26,5 @@ class BaseIDModel(BaseCUTimeModel):
     id: int | None = Field(
         default=None,
         primary_key=True,
-        index=True,
         nullable=False,
     )
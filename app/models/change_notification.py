@@ -0,0 +1,58 @@
+"""
+Change notifications.
+
+Inserts, updates and deletes of requests, clients, attachs and the rows they
+are read with are notified on the `changes` channel by statement-level
+triggers, sent by PostgreSQL when the transaction commits, see
+app.core.notify. Triggers cover cascades and bulk statements which bypass the
+ORM. Ids of changed rows are sent in chunks to stay below the limit of the
+payload size.
+"""
+
+from sqlalchemy import DDL, event
+from sqlmodel import SQLModel
+
+CHANGES_CHANNEL = "changes"
+CHANGE_NOTIFICATION_TABLES = (
+    "request",
+    "client",
+    "attach",
+    "user",
+    "attach_group",
+    "request_service",
+)
+
+CHANGE_NOTIFICATION_DDL = (
+    f"""
+    CREATE OR REPLACE FUNCTION notify_changes() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('{CHANGES_CHANNEL}', json_build_object(
+            'entity', TG_TABLE_NAME,
+            'action', lower(TG_OP),
+            'ids', array_agg(id)
+        )::text)
+        FROM (
+            SELECT id, (row_number() OVER () - 1) / 100 AS chunk
+            FROM changed_rows
+        ) AS changes
+        GROUP BY chunk;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_notify_changes_{operation}
+        AFTER {operation} ON "{table}" REFERENCING {transition} AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_changes()
+        """
+        for table in CHANGE_NOTIFICATION_TABLES
+        for operation, transition in (
+            ("insert", "NEW TABLE"),
+            ("update", "NEW TABLE"),
+            ("delete", "OLD TABLE"),
+        )
+    ),
+)
+
+for statement in CHANGE_NOTIFICATION_DDL:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement))
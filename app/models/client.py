@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 from uuid import UUID
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.base import BaseUUIDModel
@@ -10,10 +11,13 @@ if TYPE_CHECKING:
 
 
 class ClientBase(SQLModel):
-    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE")
+    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
     note: str | None = Field(nullable=True, default=None)
 
 
 class Client(BaseUUIDModel, ClientBase, table=True):
+    # Changes for GET /sync
+    __table_args__ = (Index("ix_client_updated_at", "updated_at", "id"),)
+
     user: "User" = Relationship()
     requests: "Request" = Relationship(back_populates="client")
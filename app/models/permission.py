@@ -1,8 +1,15 @@
+from sqlalchemy import CheckConstraint, SmallInteger
 from sqlmodel import Field
 
 from app.models.base import BaseIDModel
 
 
 class Permission(BaseIDModel, table=True):
+    __table_args__ = (CheckConstraint("bit BETWEEN 0 AND 62", name="permission_bit"),)
+
     name: str = Field(nullable=False, unique=True)
-    description: str | None = Field(default=None, nullable=True)
\ No newline at end of file
+    description: str | None = Field(default=None, nullable=True)
+    # Position in the permissions masks, assigned by a trigger on insert
+    bit: int | None = Field(
+        default=None, sa_type=SmallInteger, nullable=False, unique=True
+    )
@@ -0,0 +1,142 @@
+"""
+Permission bitmasks.
+
+Every permission gets a stable bit, roles and users store masks of their
+permissions, so a scope check is a single bitwise AND. The masks are
+maintained by triggers on `rolepermission`, `role`, `userroles` and
+`permission`.
+"""
+
+from sqlalchemy import DDL, event
+from sqlmodel import SQLModel
+
+PERMISSION_MASK_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION assign_permission_bit() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.bit IS NULL THEN
+            -- Serializes concurrent assignments
+            PERFORM pg_advisory_xact_lock(hashtext('permission.bit'));
+            SELECT min(free_bit) INTO NEW.bit
+            FROM generate_series(0, 62) AS free_bit
+            WHERE NOT EXISTS (SELECT FROM permission WHERE bit = free_bit);
+            IF NEW.bit IS NULL THEN
+                RAISE EXCEPTION 'No free permission bits left';
+            END IF;
+        END IF;
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION refresh_role_permissions_mask(role_ids uuid[])
+    RETURNS void AS $$
+    BEGIN
+        UPDATE role SET permissions_mask = mask.value
+        FROM (
+            SELECT role.id, coalesce(bit_or(1::bigint << permission.bit), 0) AS value
+            FROM role
+            LEFT JOIN rolepermission ON rolepermission.role_id = role.id
+            LEFT JOIN permission ON permission.id = rolepermission.permission_id
+            WHERE role.id = any(role_ids)
+            GROUP BY role.id
+        ) AS mask
+        WHERE role.id = mask.id AND role.permissions_mask <> mask.value;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION refresh_user_permissions_mask(user_ids uuid[])
+    RETURNS void AS $$
+    BEGIN
+        UPDATE "user" SET permissions_mask = mask.value
+        FROM (
+            SELECT "user".id, coalesce(bit_or(role.permissions_mask), 0) AS value
+            FROM "user"
+            LEFT JOIN userroles ON userroles.user_id = "user".id
+            LEFT JOIN role ON role.id = userroles.role_id
+            WHERE "user".id = any(user_ids)
+            GROUP BY "user".id
+        ) AS mask
+        WHERE "user".id = mask.id AND "user".permissions_mask <> mask.value;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION rolepermission_refresh_mask() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM refresh_role_permissions_mask(
+                ARRAY(SELECT DISTINCT role_id FROM new_rows)
+            );
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM refresh_role_permissions_mask(
+                ARRAY(SELECT DISTINCT role_id FROM old_rows)
+            );
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION userroles_refresh_mask() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM refresh_user_permissions_mask(
+                ARRAY(SELECT DISTINCT user_id FROM new_rows)
+            );
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM refresh_user_permissions_mask(
+                ARRAY(SELECT DISTINCT user_id FROM old_rows)
+            );
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION role_refresh_users_mask() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_user_permissions_mask(
+            ARRAY(SELECT user_id FROM userroles WHERE role_id = NEW.id)
+        );
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION permission_refresh_roles_mask() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_role_permissions_mask(
+            ARRAY(SELECT role_id FROM rolepermission WHERE permission_id = NEW.id)
+        );
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER permission_assign_bit BEFORE INSERT ON permission
+    FOR EACH ROW EXECUTE FUNCTION assign_permission_bit()
+    """,
+    """
+    CREATE TRIGGER permission_refresh_mask AFTER UPDATE OF bit ON permission
+    FOR EACH ROW WHEN (OLD.bit IS DISTINCT FROM NEW.bit)
+    EXECUTE FUNCTION permission_refresh_roles_mask()
+    """,
+    """
+    CREATE TRIGGER role_refresh_mask AFTER UPDATE OF permissions_mask ON role
+    FOR EACH ROW WHEN (OLD.permissions_mask IS DISTINCT FROM NEW.permissions_mask)
+    EXECUTE FUNCTION role_refresh_users_mask()
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_refresh_mask_{operation} AFTER {operation} ON {table}
+        REFERENCING {transition}
+        FOR EACH STATEMENT EXECUTE FUNCTION {table}_refresh_mask()
+        """
+        for table in ("rolepermission", "userroles")
+        for operation, transition in (
+            ("insert", "NEW TABLE AS new_rows"),
+            ("update", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("delete", "OLD TABLE AS old_rows"),
+        )
+    ),
+)
+
+for statement in PERMISSION_MASK_DDL:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement))
@@ -0,0 +1,21 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class RefreshToken(SQLModel, table=True):
+    """
+    Refresh tokens are stored as SHA-256 hashes and rotated on every use.
+    All tokens issued for one login share its `login_id` (the token family).
+    Used tokens are kept until they expire, to detect their reuse.
+    """
+
+    __tablename__ = "refresh_token"
+
+    token_hash: str = Field(primary_key=True, max_length=64)
+    login_id: UUID = Field(index=True)
+    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
+    expires_at: datetime = Field(nullable=False)
+    used_at: datetime | None = Field(default=None, nullable=True)
+    created_at: datetime = Field(default_factory=datetime.now)
@@ -2,8 +2,8 @@ import enum
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Column, Enum
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Computed, Enum, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.base import BaseUUIDModel
@@ -24,19 +24,71 @@ class RequestStatus(enum.IntEnum):
     FAKE = 8  # Не настоящая  # noqa: RUF003
 
 
+# Requests not in work anymore, excluded from the open requests index
+CLOSED_REQUEST_STATUSES = (
+    RequestStatus.LOST,
+    RequestStatus.COMPLETED,
+    RequestStatus.FAKE,
+)
+
+
 class RequestBase(SQLModel):
     status: RequestStatus = Field(
         default=RequestStatus.NEW, sa_column=Column(Enum(RequestStatus))
     )
     note: str | None = Field(default=None, nullable=True)
-    number_in_program: str | None = Field(default=None, nullable=True)
-    changes_history: dict[str, str] | None = Field(
-        default=None, nullable=True, sa_type=JSONB
-    )  # JSON {"01.01.2000": "some text", "02.02.2000": "some other text"}
+    number_in_program: str | None = Field(default=None, nullable=True, index=True)
 
-    client_id: UUID = Field(foreign_key="client.id", ondelete="CASCADE")
+    client_id: UUID = Field(foreign_key="client.id", ondelete="CASCADE", index=True)
     request_service_id: int = Field(foreign_key="request_service.id")
 
 
+# Words of numbers are matched as is and of notes also by Russian stems, see
+# CRUDRequest.search. Punctuation is dropped, so e.g. "AB-1024" is split into
+# "ab" and "1024" instead of "ab" and "-1024".
+REQUEST_SEARCH_VECTOR = r"""
+    setweight(to_tsvector('simple',
+        regexp_replace(coalesce(number_in_program, ''), '\W+', ' ', 'g')), 'A')
+    || setweight(to_tsvector('russian', coalesce(note, '')), 'B')
+    || setweight(to_tsvector('simple',
+        regexp_replace(coalesce(note, ''), '\W+', ' ', 'g')), 'D')
+"""
+
+
 class Request(BaseUUIDModel, RequestBase, table=True):
+    __table_args__ = (
+        Column(
+            "search_vector",
+            TSVECTOR,
+            Computed(REQUEST_SEARCH_VECTOR, persisted=True),
+        ),
+        Index("ix_request_search_vector", "search_vector", postgresql_using="gin"),
+        # Pipeline board, see CRUDRequest.fetch_board
+        Index("ix_request_status_updated_at", "status", "updated_at", "id"),
+        # Filters and ordering of GET /requests
+        Index(
+            "ix_request_service_status_updated_at",
+            "request_service_id",
+            "status",
+            "updated_at",
+            "id",
+        ),
+        Index("ix_request_created_at", "created_at", "id"),
+        # Changes for GET /sync
+        Index("ix_request_updated_at", "updated_at", "id"),
+        Index(
+            "ix_request_open_updated_at",
+            "updated_at",
+            "id",
+            postgresql_where=text(
+                "status NOT IN ({})".format(
+                    ", ".join(f"'{status.name}'" for status in CLOSED_REQUEST_STATUSES)
+                )
+            ),
+        ),
+    )
+
+    # Not loaded with requests, queried as Request.__table__.c.search_vector
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
+
     client: "Client" = Relationship(back_populates="requests")
@@ -0,0 +1,27 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from app.utils.uuid7 import uuid7
+
+
+class RequestHistoryBase(SQLModel):
+    text: str = Field(min_length=1)
+
+
+class RequestHistory(RequestHistoryBase, table=True):
+    """Append-only log of request changes and notes."""
+
+    __tablename__ = "request_history"
+    __table_args__ = (
+        Index("ix_request_history_request_id", "request_id", "created_at", "id"),
+    )
+
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
+    request_id: UUID = Field(foreign_key="request.id", ondelete="CASCADE")
+    author_id: UUID | None = Field(
+        default=None, foreign_key="user.id", ondelete="SET NULL", index=True
+    )
+    created_at: datetime = Field(default_factory=datetime.now)
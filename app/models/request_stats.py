@@ -0,0 +1,88 @@
+"""
+Request statistics.
+
+Numbers of requests per status, request service and month of creation,
+maintained by statement-level triggers on `request`, so the dashboard
+doesn't have to scan requests.
+"""
+
+from datetime import date
+
+from sqlalchemy import DDL, BigInteger, Column, Enum, event
+from sqlmodel import Field, SQLModel
+
+from app.models.request import RequestStatus
+
+
+class RequestStats(SQLModel, table=True):
+    __tablename__ = "request_stats"
+
+    status: RequestStatus = Field(
+        sa_column=Column(Enum(RequestStatus), primary_key=True)
+    )
+    # Not a foreign key, so that services stay removable
+    request_service_id: int = Field(primary_key=True)
+    month: date = Field(primary_key=True)
+    count: int = Field(default=0, sa_type=BigInteger)
+
+
+REQUEST_STATS_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION request_refresh_stats() RETURNS trigger AS $$
+    BEGIN
+        -- Counters are upserted in the same order to not deadlock, updates
+        -- not changing the counted columns don't change them
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO request_stats AS stats
+                (status, request_service_id, month, count)
+            SELECT status, request_service_id,
+                date_trunc('month', created_at)::date, count(*)
+            FROM new_rows
+            GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+            ON CONFLICT (status, request_service_id, month)
+            DO UPDATE SET count = stats.count + excluded.count;
+        ELSIF TG_OP = 'DELETE' THEN
+            INSERT INTO request_stats AS stats
+                (status, request_service_id, month, count)
+            SELECT status, request_service_id,
+                date_trunc('month', created_at)::date, -count(*)
+            FROM old_rows
+            GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+            ON CONFLICT (status, request_service_id, month)
+            DO UPDATE SET count = stats.count + excluded.count;
+        ELSE
+            INSERT INTO request_stats AS stats
+                (status, request_service_id, month, count)
+            SELECT status, request_service_id, month, sum(delta)
+            FROM (
+                SELECT status, request_service_id,
+                    date_trunc('month', created_at)::date AS month, 1 AS delta
+                FROM new_rows
+                UNION ALL
+                SELECT status, request_service_id,
+                    date_trunc('month', created_at)::date, -1
+                FROM old_rows
+            ) AS changes
+            GROUP BY 1, 2, 3 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3
+            ON CONFLICT (status, request_service_id, month)
+            DO UPDATE SET count = stats.count + excluded.count;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER request_refresh_stats_{operation} AFTER {operation} ON request
+        REFERENCING {transition}
+        FOR EACH STATEMENT EXECUTE FUNCTION request_refresh_stats()
+        """
+        for operation, transition in (
+            ("insert", "NEW TABLE AS new_rows"),
+            ("update", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("delete", "OLD TABLE AS old_rows"),
+        )
+    ),
+)
+
+for statement in REQUEST_STATS_DDL:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement))
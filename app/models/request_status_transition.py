@@ -0,0 +1,81 @@
+"""
+Request status transitions.
+
+Every status change of a request (and its initial status) is logged by
+statement-level triggers on `request`, in the transaction of the change, to
+compute time spent in statuses and conversion between them.
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DDL, BigInteger, Column, Enum, Index, event
+from sqlmodel import Field, SQLModel
+
+from app.models.request import RequestStatus
+
+
+class RequestStatusTransition(SQLModel, table=True):
+    __tablename__ = "request_status_transition"
+    __table_args__ = (
+        # Ordered transitions of each request for window functions
+        Index(
+            "ix_request_status_transition_request_id",
+            "request_id",
+            "created_at",
+            "id",
+            postgresql_include=["to_status"],
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True, sa_type=BigInteger)
+    request_id: UUID = Field(foreign_key="request.id", ondelete="CASCADE")
+    # None for the initial status
+    from_status: RequestStatus | None = Field(
+        default=None, sa_column=Column(Enum(RequestStatus), nullable=True)
+    )
+    to_status: RequestStatus = Field(
+        sa_column=Column(Enum(RequestStatus), nullable=False)
+    )
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+REQUEST_STATUS_TRANSITION_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION request_log_status_transition() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO request_status_transition
+                (request_id, from_status, to_status, created_at)
+            SELECT id, NULL, status, coalesce(created_at, localtimestamp)
+            FROM new_rows;
+        ELSE
+            -- Timestamps are set by the application, use them if updated
+            INSERT INTO request_status_transition
+                (request_id, from_status, to_status, created_at)
+            SELECT new_rows.id, old_rows.status, new_rows.status,
+                coalesce(
+                    nullif(new_rows.updated_at, old_rows.updated_at),
+                    localtimestamp
+                )
+            FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+            WHERE new_rows.status IS DISTINCT FROM old_rows.status;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER request_log_status_transition_{operation}
+        AFTER {operation} ON request REFERENCING {transition}
+        FOR EACH STATEMENT EXECUTE FUNCTION request_log_status_transition()
+        """
+        for operation, transition in (
+            ("insert", "NEW TABLE AS new_rows"),
+            ("update", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        )
+    ),
+)
+
+for statement in REQUEST_STATUS_TRANSITION_DDL:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement))
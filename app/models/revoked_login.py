@@ -0,0 +1,19 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class RevokedLogin(SQLModel, table=True):
+    """
+    Logins (`UserLoginSucceed` ids, the `login_id` of access tokens) revoked
+    before their tokens expire. Not a foreign key, as the login table is
+    partitioned and its records are written in the background.
+    """
+
+    __tablename__ = "revoked_login"
+
+    login_id: UUID = Field(primary_key=True)
+    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
+    expires_at: datetime = Field(nullable=False)
+    created_at: datetime = Field(default_factory=datetime.now, index=True)
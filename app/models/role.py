@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import BigInteger, UniqueConstraint
 from sqlmodel import Field, Relationship
 
 from app.models.base import BaseIDModel, BaseUUIDModel
@@ -9,6 +9,10 @@ from app.models.base import BaseIDModel, BaseUUIDModel
 class Role(BaseUUIDModel, table=True):
     name: str
     description: str | None = Field(default=None, nullable=True)
+    # Maintained by triggers, see app.models.permission_mask
+    permissions_mask: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
 
     permissions: list["RolePermission"] | None = Relationship(cascade_delete=True)
 
@@ -19,4 +23,6 @@ class RolePermission(BaseIDModel, table=True):
     )
 
     role_id: uuid.UUID = Field(foreign_key="role.id", ondelete="CASCADE")
-    permission_id: int = Field(foreign_key="permission.id", ondelete="CASCADE")
+    permission_id: int = Field(
+        foreign_key="permission.id", ondelete="CASCADE", index=True
+    )
@@ -0,0 +1,72 @@
+"""
+Tombstones of deleted rows.
+
+Rows of the tables synced to offline clients are hard-deleted, so their ids
+are recorded by statement-level triggers, in the transaction of the deletion,
+for GET /sync to report them.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DDL, BigInteger, Index, event
+from sqlmodel import Field, SQLModel
+
+TOMBSTONE_TABLES = ("request", "client", "attach", "attach_group")
+
+
+class Tombstone(SQLModel, table=True):
+    __table_args__ = (Index("ix_tombstone_deleted_at", "deleted_at", "id"),)
+
+    id: int | None = Field(default=None, primary_key=True, sa_type=BigInteger)
+    table_name: str
+    # Ids of all tables as text
+    row_id: str
+    deleted_at: datetime = Field(default_factory=datetime.now)
+
+
+TOMBSTONE_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION record_tombstones() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO tombstone (table_name, row_id, deleted_at)
+        SELECT TG_TABLE_NAME, id::text, localtimestamp FROM old_rows;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_record_tombstones
+        AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones()
+        """
+        for table in TOMBSTONE_TABLES
+    ),
+    # Clients are synced with their users, so changes of users are changes
+    # of clients as well
+    """
+    CREATE OR REPLACE FUNCTION client_touch_on_user_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE client SET updated_at = coalesce(
+            nullif(new_rows.updated_at, old_rows.updated_at), localtimestamp
+        )
+        FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+        WHERE client.user_id = new_rows.id
+            AND (
+                new_rows.username, new_rows.first_name, new_rows.last_name,
+                new_rows.email, new_rows.phone, new_rows.is_active
+            ) IS DISTINCT FROM (
+                old_rows.username, old_rows.first_name, old_rows.last_name,
+                old_rows.email, old_rows.phone, old_rows.is_active
+            );
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER client_touch_on_user_update
+    AFTER UPDATE ON "user" REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION client_touch_on_user_update()
+    """,
+)
+
+for statement in TOMBSTONE_DDL:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement))
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 
 from pydantic import EmailStr
 from pydantic_extra_types.phone_numbers import PhoneNumber
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import BigInteger, Index, UniqueConstraint, func, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.base import BaseIDModel, BaseUUIDModel
@@ -30,12 +30,19 @@ class UserBase(SQLModel):
         min_length=2, max_length=50, nullable=True, default=None
     )
     email: EmailStr | None = Field(nullable=True, default=None)
-    phone: PhoneNumber | None = Field(nullable=True, default=None)
+    phone: PhoneNumber | None = Field(nullable=True, default=None, index=True)
 
     is_active: bool = Field(default=False, nullable=False)
 
 
 class User(BaseUUIDModel, UserBase, table=True):
+    __table_args__ = (Index("ix_user_email_lower", func.lower(text("email"))),)
+
+    # Maintained by triggers, see app.models.permission_mask
+    permissions_mask: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
+
     roles: list["UserRoles"] | None = Relationship(
         # sa_relationship_kwargs={"lazy": "joined"}
     )
@@ -46,6 +53,6 @@ class UserRoles(BaseIDModel, table=True):
     __table_args__ = (UniqueConstraint("user_id", "role_id", name="unique_user_role"),)
 
     user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE")
-    role_id: uuid.UUID = Field(foreign_key="role.id", ondelete="CASCADE")
+    role_id: uuid.UUID = Field(foreign_key="role.id", ondelete="CASCADE", index=True)
 
     role: "Role" = Relationship()
@@ -1,10 +1,13 @@
+import uuid
 from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import DDL, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
 from app.models.base import BaseUUIDModel
+from app.utils.uuid7 import uuid7
 
 
 class UserLoginBase(SQLModel):
@@ -25,9 +28,32 @@ class UserLogin(UserLoginBase, table=True):
 
 
 class UserLoginSucceedBase(SQLModel):
-    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE", nullable=False)
+    user_id: UUID = Field(
+        foreign_key="user.id", ondelete="CASCADE", nullable=False, index=True
+    )
     agent_data: dict = Field(sa_type=JSONB)
 
 
 class UserLoginSucceed(BaseUUIDModel, UserLoginSucceedBase, table=True):
+    """
+    Partitioned by `created_at` month, partitions are maintained by the
+    `maintain_login_partitions` task. Rows without a matching partition go to
+    the default one.
+    """
+
     __tablename__ = "user_login_succeed"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+
+    # The partition key must be a part of the primary key
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.now, primary_key=True)
+
+
+event.listen(
+    UserLoginSucceed.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE user_login_succeed_default "
+        "PARTITION OF user_login_succeed DEFAULT"
+    ),
+)
@@ -0,0 +1,10 @@
+from sqlmodel import Field, SQLModel
+
+
+class UsernameCounter(SQLModel, table=True):
+    """Last suffix allocated for generated `<base>_<n>` usernames."""
+
+    __tablename__ = "username_counter"
+
+    base: str = Field(primary_key=True, max_length=50)
+    value: int = Field(nullable=False, default=0)
@@ -1,11 +1,13 @@
+from enum import Enum
 from typing import ClassVar
 from uuid import UUID
 
-from pydantic import EmailStr
+from pydantic import BaseModel, EmailStr
 from pydantic_extra_types.phone_numbers import PhoneNumber
 from sqlmodel import Field
 
 from app.models.client import ClientBase
+from app.models.request import RequestBase
 from app.schemas.user import UserRead
 from app.utils.partial import optional
 
@@ -33,3 +35,40 @@ class ClientRead(ClientBase):
     password: ClassVar
     user: UserRead
     user_id: ClassVar
+
+
+class ClientFilter(BaseModel):
+    ids: list[UUID] | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+
+
+class ClientRequestRead(RequestBase):
+    id: UUID
+    client_id: ClassVar
+
+
+class ClientCallerRead(ClientRead):
+    open_requests: list[ClientRequestRead]
+
+
+class ClientImportStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    duplicate = "duplicate"
+    invalid = "invalid"
+
+
+class ClientImportRowResult(BaseModel):
+    row: int
+    status: ClientImportStatus
+    client_id: UUID | None = None
+    errors: list[str] | None = None
+
+
+class ClientImportResult(BaseModel):
+    created: int
+    updated: int
+    duplicate: int
+    invalid: int
+    rows: list[ClientImportRowResult]
@@ -1,11 +1,14 @@
 from datetime import datetime
+from enum import Enum
 from typing import ClassVar
 from uuid import UUID
 
+from pydantic import BaseModel
 from pydantic_extra_types.phone_numbers import PhoneNumber
 from sqlmodel import Field
 
-from app.models.request import RequestBase
+from app.models.request import RequestBase, RequestStatus
+from app.models.request_history import RequestHistoryBase
 from app.schemas.client import ClientRead
 from app.utils.partial import optional
 
@@ -13,30 +16,92 @@ from app.utils.partial import optional
 class RequestBaseCU(RequestBase):
     first_name: str = Field(min_length=2, max_length=50, nullable=False)
     phone: PhoneNumber | None = Field()
-    changes_history: dict[datetime, str] | None = Field(default=None)
 
 
 class RequestCreateWithNewClient(RequestBaseCU):
     client_id: ClassVar
     status: ClassVar
-    changes_history: ClassVar
 
 
 class RequestCreate(RequestBaseCU):
     status: ClassVar
     phone: ClassVar
     first_name: ClassVar
-    changes_history: ClassVar
 
 
 @optional()
 class RequestUpdate(RequestBaseCU):
     phone: ClassVar
     first_name: ClassVar
-    changes_history: ClassVar
 
 
 class RequestRead(RequestBase):
     id: UUID
     client: ClientRead
     client_id: ClassVar
+
+
+class RequestBulkUpdate(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=1000)
+    data: RequestUpdate
+
+
+class RequestBulkStatus(str, Enum):
+    updated = "updated"
+    removed = "removed"
+    not_found = "not_found"
+
+
+class RequestBulkResult(BaseModel):
+    id: UUID
+    status: RequestBulkStatus
+    request: RequestRead | None = None
+
+
+class RequestFilter(BaseModel):
+    ids: list[UUID] | None = None
+    first_name: str | None = None
+    status: list[RequestStatus] | None = None
+    closed: bool | None = None
+    request_service_id: int | None = None
+    client_id: UUID | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    updated_from: datetime | None = None
+    updated_to: datetime | None = None
+
+
+class RequestOrderBy(str, Enum):
+    id = "id"
+    created_at = "created_at"
+    updated_at = "updated_at"
+
+
+class RequestBoardColumn(BaseModel):
+    status: RequestStatus
+    count: int
+    requests: list[RequestRead]
+    next_cursor: str | None = None
+
+
+class RequestSearchResult(BaseModel):
+    request: RequestRead
+    rank: float
+    # Matched words are wrapped in <b></b>
+    note_headline: str | None
+    number_in_program_headline: str | None
+
+
+class RequestHistoryCreate(RequestHistoryBase):
+    pass
+
+
+class RequestHistoryRead(RequestHistoryBase):
+    id: UUID
+    author_id: UUID | None
+    created_at: datetime
+
+
+class RequestHistoryPage(BaseModel):
+    items: list[RequestHistoryRead]
+    next_cursor: str | None = None
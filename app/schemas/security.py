@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -6,8 +7,10 @@ from pydantic import BaseModel
 class TokenScheme(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
 
 
 class TokenData(BaseModel):
     id: UUID
     login_id: UUID
+    expires_at: datetime
@@ -0,0 +1,44 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.models.request import RequestStatus
+
+
+class RequestStatusCount(BaseModel):
+    status: RequestStatus
+    count: int
+
+
+class RequestServiceCount(BaseModel):
+    request_service_id: int
+    count: int
+
+
+class RequestMonthCount(BaseModel):
+    month: date
+    count: int
+
+
+class RequestStatsRead(BaseModel):
+    total: int
+    by_status: list[RequestStatusCount]
+    by_request_service: list[RequestServiceCount]
+    by_month: list[RequestMonthCount]
+
+
+class RequestStatusConversion(BaseModel):
+    status: RequestStatus
+    count: int
+    # Share of the requests that left the status
+    rate: float
+
+
+class RequestStatusTime(BaseModel):
+    status: RequestStatus
+    entered: int
+    left: int
+    avg_seconds: float | None
+    median_seconds: float | None
+    p90_seconds: float | None
+    next_statuses: list[RequestStatusConversion]
@@ -0,0 +1,35 @@
+from typing import ClassVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models.attach import AttachBase
+from app.models.request import RequestBase
+from app.schemas.attach_group import AttachGroupRead
+from app.schemas.client import ClientRead
+
+
+class SyncRequestRead(RequestBase):
+    id: UUID
+
+
+class SyncAttachRead(AttachBase):
+    id: UUID
+    path: ClassVar
+
+
+class SyncDeleted(BaseModel):
+    requests: list[UUID] = []
+    clients: list[UUID] = []
+    attachs: list[UUID] = []
+    attach_groups: list[int] = []
+
+
+class SyncRead(BaseModel):
+    requests: list[SyncRequestRead]
+    clients: list[ClientRead]
+    attachs: list[SyncAttachRead]
+    attach_groups: list[AttachGroupRead]
+    deleted: SyncDeleted
+    token: str
+    has_more: bool
@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Generic, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class LRUCache(Generic[KeyType, ValueType]):
+    """
+    Per-worker in-memory cache of up to `maxsize` values, each kept for `ttl`
+    seconds. When full, the least recently used value is evicted.
+
+    Values can be tagged, e.g. with (table, id) of rows they were read from,
+    to evict all values of a tag at once, see app.core.notify. `version` is
+    bumped by `evict` and `clear`, so that a value read while its rows were
+    changed can be dropped instead of cached.
+
+    Not thread-safe, it's meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._values: OrderedDict[
+            KeyType, tuple[float, ValueType, tuple[Hashable, ...]]
+        ] = OrderedDict()
+        self._tagged: dict[Hashable, set[KeyType]] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: KeyType) -> ValueType | None:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        expires_at, value, _ = item
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    def set(
+        self, key: KeyType, value: ValueType, tags: Iterable[Hashable] = ()
+    ) -> None:
+        if self.maxsize <= 0:
+            return
+        self.pop(key)
+        tags = tuple(tags)
+        self._values[key] = (time.monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._values) > self.maxsize:
+            self.pop(next(iter(self._values)))
+
+    def pop(self, key: KeyType) -> None:
+        item = self._values.pop(key, None)
+        if item is None:
+            return
+        for tag in item[2]:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def evict(self, tag: Hashable) -> None:
+        """Evict all values tagged with the tag."""
+        self.version += 1
+        for key in self._tagged.pop(tag, ()):
+            self.pop(key)
+
+    def clear(self) -> None:
+        self.version += 1
+        self._values.clear()
+        self._tagged.clear()
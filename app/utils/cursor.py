@@ -0,0 +1,21 @@
+import base64
+import json
+from typing import Any
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset pagination values into an opaque URL-safe cursor."""
+    data = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Decode values of a cursor, raises ValueError if it's malformed."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+    except ValueError as err:
+        raise ValueError("Malformed cursor") from err
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+    return values
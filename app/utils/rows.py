@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterator, Sequence
+from datetime import date
+from enum import Enum
+from typing import Any, BinaryIO
+
+from fastapi.responses import StreamingResponse
+
+
+class RowsFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+    @property
+    def media_type(self) -> str:
+        if self == RowsFormat.csv:
+            return "text/csv; charset=utf-8"
+        return "application/x-ndjson"
+
+
+def read_rows(
+    file: BinaryIO, rows_format: RowsFormat
+) -> Iterator[tuple[int, dict[str, Any] | ValueError]]:
+    """
+    Lazily read rows from a CSV (with header) or NDJSON file.
+    Yields (row number, row), where row is a ValueError if it can't be parsed.
+    Empty CSV values are returned as None.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if rows_format == RowsFormat.csv:
+            for row_number, row in enumerate(csv.DictReader(text), 1):
+                if None in row:
+                    yield row_number, ValueError("Too many values in a row")
+                    continue
+                yield row_number, {k: v or None for k, v in row.items()}
+        else:
+            for row_number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as err:
+                    yield row_number, ValueError(f"Invalid JSON: {err}")
+                    continue
+                if not isinstance(row, dict):
+                    yield row_number, ValueError("Row must be a JSON object")
+                    continue
+                yield row_number, row
+    finally:
+        # Don't close the underlying file, it's owned by the caller
+        text.detach()
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+async def write_rows(
+    batches: AsyncIterable[Sequence[Sequence[Any]]],
+    fields: Sequence[str],
+    rows_format: RowsFormat,
+) -> AsyncIterator[str]:
+    """
+    Lazily write batches of rows with values in the order of `fields` to a
+    CSV (with header) or NDJSON file, yielding a chunk per batch.
+    CSV values are written as strings, None as an empty value.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if rows_format == RowsFormat.csv:
+        writer.writerow(fields)
+
+    async for batch in batches:
+        if rows_format == RowsFormat.csv:
+            writer.writerows(batch)
+        else:
+            for row in batch:
+                row_object = dict(zip(fields, row, strict=True))
+                buffer.write(
+                    json.dumps(row_object, ensure_ascii=False, default=_to_json)
+                )
+                buffer.write("\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def rows_response(
+    batches: AsyncIterable[Sequence[Sequence[Any]]],
+    fields: Sequence[str],
+    rows_format: RowsFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Stream rows as a downloaded `filename` file with the format extension."""
+    return StreamingResponse(
+        write_rows(batches, fields, rows_format),
+        media_type=rows_format.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{rows_format.value}"'
+            )
+        },
+    )
@@ -0,0 +1,22 @@
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+def local_timezone() -> str:
+    """
+    Local time zone of the process, the one of naive `datetime.now()`, as a
+    PostgreSQL TimeZone setting: the TZ variable, the zoneinfo name of
+    /etc/localtime or else the current UTC offset.
+    """
+    if tz := os.environ.get("TZ"):
+        return tz.removeprefix(":")
+
+    localtime = Path("/etc/localtime").resolve()
+    if "zoneinfo" in localtime.parts:
+        return "/".join(localtime.parts[localtime.parts.index("zoneinfo") + 1 :])
+
+    # POSIX offsets are positive west of Greenwich
+    offset = int(datetime.now().astimezone().utcoffset().total_seconds()) // 60
+    hours, minutes = divmod(abs(offset), 60)
+    return f"UTC{'-' if offset >= 0 else '+'}{hours:02d}:{minutes:02d}"
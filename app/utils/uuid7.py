@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+from uuid import UUID
+
+COUNTER_MAX = 0xFFF
+
+_lock = threading.Lock()
+_last_timestamp = 0
+_last_counter = 0
+
+
+def _random_counter(random_bytes: bytes) -> int:
+    # The top bit is left unset, so the counter can't overflow right away
+    return int.from_bytes(random_bytes) & (COUNTER_MAX >> 1)
+
+
+def uuid7() -> UUID:
+    """
+    Generate a UUIDv7 (RFC 9562): a 48-bit Unix timestamp in milliseconds,
+    a 12-bit counter and 62 random bits, so ids sort by creation time.
+
+    The counter starts at a random value every millisecond and is incremented
+    within it, so the ids generated by the process are strictly increasing.
+    On counter overflow or if the clock goes back, the timestamp of the
+    previous id is advanced instead.
+    """
+    global _last_timestamp, _last_counter
+
+    random_bytes = os.urandom(10)
+    with _lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp > _last_timestamp:
+            counter = _random_counter(random_bytes[:2])
+        elif _last_counter < COUNTER_MAX:
+            timestamp = _last_timestamp
+            counter = _last_counter + 1
+        else:
+            timestamp = _last_timestamp + 1
+            counter = _random_counter(random_bytes[:2])
+        _last_timestamp, _last_counter = timestamp, counter
+
+    return UUID(
+        int=timestamp << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | int.from_bytes(random_bytes[2:]) & (1 << 62) - 1
+    )
@@ -0,0 +1,220 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.response_cache import response_cache
+from app.crud.refresh_token import CRUDRefreshToken
+from app.models.request import RequestStatus
+from app.utils.cursor import encode_cursor
+from benchmarks.conftest import ITERATIONS, engine
+
+
+async def test_login(ac, bench, seed):
+    await bench(
+        "login",
+        lambda i: ac.post(
+            "/api/v1/login",
+            data={
+                "username": seed.staff[i % len(seed.staff)]["username"],
+                "password": "benchmark",
+            },
+        ),
+    )
+
+
+async def test_users_me(ac, bench, token):
+    await bench(
+        "users_me",
+        lambda _: ac.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+        ),
+    )
+
+
+async def test_get_requests_search(ac, bench, token):
+    await bench(
+        "get_requests_search",
+        lambda _: ac.get(
+            "/api/v1/requests",
+            params={"first_name": "Ольга", "limit": 100},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_get_requests_filtered(ac, bench, token):
+    await bench(
+        "get_requests_filtered",
+        lambda _: ac.get(
+            "/api/v1/requests",
+            params={
+                "status": [RequestStatus.ON_MEASURE, RequestStatus.COORDINATION],
+                "closed": False,
+                "request_service_id": 1,
+                "order_by": "updated_at",
+                "order": "descendent",
+                "limit": 100,
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_get_requests_board(ac, bench, token):
+    await bench(
+        "get_requests_board",
+        lambda _: ac.get(
+            "/api/v1/requests/board",
+            params={"limit": 20},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_search_requests(ac, bench, token):
+    await bench(
+        "search_requests",
+        lambda i: ac.get(
+            "/api/v1/requests/search",
+            params={"q": f"note {i * 37 % 1000}", "limit": 20},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_export_requests(ac, bench, token):
+    await bench(
+        "export_requests",
+        lambda _: ac.get(
+            "/api/v1/requests/export",
+            params={"format": "csv", "closed": False},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_sync(ac, bench, token):
+    # After the seed, which sets clients as updated now
+    sync_token = encode_cursor(datetime.now(), None, {})
+    await bench(
+        "sync",
+        lambda _: ac.get(
+            "/api/v1/sync",
+            params={"since": sync_token},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_get_request(ac, bench, seed, token):
+    await bench(
+        "get_request",
+        lambda i: ac.get(
+            f"/api/v1/requests/{seed.requests[i % 10]['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_get_request_cached(ac, bench, seed, token, monkeypatch):
+    # Repeat views of a few requests, as opened by the UI
+    monkeypatch.setattr(response_cache, "maxsize", 1024)
+    try:
+        await bench(
+            "get_request_cached",
+            lambda i: ac.get(
+                f"/api/v1/requests/{seed.requests[i % 10]['id']}",
+                headers={"Authorization": f"Bearer {token}"},
+            ),
+        )
+    finally:
+        response_cache.clear()
+
+
+async def test_get_clients(ac, bench, token):
+    await bench(
+        "get_clients",
+        lambda i: ac.get(
+            "/api/v1/clients",
+            params={"skip": i * 100 % 1000, "limit": 100},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_upload_attach(ac, bench, seed, token):
+    await bench(
+        "upload_attach",
+        lambda i: ac.post(
+            "/api/v1/attachs",
+            data={"request_id": str(seed.requests[i % len(seed.requests)]["id"])},
+            files={"file": (f"bench_{i}.txt", f"benchmark {i}".encode(), "text/plain")},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_download_attach(ac, bench, seed, token):
+    await bench(
+        "download_attach",
+        lambda i: ac.get(
+            f"/api/v1/attachs/{seed.attachs[i % len(seed.attachs)]['id']}/d",
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_get_client_by_phone(ac, bench, token):
+    await bench(
+        "get_client_by_phone",
+        lambda i: ac.get(
+            f"/api/v1/clients/by-phone/+7999{i % 5_000:07d}",
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_create_client(ac, bench, token):
+    # Same name for all clients is the worst case for username allocation
+    await bench(
+        "create_client",
+        lambda i: ac.post(
+            "/api/v1/clients",
+            json={"first_name": "Иван", "last_name": "Иванов", "phone": None},
+            headers={"Authorization": f"Bearer {token}"},
+        ),
+    )
+
+
+async def test_import_clients(ac, bench, token):
+    def call(i: int):
+        content = "".join(
+            f'{{"first_name": "Иван", "phone": "+7998{i:03d}{j:04d}"}}\n'
+            for j in range(1_000)
+        )
+        return ac.post(
+            "/api/v1/clients/import",
+            files={
+                "file": (f"bench_{i}.ndjson", content.encode(), "application/x-ndjson")
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    await bench("import_clients_1000", call, iterations=20, concurrency=4)
+
+
+async def test_refresh_token(ac, bench, seed):
+    async with AsyncSession(engine) as session:
+        crud_refresh_token = CRUDRefreshToken(session)
+        refresh_tokens = [
+            crud_refresh_token.issue(uuid4(), seed.admin_id) for _ in range(ITERATIONS)
+        ]
+        await session.commit()
+
+    await bench(
+        "refresh_token",
+        lambda i: ac.post(
+            "/api/v1/login/refresh", data={"refresh_token": refresh_tokens[i]}
+        ),
+    )
@@ -1,10 +1,13 @@
 import asyncio
+import random
+import time
 from functools import wraps
 from typing import Annotated
 
 import typer
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.seed import Seeder, SeedSize
 from app.db import engine
 from app.models import User
 from app.utils.bcrypt import get_password_hash
@@ -63,5 +66,60 @@ async def create_user(
         )
 
 
+@app.command(
+    short_help="Fill the database with synthetic data for load testing",
+)
+@coro
+async def seed(
+    users: Annotated[int, typer.Option(min=0, help="Staff users")] = 100,
+    roles: Annotated[int, typer.Option(min=0)] = 5,
+    permissions: Annotated[int, typer.Option(min=0)] = 16,
+    clients: Annotated[int, typer.Option(min=0)] = 10_000,
+    request_services: Annotated[int, typer.Option(min=0)] = 5,
+    requests: Annotated[int, typer.Option(min=0)] = 50_000,
+    attach_groups: Annotated[int, typer.Option(min=0)] = 10,
+    attachs: Annotated[int, typer.Option(min=0)] = 20_000,
+    files: Annotated[
+        int, typer.Option(min=0, help="Distinct attachment files written to disk")
+    ] = 1_000,
+    password: Annotated[str, typer.Option(help="Password of staff users")] = "seed",
+    batch_size: Annotated[int, typer.Option(min=1)] = 50_000,
+    random_seed: Annotated[int | None, typer.Option()] = None,
+):
+    size = SeedSize(
+        users=users,
+        roles=roles,
+        permissions=permissions,
+        clients=clients,
+        request_services=request_services,
+        requests=requests,
+        attach_groups=attach_groups,
+        attachs=attachs,
+        files=files,
+    )
+    try:
+        seeder = Seeder(
+            engine,
+            size,
+            password=password,
+            batch_size=batch_size,
+            rnd=random.Random(random_seed),
+            echo=typer.echo,
+        )
+    except ValueError as err:
+        raise typer.BadParameter(str(err)) from err
+
+    start = time.perf_counter()
+    counts = await seeder.run()
+    typer.echo(
+        " ".join(
+            (
+                typer.style("Database seeded successfully!", fg=typer.colors.GREEN),
+                f"{sum(counts.values())} rows in {time.perf_counter() - start:.2f}s",
+            )
+        )
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,111 @@
+"""request_stats
+
+Revision ID: 0d5a3e9c7f21
+Revises: f2b8e4c6a0d3
+Create Date: 2026-10-19 20:54:31.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d5a3e9c7f21'
+down_revision: Union[str, None] = 'f2b8e4c6a0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as app.models.request_stats.REQUEST_STATS_DDL at this revision
+REQUEST_STATS_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION request_refresh_stats() RETURNS trigger AS $$
+    BEGIN
+        -- Counters are upserted in the same order to not deadlock, updates
+        -- not changing the counted columns don't change them
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO request_stats AS stats
+                (status, request_service_id, month, count)
+            SELECT status, request_service_id,
+                date_trunc('month', created_at)::date, count(*)
+            FROM new_rows
+            GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+            ON CONFLICT (status, request_service_id, month)
+            DO UPDATE SET count = stats.count + excluded.count;
+        ELSIF TG_OP = 'DELETE' THEN
+            INSERT INTO request_stats AS stats
+                (status, request_service_id, month, count)
+            SELECT status, request_service_id,
+                date_trunc('month', created_at)::date, -count(*)
+            FROM old_rows
+            GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+            ON CONFLICT (status, request_service_id, month)
+            DO UPDATE SET count = stats.count + excluded.count;
+        ELSE
+            INSERT INTO request_stats AS stats
+                (status, request_service_id, month, count)
+            SELECT status, request_service_id, month, sum(delta)
+            FROM (
+                SELECT status, request_service_id,
+                    date_trunc('month', created_at)::date AS month, 1 AS delta
+                FROM new_rows
+                UNION ALL
+                SELECT status, request_service_id,
+                    date_trunc('month', created_at)::date, -1
+                FROM old_rows
+            ) AS changes
+            GROUP BY 1, 2, 3 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3
+            ON CONFLICT (status, request_service_id, month)
+            DO UPDATE SET count = stats.count + excluded.count;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER request_refresh_stats_{operation} AFTER {operation} ON request
+        REFERENCING {transition}
+        FOR EACH STATEMENT EXECUTE FUNCTION request_refresh_stats()
+        """
+        for operation, transition in (
+            ('insert', 'NEW TABLE AS new_rows'),
+            ('update', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+            ('delete', 'OLD TABLE AS old_rows'),
+        )
+    ),
+)
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('request_stats',
+    sa.Column('status', postgresql.ENUM('NEW', 'RAW_SCHEME', 'ON_MEASURE', 'FINALLY_SCHEME', 'COORDINATION', 'ORDER', 'LOST', 'COMPLETED', 'FAKE', name='requeststatus', create_type=False), nullable=False),
+    sa.Column('request_service_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('status', 'request_service_id', 'month')
+    )
+    # ### end Alembic commands ###
+    # Triggers lock `request` against writes until the counters are filled
+    for statement in REQUEST_STATS_DDL:
+        op.execute(statement)
+    op.execute(
+        """
+        INSERT INTO request_stats (status, request_service_id, month, count)
+        SELECT status, request_service_id,
+            date_trunc('month', created_at)::date, count(*)
+        FROM request
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    for operation in ('insert', 'update', 'delete'):
+        op.execute(f'DROP TRIGGER request_refresh_stats_{operation} ON request')
+    op.execute('DROP FUNCTION request_refresh_stats()')
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('request_stats')
+    # ### end Alembic commands ###
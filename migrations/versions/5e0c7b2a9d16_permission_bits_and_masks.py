@@ -0,0 +1,216 @@
+"""permission bits and masks
+
+Revision ID: 5e0c7b2a9d16
+Revises: a61d0e4b9f37
+Create Date: 2026-10-19 20:12:38.771054
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c7b2a9d16'
+down_revision: Union[str, None] = 'a61d0e4b9f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as app.models.permission_mask.PERMISSION_MASK_DDL at this revision
+PERMISSION_MASK_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION assign_permission_bit() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.bit IS NULL THEN
+            -- Serializes concurrent assignments
+            PERFORM pg_advisory_xact_lock(hashtext('permission.bit'));
+            SELECT min(free_bit) INTO NEW.bit
+            FROM generate_series(0, 62) AS free_bit
+            WHERE NOT EXISTS (SELECT FROM permission WHERE bit = free_bit);
+            IF NEW.bit IS NULL THEN
+                RAISE EXCEPTION 'No free permission bits left';
+            END IF;
+        END IF;
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION refresh_role_permissions_mask(role_ids uuid[])
+    RETURNS void AS $$
+    BEGIN
+        UPDATE role SET permissions_mask = mask.value
+        FROM (
+            SELECT role.id, coalesce(bit_or(1::bigint << permission.bit), 0) AS value
+            FROM role
+            LEFT JOIN rolepermission ON rolepermission.role_id = role.id
+            LEFT JOIN permission ON permission.id = rolepermission.permission_id
+            WHERE role.id = any(role_ids)
+            GROUP BY role.id
+        ) AS mask
+        WHERE role.id = mask.id AND role.permissions_mask <> mask.value;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION refresh_user_permissions_mask(user_ids uuid[])
+    RETURNS void AS $$
+    BEGIN
+        UPDATE "user" SET permissions_mask = mask.value
+        FROM (
+            SELECT "user".id, coalesce(bit_or(role.permissions_mask), 0) AS value
+            FROM "user"
+            LEFT JOIN userroles ON userroles.user_id = "user".id
+            LEFT JOIN role ON role.id = userroles.role_id
+            WHERE "user".id = any(user_ids)
+            GROUP BY "user".id
+        ) AS mask
+        WHERE "user".id = mask.id AND "user".permissions_mask <> mask.value;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION rolepermission_refresh_mask() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM refresh_role_permissions_mask(
+                ARRAY(SELECT DISTINCT role_id FROM new_rows)
+            );
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM refresh_role_permissions_mask(
+                ARRAY(SELECT DISTINCT role_id FROM old_rows)
+            );
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION userroles_refresh_mask() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM refresh_user_permissions_mask(
+                ARRAY(SELECT DISTINCT user_id FROM new_rows)
+            );
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM refresh_user_permissions_mask(
+                ARRAY(SELECT DISTINCT user_id FROM old_rows)
+            );
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION role_refresh_users_mask() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_user_permissions_mask(
+            ARRAY(SELECT user_id FROM userroles WHERE role_id = NEW.id)
+        );
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION permission_refresh_roles_mask() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_role_permissions_mask(
+            ARRAY(SELECT role_id FROM rolepermission WHERE permission_id = NEW.id)
+        );
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER permission_assign_bit BEFORE INSERT ON permission
+    FOR EACH ROW EXECUTE FUNCTION assign_permission_bit()
+    """,
+    """
+    CREATE TRIGGER permission_refresh_mask AFTER UPDATE OF bit ON permission
+    FOR EACH ROW WHEN (OLD.bit IS DISTINCT FROM NEW.bit)
+    EXECUTE FUNCTION permission_refresh_roles_mask()
+    """,
+    """
+    CREATE TRIGGER role_refresh_mask AFTER UPDATE OF permissions_mask ON role
+    FOR EACH ROW WHEN (OLD.permissions_mask IS DISTINCT FROM NEW.permissions_mask)
+    EXECUTE FUNCTION role_refresh_users_mask()
+    """,
+    """
+    CREATE TRIGGER rolepermission_refresh_mask_insert AFTER insert ON rolepermission
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rolepermission_refresh_mask()
+    """,
+    """
+    CREATE TRIGGER rolepermission_refresh_mask_update AFTER update ON rolepermission
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rolepermission_refresh_mask()
+    """,
+    """
+    CREATE TRIGGER rolepermission_refresh_mask_delete AFTER delete ON rolepermission
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rolepermission_refresh_mask()
+    """,
+    """
+    CREATE TRIGGER userroles_refresh_mask_insert AFTER insert ON userroles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION userroles_refresh_mask()
+    """,
+    """
+    CREATE TRIGGER userroles_refresh_mask_update AFTER update ON userroles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION userroles_refresh_mask()
+    """,
+    """
+    CREATE TRIGGER userroles_refresh_mask_delete AFTER delete ON userroles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION userroles_refresh_mask()
+    """,
+)
+TRIGGERS = (
+    ('permission_assign_bit', 'permission'),
+    ('permission_refresh_mask', 'permission'),
+    ('role_refresh_mask', 'role'),
+    *(
+        (f'{table}_refresh_mask_{operation}', table)
+        for table in ('rolepermission', 'userroles')
+        for operation in ('insert', 'update', 'delete')
+    ),
+)
+FUNCTIONS = (
+    'assign_permission_bit()',
+    'refresh_role_permissions_mask(uuid[])',
+    'refresh_user_permissions_mask(uuid[])',
+    'rolepermission_refresh_mask()',
+    'userroles_refresh_mask()',
+    'role_refresh_users_mask()',
+    'permission_refresh_roles_mask()',
+)
+
+
+def upgrade() -> None:
+    op.add_column('permission', sa.Column('bit', sa.SmallInteger(), nullable=True))
+    op.execute(
+        """
+        UPDATE permission SET bit = numbered.bit
+        FROM (SELECT id, row_number() OVER (ORDER BY id) - 1 AS bit FROM permission) AS numbered
+        WHERE permission.id = numbered.id
+        """
+    )
+    op.alter_column('permission', 'bit', nullable=False)
+    op.create_unique_constraint(None, 'permission', ['bit'])
+    op.create_check_constraint('permission_bit', 'permission', 'bit BETWEEN 0 AND 62')
+    op.add_column('role', sa.Column('permissions_mask', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('user', sa.Column('permissions_mask', sa.BigInteger(), server_default='0', nullable=False))
+
+    for statement in PERMISSION_MASK_DDL:
+        op.execute(statement)
+    # Users masks are refreshed by the trigger on role
+    op.execute('SELECT refresh_role_permissions_mask(ARRAY(SELECT id FROM role))')
+
+
+def downgrade() -> None:
+    for trigger, table in TRIGGERS:
+        op.execute(f'DROP TRIGGER {trigger} ON {table}')
+    for function in FUNCTIONS:
+        op.execute(f'DROP FUNCTION {function}')
+    op.drop_column('user', 'permissions_mask')
+    op.drop_column('role', 'permissions_mask')
+    op.drop_constraint('permission_bit', 'permission', type_='check')
+    op.drop_constraint('permission_bit_key', 'permission', type_='unique')
+    op.drop_column('permission', 'bit')
@@ -0,0 +1,99 @@
+"""partition user_login_succeed by created_at month
+
+Revision ID: 9c2f5a8e7d41
+Revises: e4a7c9d2f1b8
+Create Date: 2026-10-19 16:20:03.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2f5a8e7d41'
+down_revision: Union[str, None] = 'e4a7c9d2f1b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "user_id, agent_data, updated_at, created_at, id"
+
+
+def _rename_old_table() -> None:
+    op.rename_table('user_login_succeed', 'user_login_succeed_old')
+    # Foreign key names are unique per table only, so only the primary key
+    # (backed by an index) has to be renamed
+    op.execute('ALTER TABLE user_login_succeed_old RENAME CONSTRAINT user_login_succeed_pkey TO user_login_succeed_old_pkey')
+
+
+def upgrade() -> None:
+    _rename_old_table()
+    op.drop_index('ix_user_login_succeed_id', table_name='user_login_succeed_old')
+
+    op.create_table('user_login_succeed',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('agent_data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name='user_login_succeed_user_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.execute('CREATE TABLE user_login_succeed_default PARTITION OF user_login_succeed DEFAULT')
+    # Monthly partitions for the existing rows and the next 3 months,
+    # later ones are created by the maintain_login_partitions task
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month date := date_trunc(
+                'month',
+                coalesce((SELECT min(created_at) FROM user_login_succeed_old), now())
+            );
+        BEGIN
+            WHILE month <= date_trunc('month', now()) + interval '3 months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF user_login_succeed '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'user_login_succeed_y' || to_char(month, 'YYYY"m"MM'),
+                    month,
+                    month + interval '1 month'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO user_login_succeed ({COLUMNS})
+        SELECT user_id, agent_data, updated_at,
+               coalesce(created_at, updated_at, now()), id
+        FROM user_login_succeed_old
+        """
+    )
+    op.drop_table('user_login_succeed_old')
+
+
+def downgrade() -> None:
+    _rename_old_table()
+
+    op.create_table('user_login_succeed',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('agent_data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name='user_login_succeed_user_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_login_succeed_id'), 'user_login_succeed', ['id'], unique=False)
+    op.execute(
+        f"INSERT INTO user_login_succeed ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM user_login_succeed_old"
+    )
+    # Drops all the attached partitions too
+    op.drop_table('user_login_succeed_old')
@@ -0,0 +1,28 @@
+"""user phone and email indexes
+
+Revision ID: b3d1e6f0a2c4
+Revises: 7fa0fca70702
+Create Date: 2026-10-19 12:10:41.512309
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d1e6f0a2c4'
+down_revision: Union[str, None] = '7fa0fca70702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_user_phone'), 'user', ['phone'], unique=False)
+    op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_email_lower', table_name='user')
+    op.drop_index(op.f('ix_user_phone'), table_name='user')
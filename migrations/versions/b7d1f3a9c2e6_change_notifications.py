@@ -0,0 +1,66 @@
+"""change notifications
+
+Revision ID: b7d1f3a9c2e6
+Revises: a5c8e2f47b19
+Create Date: 2026-10-20 02:07:51.318420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1f3a9c2e6'
+down_revision: Union[str, None] = 'a5c8e2f47b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as app.models.change_notification.CHANGE_NOTIFICATION_DDL at this
+# revision
+CHANGE_NOTIFICATION_TABLES = ('request', 'client', 'attach')
+CHANGE_NOTIFICATION_OPERATIONS = (
+    ('insert', 'NEW TABLE'),
+    ('update', 'NEW TABLE'),
+    ('delete', 'OLD TABLE'),
+)
+
+CHANGE_NOTIFICATION_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION notify_changes() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('changes', json_build_object(
+            'entity', TG_TABLE_NAME,
+            'action', lower(TG_OP),
+            'ids', array_agg(id)
+        )::text)
+        FROM (
+            SELECT id, (row_number() OVER () - 1) / 100 AS chunk
+            FROM changed_rows
+        ) AS changes
+        GROUP BY chunk;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_notify_changes_{operation}
+        AFTER {operation} ON {table} REFERENCING {transition} AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_changes()
+        """
+        for table in CHANGE_NOTIFICATION_TABLES
+        for operation, transition in CHANGE_NOTIFICATION_OPERATIONS
+    ),
+)
+
+
+def upgrade() -> None:
+    for statement in CHANGE_NOTIFICATION_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for table in CHANGE_NOTIFICATION_TABLES:
+        for operation, _ in CHANGE_NOTIFICATION_OPERATIONS:
+            op.execute(f'DROP TRIGGER {table}_notify_changes_{operation} ON {table}')
+    op.execute('DROP FUNCTION notify_changes()')
@@ -0,0 +1,47 @@
+"""change notifications of related tables
+
+Revision ID: c2e8a4b6d9f1
+Revises: b7d1f3a9c2e6
+Create Date: 2026-10-20 14:32:08.571903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e8a4b6d9f1'
+down_revision: Union[str, None] = 'b7d1f3a9c2e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as app.models.change_notification.CHANGE_NOTIFICATION_DDL at this
+# revision, notify_changes() is unchanged
+CHANGE_NOTIFICATION_TABLES = ('user', 'attach_group', 'request_service')
+CHANGE_NOTIFICATION_OPERATIONS = (
+    ('insert', 'NEW TABLE'),
+    ('update', 'NEW TABLE'),
+    ('delete', 'OLD TABLE'),
+)
+
+
+def upgrade() -> None:
+    for table in CHANGE_NOTIFICATION_TABLES:
+        for operation, transition in CHANGE_NOTIFICATION_OPERATIONS:
+            op.execute(
+                f"""
+                CREATE TRIGGER {table}_notify_changes_{operation}
+                AFTER {operation} ON "{table}"
+                REFERENCING {transition} AS changed_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_changes()
+                """
+            )
+
+
+def downgrade() -> None:
+    for table in CHANGE_NOTIFICATION_TABLES:
+        for operation, _ in CHANGE_NOTIFICATION_OPERATIONS:
+            op.execute(
+                f'DROP TRIGGER {table}_notify_changes_{operation} ON "{table}"'
+            )
@@ -1,7 +1,17 @@
+import asyncio
+import json
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.endpoints.client import caller_cache
 from app.crud.client import CRUDClient
 from app.crud.user import CRUDUser
+from app.models import Client, Request, RequestService
+from app.models.request import RequestStatus
 from app.schemas.client import ClientCreate
 from app.schemas.user import UserCreate
+from tests.conftest import engine
 
 
 async def test_get_clients_zero(get_token, ac, session):
@@ -135,6 +145,109 @@ async def test_get_client_by_id_with_un_existent_id(get_token, ac, session):
     assert response.status_code == 404
 
 
+async def test_get_client_by_phone(get_token, ac, session):
+    token, _ = await get_token(perms=("client.get", "client.update"))
+    caller_cache.clear()
+
+    client_ids = []
+    for phone in ("+79999999999", "+79999999999", "+79990000000"):
+        client = await CRUDClient(session).create(
+            ClientCreate.model_validate({"first_name": "Ivan", "phone": phone})
+        )
+        client_ids.append(client.id)
+    client_id = client_ids[0]
+    service = RequestService(name="test", display_name="test")
+    session.add(service)
+    await session.flush()
+    requests = [
+        Request(client_id=client_id, request_service_id=service.id, status=status)
+        for status in (RequestStatus.NEW, RequestStatus.LOST, RequestStatus.ORDER)
+    ]
+    open_request_ids = [str(requests[2].id), str(requests[0].id)]
+    session.add_all(requests)
+    await session.commit()
+
+    for number in ("+79999999999", "+7 (999) 999-99-99"):
+        response = await ac.get(
+            f"/api/v1/clients/by-phone/{number}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        json_response = response.json()
+        assert json_response["id"] == str(client_id)
+        assert json_response["user"]["phone"] == "+79999999999"
+        assert [
+            request["id"] for request in json_response["open_requests"]
+        ] == open_request_ids
+
+    # Cached lookups are dropped on changes of the phone
+    response = await ac.put(
+        f"/api/v1/clients/{client_id}",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"phone": "+79991111111"},
+    )
+    assert response.status_code == 200
+    for number, found_id in (
+        ("+79991111111", client_id),
+        ("+79999999999", client_ids[1]),
+    ):
+        response = await ac.get(
+            f"/api/v1/clients/by-phone/{number}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        assert response.json()["id"] == str(found_id)
+
+    for number, status_code in (("+79998888888", 404), ("79", 422)):
+        response = await ac.get(
+            f"/api/v1/clients/by-phone/{number}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == status_code
+
+
+async def test_export_clients(get_token, ac, session):
+    token, _ = await get_token(perms=("client.get",))
+
+    client_ids = []
+    for first_name, last_name in (("Ivan", "Tea"), ("Petr", "Tea"), ("Ivan", None)):
+        client = await CRUDClient(session).create(
+            ClientCreate.model_validate(
+                {"first_name": first_name, "last_name": last_name, "phone": None}
+            )
+        )
+        client_ids.append(str(client.id))
+
+    response = await ac.get(
+        "/api/v1/clients/export",
+        params={"format": "ndjson", "last_name": "Tea"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert (
+        response.headers["content-disposition"]
+        == 'attachment; filename="clients.ndjson"'
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == client_ids[:2]
+    assert {key: rows[0][key] for key in ("first_name", "last_name", "phone")} == {
+        "first_name": "Ivan",
+        "last_name": "Tea",
+        "phone": None,
+    }
+
+    response = await ac.get(
+        "/api/v1/clients/export",
+        params={"first_name": "Ivan"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.text.splitlines()[0] == (
+        "id,first_name,last_name,phone,email,note,created_at,updated_at"
+    )
+    assert len(response.text.splitlines()) == 3
+
+
 async def test_update_client_successfully(ac, get_token, session):
     token, user = await get_token(perms=("client.update",))
 
@@ -262,3 +375,144 @@ async def test_create_client_with_existing_user(ac, get_token, session):
     assert json_response["user"]["phone"] == "+79999999999"
     assert json_response["user"]["email"] == "test@test.com"
     assert json_response["note"] == "test"
+
+
+async def test_import_clients_csv(ac, get_token, session):
+    token, _ = await get_token(perms=("client.create", "client.update"))
+
+    existing = await CRUDClient(session).create(
+        ClientCreate.model_validate(
+            {
+                "first_name": "Ivan",
+                "last_name": "Tea",
+                "phone": "+79999999999",
+                "email": "test@test.com",
+            }
+        )
+    )
+
+    content = (
+        "first_name,last_name,phone,email,note\n"
+        "Ivan,Tea,+79999999999,,updated\n"
+        "Petr,Petrov,+79999999998,Petr@Test.com,\n"
+        "Petr,,,petr@test.com,\n"
+        "P,,,,\n"
+    )
+    response = await ac.post(
+        "/api/v1/clients/import",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("clients.csv", content.encode(), "text/csv")},
+    )
+    assert response.status_code == 200
+
+    json_response = response.json()
+
+    assert json_response["created"] == 1
+    assert json_response["updated"] == 1
+    assert json_response["duplicate"] == 1
+    assert json_response["invalid"] == 1
+
+    rows = json_response["rows"]
+    assert [row["status"] for row in rows] == [
+        "updated",
+        "created",
+        "duplicate",
+        "invalid",
+    ]
+    assert rows[0]["client_id"] == str(existing.id)
+    assert rows[1]["client_id"] == rows[2]["client_id"]
+    assert rows[3]["errors"]
+
+    await session.refresh(existing)
+    assert existing.note == "updated"
+
+    created = await CRUDClient(session).fetch(
+        UUID(rows[1]["client_id"]), selectinload_fields=[Client.user]
+    )
+    assert created.user.username == "petrpetrov_1"
+    assert created.user.email == "petr@test.com"
+    assert created.user.phone == "+79999999998"
+
+
+async def test_import_clients_ndjson(ac, get_token, session):
+    token, _ = await get_token(perms=("client.create", "client.update"))
+
+    content = (
+        '{"first_name": "Anna", "phone": "+79999999997"}\n'
+        "\n"
+        '{"first_name": "Anna", "phone": "+79999999996"}\n'
+        "not json\n"
+        "[1, 2]\n"
+    )
+    response = await ac.post(
+        "/api/v1/clients/import",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("clients.ndjson", content.encode(), "application/x-ndjson")},
+    )
+    assert response.status_code == 200
+
+    json_response = response.json()
+
+    assert json_response["created"] == 2
+    assert json_response["invalid"] == 2
+    assert [row["row"] for row in json_response["rows"]] == [1, 3, 4, 5]
+
+    clients = await CRUDClient(session).fetch_by_ids(
+        [UUID(row["client_id"]) for row in json_response["rows"][:2]],
+        selectinload_fields=[Client.user],
+    )
+    assert sorted(client.user.username for client in clients) == [
+        "anna_1",
+        "anna_2",
+    ]
+
+
+async def test_import_clients_unknown_format(ac, get_token):
+    token, _ = await get_token(perms=("client.create", "client.update"))
+
+    response = await ac.post(
+        "/api/v1/clients/import",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("clients.xlsx", b"", "application/octet-stream")},
+    )
+    assert response.status_code == 400
+
+
+async def test_create_clients_with_same_name(ac, get_token, session):
+    token, _ = await get_token(perms=("client.create",))
+
+    await CRUDUser(session).create(
+        UserCreate.model_validate(
+            {
+                "username": "ivantea_2",
+                "first_name": "Ivan",
+                "last_name": "Tea",
+                "password": "test",
+            }
+        )
+    )
+
+    usernames = []
+    for _ in range(3):
+        response = await ac.post(
+            "/api/v1/clients",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"first_name": "Иван", "last_name": "Tea", "phone": None},
+        )
+        assert response.status_code == 201
+        usernames.append(response.json()["user"]["username"])
+
+    assert usernames == ["ivantea_1", "ivantea_3", "ivantea_4"]
+
+
+async def test_create_clients_concurrently(session):
+    async def create_client() -> str:
+        async with AsyncSession(engine) as db_session:
+            client = await CRUDClient(db_session).create(
+                ClientCreate.model_validate({"first_name": "Anna", "phone": None})
+            )
+            return (await client.awaitable_attrs.user).username
+
+    usernames = await asyncio.gather(*(create_client() for _ in range(10)))
+
+    assert sorted(usernames) == sorted(f"anna_{i}" for i in range(1, 11))
@@ -0,0 +1,133 @@
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import jwt
+
+from app.api.v1.endpoints import events
+from app.core.config import settings
+from app.core.notify import ChangeListener
+from app.core.revocation import revocation_filter
+from app.crud.client import CRUDClient
+from app.models import Request, RequestService
+from app.schemas.client import ClientCreate
+from tests.conftest import engine
+
+
+async def test_get_events(ac, get_token, session, monkeypatch):
+    listener = ChangeListener(engine)
+    monkeypatch.setattr(events, "change_listener", listener)
+    _, user = await get_token(perms=("request.get",))
+    # The stream ends when the token expires
+    token = jwt.encode(
+        {
+            "sub": str(user.id),
+            "login_id": str(user.id),
+            "exp": datetime.now(UTC) + timedelta(seconds=3),
+        },
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+    await listener.start()
+    try:
+        with listener.subscribe(frozenset()) as connected:
+            await asyncio.wait_for(connected.get(), 5)
+
+            response_task = asyncio.create_task(
+                ac.get("/api/v1/events", headers={"Authorization": f"Bearer {token}"})
+            )
+            for _ in range(500):
+                if len(listener._subscriptions) == 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            client = await CRUDClient(session).create(
+                ClientCreate.model_validate(
+                    {"first_name": "Ivan", "phone": "+79999999999"}
+                )
+            )
+            service = RequestService(name="test", display_name="test")
+            session.add(service)
+            await session.flush()
+            request = Request(client_id=client.id, request_service_id=service.id)
+            request_id = request.id
+            session.add(request)
+            await session.commit()
+
+            response = await asyncio.wait_for(response_task, 10)
+    finally:
+        await listener.stop()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    # Only events of requests, clients can't be read by the user
+    assert [
+        (
+            frame.splitlines()[0],
+            json.loads(frame.splitlines()[1].removeprefix("data: ")),
+        )
+        for frame in response.text.split("\n\n")
+        if frame.startswith("event:")
+    ] == [
+        (
+            "event: change",
+            {"entity": "request", "action": "insert", "ids": [str(request_id)]},
+        )
+    ]
+
+
+async def test_get_events_ends_on_revoked_login(ac, get_token, session, monkeypatch):
+    listener = ChangeListener(engine)
+    monkeypatch.setattr(events, "change_listener", listener)
+    _, user = await get_token(perms=("request.get",))
+    login_id, expires_at = uuid4(), datetime.now(UTC) + timedelta(minutes=1)
+    token = jwt.encode(
+        {"sub": str(user.id), "login_id": str(login_id), "exp": expires_at},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+    await listener.start()
+    try:
+        with listener.subscribe(frozenset()) as connected:
+            await asyncio.wait_for(connected.get(), 5)
+
+            response_task = asyncio.create_task(
+                ac.get("/api/v1/events", headers={"Authorization": f"Bearer {token}"})
+            )
+            for _ in range(500):
+                if len(listener._subscriptions) == 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            # As by POST /logout of another worker
+            revocation_filter.add(login_id, expires_at.replace(tzinfo=None))
+            client = await CRUDClient(session).create(
+                ClientCreate.model_validate(
+                    {"first_name": "Ivan", "phone": "+79999999999"}
+                )
+            )
+            service = RequestService(name="test", display_name="test")
+            session.add(service)
+            await session.flush()
+            session.add(Request(client_id=client.id, request_service_id=service.id))
+            await session.commit()
+
+            # Long before the token expires
+            response = await asyncio.wait_for(response_task, 10)
+    finally:
+        await listener.stop()
+
+    assert response.status_code == 200
+    assert "event:" not in response.text
+
+
+async def test_get_events_without_permissions(ac, get_token):
+    token, _ = await get_token(perms=("user.get",))
+
+    response = await ac.get(
+        "/api/v1/events", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401
@@ -1,3 +1,14 @@
+import asyncio
+from datetime import datetime
+from uuid import UUID
+
+import jwt
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models import RevokedLogin, User, UserLogin, UserLoginSucceed
+
+
 async def test_successful_login(ac, session, create_user):
     await create_user("test_successful_login", "test_successful_login")
     response = await ac.post(
@@ -19,3 +30,196 @@ async def test_failed_login(ac):
     )
 
     assert response.status_code == 401
+
+
+async def test_login_blocked_after_max_attempts(ac, session, create_user):
+    user = await create_user("test_login_blocked", "test_login_blocked")
+
+    for _ in range(settings.MAX_LOGIN_ATTEMPTS - 1):
+        response = await ac.post(
+            "/api/v1/login",
+            data={"username": "test_login_blocked", "password": "wrong"},
+        )
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Incorrect username or password"
+
+    response = await ac.post(
+        "/api/v1/login",
+        data={"username": "test_login_blocked", "password": "test_login_blocked"},
+    )
+    assert response.status_code == 401
+    assert response.json()["detail"].startswith("Account blocked")
+
+    user_login = await session.get(UserLogin, user.id)
+    assert user_login.attempts == settings.MAX_LOGIN_ATTEMPTS
+    assert user_login.blocked_before > datetime.now()
+
+
+async def test_successful_login_resets_attempts(ac, session, create_user):
+    user = await create_user("test_login_reset", "test_login_reset")
+
+    response = await ac.post(
+        "/api/v1/login", data={"username": "test_login_reset", "password": "wrong"}
+    )
+    assert response.status_code == 401
+
+    response = await ac.post(
+        "/api/v1/login",
+        data={"username": "test_login_reset", "password": "test_login_reset"},
+    )
+    assert response.status_code == 200
+
+    user_login = await session.get(UserLogin, user.id)
+    assert user_login.attempts == 0
+    assert user_login.blocked_before is None
+
+    login_id = jwt.decode(
+        response.json()["access_token"],
+        settings.SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+    )["login_id"]
+    query = select(UserLoginSucceed).where(UserLoginSucceed.id == UUID(login_id))
+    assert (await session.exec(query)).one_or_none() is not None
+
+
+async def test_concurrent_failed_logins(ac, session, create_user):
+    user = await create_user("test_login_concurrent", "test_login_concurrent")
+
+    responses = await asyncio.gather(
+        *(
+            ac.post(
+                "/api/v1/login",
+                data={"username": "test_login_concurrent", "password": "wrong"},
+            )
+            for _ in range(settings.MAX_LOGIN_ATTEMPTS + 2)
+        )
+    )
+
+    details = sorted(response.json()["detail"] for response in responses)
+    assert details.count("Incorrect username or password") == (
+        settings.MAX_LOGIN_ATTEMPTS - 1
+    )
+    assert all(
+        detail.startswith("Account blocked")
+        for detail in details
+        if detail != "Incorrect username or password"
+    )
+
+    user_login = await session.get(UserLogin, user.id)
+    assert user_login.attempts == settings.MAX_LOGIN_ATTEMPTS
+
+
+async def test_login_user_without_password(ac, session):
+    session.add(User(username="test_no_password", first_name="Ivan"))
+    await session.commit()
+
+    response = await ac.post(
+        "/api/v1/login", data={"username": "test_no_password", "password": ""}
+    )
+    assert response.status_code == 401
+
+
+async def test_logout(ac, session, create_user):
+    await create_user("test_logout", "test_logout")
+    response = await ac.post(
+        "/api/v1/login", data={"username": "test_logout", "password": "test_logout"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await ac.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+
+    response = await ac.post("/api/v1/login/logout", headers=headers)
+    assert response.status_code == 204
+
+    response = await ac.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+
+    assert (await session.exec(select(RevokedLogin))).first() is not None
+
+
+async def test_refresh_token(ac, session, create_user):
+    await create_user("test_refresh", "test_refresh")
+    response = await ac.post(
+        "/api/v1/login", data={"username": "test_refresh", "password": "test_refresh"}
+    )
+    tokens = response.json()
+    assert tokens["refresh_token"]
+
+    response = await ac.post(
+        "/api/v1/login/refresh", data={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+    new_tokens = response.json()
+    assert new_tokens["refresh_token"] != tokens["refresh_token"]
+
+    def login_id(token: str) -> str:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])[
+            "login_id"
+        ]
+
+    assert login_id(new_tokens["access_token"]) == login_id(tokens["access_token"])
+
+    response = await ac.get(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {new_tokens['access_token']}"},
+    )
+    assert response.status_code == 200
+
+    response = await ac.post(
+        "/api/v1/login/refresh", data={"refresh_token": "not_a_token"}
+    )
+    assert response.status_code == 401
+
+
+async def test_refresh_token_reuse_revokes_login(ac, session, create_user):
+    await create_user("test_refresh_reuse", "test_refresh_reuse")
+    response = await ac.post(
+        "/api/v1/login",
+        data={"username": "test_refresh_reuse", "password": "test_refresh_reuse"},
+    )
+    refresh_token = response.json()["refresh_token"]
+
+    response = await ac.post(
+        "/api/v1/login/refresh", data={"refresh_token": refresh_token}
+    )
+    assert response.status_code == 200
+    new_tokens = response.json()
+
+    # The old token is reused, e.g. by an attacker
+    response = await ac.post(
+        "/api/v1/login/refresh", data={"refresh_token": refresh_token}
+    )
+    assert response.status_code == 401
+
+    response = await ac.get(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {new_tokens['access_token']}"},
+    )
+    assert response.status_code == 401
+
+    response = await ac.post(
+        "/api/v1/login/refresh", data={"refresh_token": new_tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+async def test_logout_revokes_refresh_token(ac, session, create_user):
+    await create_user("test_refresh_logout", "test_refresh_logout")
+    response = await ac.post(
+        "/api/v1/login",
+        data={"username": "test_refresh_logout", "password": "test_refresh_logout"},
+    )
+    tokens = response.json()
+
+    response = await ac.post(
+        "/api/v1/login/logout",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert response.status_code == 204
+
+    response = await ac.post(
+        "/api/v1/login/refresh", data={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
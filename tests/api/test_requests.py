@@ -1,8 +1,19 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from sqlmodel import update
+
+from app.core.notify import change_listener
+from app.core.response_cache import response_cache
 from app.crud.client import CRUDClient
 from app.crud.request import CRUDRequest
-from app.models import RequestService
+from app.models import Request, RequestHistory, RequestService, User
+from app.models.request import RequestStatus
 from app.schemas.client import ClientCreate
 from app.schemas.request import RequestCreateWithNewClient
+from app.utils.cursor import encode_cursor
 
 
 async def test_get_requests_zero(get_token, ac, session):
@@ -134,6 +145,56 @@ async def test_get_request_by_id(get_token, ac, session):
     assert json_response["id"] == str(request.id)
 
 
+async def test_get_request_by_id_cached(get_token, ac, session, monkeypatch):
+    monkeypatch.setattr(response_cache, "maxsize", 10)
+    token, _ = await get_token(perms=("request.get", "request.update"))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    req_service = RequestService(name="test", display_name="test")
+    session.add(req_service)
+    await session.commit()
+    await session.refresh(req_service)
+
+    request = await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "note": "test",
+                "request_service_id": req_service.id,
+            }
+        )
+    )
+    await session.refresh(request, ["client"])
+    request_id, user_id = request.id, request.client.user_id
+
+    try:
+        response = await ac.get(f"/api/v1/requests/{request_id}", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["client"]["user"]["first_name"] == "Ivan"
+
+        # Served from the cache until the notification of the change
+        await session.exec(
+            update(User).where(User.id == user_id).values(first_name="Petr")
+        )
+        await session.commit()
+        response = await ac.get(f"/api/v1/requests/{request_id}", headers=headers)
+        assert response.json()["client"]["user"]["first_name"] == "Ivan"
+        change_listener.evict("user", [user_id])
+        response = await ac.get(f"/api/v1/requests/{request_id}", headers=headers)
+        assert response.json()["client"]["user"]["first_name"] == "Petr"
+
+        # Evicted right after updates by the worker
+        response = await ac.put(
+            f"/api/v1/requests/{request_id}", headers=headers, json={"note": "new"}
+        )
+        assert response.status_code == 200
+        response = await ac.get(f"/api/v1/requests/{request_id}", headers=headers)
+        assert response.json()["note"] == "new"
+    finally:
+        response_cache.clear()
+
+
 async def test_get_request_by_id_with_incorrect_id(get_token, ac, session):
     token, _ = await get_token(perms=("request.get",))
     response = await ac.get(
@@ -298,3 +359,511 @@ async def test_create_request_with_existing_client(ac, get_token, session):
     assert json_response["client"]["user"]["phone"] == "+79999999999"
     assert json_response["client"]["user"]["email"] is None
     assert json_response["note"] == "test"
+
+
+async def test_update_requests_bulk_successfully(ac, get_token, session):
+    token, user = await get_token(perms=("request.update",))
+
+    req_service = RequestService(name="test", display_name="test")
+    session.add(req_service)
+    await session.commit()
+    await session.refresh(req_service)
+    req_service = req_service.id
+
+    crud_request = CRUDRequest(session)
+    request_ids = []
+    for first_name in ("Ivan", "Petr"):
+        request = await crud_request.create(
+            RequestCreateWithNewClient.model_validate(
+                {
+                    "first_name": first_name,
+                    "phone": "+79999999999",
+                    "number_in_program": "123456789",
+                    "note": "test",
+                    "request_service_id": req_service,
+                }
+            )
+        )
+        request_ids.append(str(request.id))
+    un_existent_id = "9c6ff043-3f85-4db1-b6d8-c217d4aa8c1c"
+
+    response = await ac.patch(
+        "/api/v1/requests/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "ids": [*request_ids, un_existent_id],
+            "data": {"status": RequestStatus.LOST},
+        },
+    )
+    assert response.status_code == 200
+
+    json_response = response.json()
+
+    assert [result["id"] for result in json_response] == [
+        *request_ids,
+        un_existent_id,
+    ]
+    assert [result["status"] for result in json_response] == [
+        "updated",
+        "updated",
+        "not_found",
+    ]
+    assert json_response[0]["request"]["status"] == RequestStatus.LOST
+    assert json_response[0]["request"]["client"]["user"]["first_name"] == "Ivan"
+    assert json_response[1]["request"]["status"] == RequestStatus.LOST
+    assert json_response[2]["request"] is None
+
+
+async def test_update_requests_bulk_with_un_existent_service(ac, get_token, session):
+    token, user = await get_token(perms=("request.update",))
+
+    req_service = RequestService(name="test", display_name="test")
+    session.add(req_service)
+    await session.commit()
+    await session.refresh(req_service)
+
+    request = await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "request_service_id": req_service.id,
+            }
+        )
+    )
+
+    response = await ac.patch(
+        "/api/v1/requests/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"ids": [str(request.id)], "data": {"request_service_id": -1}},
+    )
+    assert response.status_code == 409
+
+
+async def test_remove_requests_bulk_successfully(ac, get_token, session):
+    token, user = await get_token(perms=("request.remove",))
+
+    req_service = RequestService(name="test", display_name="test")
+    session.add(req_service)
+    await session.commit()
+    await session.refresh(req_service)
+
+    request = await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "request_service_id": req_service.id,
+            }
+        )
+    )
+    request_id = str(request.id)
+    un_existent_id = "9c6ff043-3f85-4db1-b6d8-c217d4aa8c1c"
+
+    response = await ac.delete(
+        "/api/v1/requests/bulk",
+        params={"ids": [request_id, un_existent_id]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+
+    json_response = response.json()
+
+    assert json_response[0]["id"] == request_id
+    assert json_response[0]["status"] == "removed"
+    assert json_response[0]["request"]["client"]["user"]["first_name"] == "Ivan"
+    assert json_response[1]["id"] == un_existent_id
+    assert json_response[1]["status"] == "not_found"
+
+    assert await CRUDRequest(session).fetch(request_id) is None
+
+
+async def test_get_requests_board(ac, get_token, session):
+    token, _ = await get_token(perms=("request.get",))
+
+    req_service = RequestService(name="test", display_name="test")
+    session.add(req_service)
+    await session.commit()
+    await session.refresh(req_service)
+    req_service = req_service.id
+
+    request = await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "request_service_id": req_service,
+            }
+        )
+    )
+    dt_now = datetime.now()
+    requests = [
+        Request(
+            client_id=request.client_id,
+            request_service_id=req_service,
+            status=RequestStatus.ON_MEASURE,
+            updated_at=dt_now - timedelta(minutes=i),
+        )
+        for i in range(5)
+    ]
+    on_measure_ids = [str(request.id) for request in requests]
+    session.add_all(requests)
+    await session.commit()
+
+    response = await ac.get(
+        "/api/v1/requests/board",
+        params={"limit": 2},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+
+    board = {column["status"]: column for column in response.json()}
+    assert list(board) == list(RequestStatus)
+    assert board[RequestStatus.NEW]["count"] == 1
+    assert board[RequestStatus.NEW]["next_cursor"] is None
+    assert board[RequestStatus.NEW]["requests"][0]["client"]["user"]["first_name"] == (
+        "Ivan"
+    )
+    assert board[RequestStatus.LOST] == {
+        "status": RequestStatus.LOST,
+        "count": 0,
+        "requests": [],
+        "next_cursor": None,
+    }
+
+    column = board[RequestStatus.ON_MEASURE]
+    assert column["count"] == 5
+    fetched_ids = [request["id"] for request in column["requests"]]
+    while column["next_cursor"]:
+        response = await ac.get(
+            "/api/v1/requests/board",
+            params={"limit": 2, "cursors": column["next_cursor"]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        (column,) = response.json()
+        assert column["status"] == RequestStatus.ON_MEASURE
+        fetched_ids += [request["id"] for request in column["requests"]]
+
+    assert fetched_ids == on_measure_ids
+
+
+async def test_get_requests_board_with_invalid_cursor(ac, get_token):
+    token, _ = await get_token(perms=("request.get",))
+
+    response = await ac.get(
+        "/api/v1/requests/board",
+        params={"cursors": "invalid"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 400
+
+    # Well-formed, but of wrong types
+    for values in ((0, "2024-01-01T00:00:00", 5), ("new", "2024-01-01T00:00:00")):
+        response = await ac.get(
+            "/api/v1/requests/board",
+            params={"cursors": encode_cursor(*values)},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 400
+
+
+async def test_get_requests_filtered(ac, get_token, session):
+    token, _ = await get_token(perms=("request.get",))
+
+    services = [RequestService(name=f"test{i}", display_name="test") for i in range(2)]
+    session.add_all(services)
+    await session.flush()
+    service_ids = [service.id for service in services]
+    await session.commit()
+
+    request = await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "request_service_id": service_ids[0],
+            }
+        )
+    )
+    client_id = request.client_id
+    dt_now = datetime.now()
+    requests = [
+        Request(
+            client_id=client_id,
+            request_service_id=service_ids[i % 2],
+            status=status,
+            created_at=dt_now - timedelta(days=i),
+            updated_at=dt_now - timedelta(hours=i),
+        )
+        for i, status in enumerate(
+            (
+                RequestStatus.ON_MEASURE,
+                RequestStatus.ON_MEASURE,
+                RequestStatus.ON_MEASURE,
+                RequestStatus.LOST,
+                RequestStatus.COMPLETED,
+            ),
+            1,
+        )
+    ]
+    request_ids = [str(request.id) for request in requests]
+    session.add_all(requests)
+    await session.commit()
+
+    async def get_ids(**params) -> list[str]:
+        response = await ac.get(
+            "/api/v1/requests",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        return [request["id"] for request in response.json()]
+
+    assert await get_ids(
+        status=RequestStatus.ON_MEASURE,
+        request_service_id=service_ids[1],
+        order_by="updated_at",
+        order="descendent",
+    ) == [request_ids[0], request_ids[2]]
+    assert await get_ids(
+        status=[RequestStatus.LOST, RequestStatus.COMPLETED], order_by="created_at"
+    ) == [request_ids[4], request_ids[3]]
+    assert await get_ids(closed=True, order_by="created_at") == [
+        request_ids[4],
+        request_ids[3],
+    ]
+    assert len(await get_ids(closed=False, client_id=str(client_id))) == 4
+    assert await get_ids(
+        created_from=(dt_now - timedelta(days=3, hours=1)).isoformat(),
+        created_to=(dt_now - timedelta(days=1, hours=1)).isoformat(),
+        order_by="created_at",
+        order="descendent",
+    ) == [request_ids[1], request_ids[2]]
+    assert await get_ids(
+        updated_from=(dt_now - timedelta(hours=1, minutes=30)).isoformat(),
+        status=RequestStatus.ON_MEASURE,
+    ) == [request_ids[0]]
+
+
+async def test_export_requests(ac, get_token, session):
+    token, _ = await get_token(perms=("request.get",))
+
+    client = await CRUDClient(session).create(
+        ClientCreate.model_validate(
+            {"first_name": "Иван", "last_name": "Петров", "phone": "+79999999999"}
+        )
+    )
+    service = RequestService(name="test", display_name="test")
+    session.add_all((client, service))
+    await session.flush()
+    requests = [
+        Request(
+            client_id=client.id,
+            request_service_id=service.id,
+            status=status,
+            note=note,
+        )
+        for status, note in (
+            (RequestStatus.NEW, 'Кухня, "угловая"'),
+            (RequestStatus.LOST, None),
+            (RequestStatus.ORDER, "Шкаф\nкупе"),
+        )
+    ]
+    request_ids = [str(request.id) for request in requests]
+    client_id, service_id = str(client.id), str(service.id)
+    session.add_all(requests)
+    await session.commit()
+
+    response = await ac.get(
+        "/api/v1/requests/export",
+        params={"closed": False, "first_name": "Иван", "order": "descendent"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert (
+        response.headers["content-disposition"] == 'attachment; filename="requests.csv"'
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [request_ids[2], request_ids[0]]
+    assert rows[0]["note"] == "Шкаф\nкупе"
+    assert rows[1] == {
+        "id": request_ids[0],
+        "status": str(RequestStatus.NEW.value),
+        "note": 'Кухня, "угловая"',
+        "number_in_program": "",
+        "request_service_id": service_id,
+        "client_id": client_id,
+        "client_first_name": "Иван",
+        "client_last_name": "Петров",
+        "client_phone": "+79999999999",
+        "client_email": "",
+        "created_at": rows[1]["created_at"],
+        "updated_at": rows[1]["updated_at"],
+    }
+    datetime.fromisoformat(rows[1]["created_at"])
+
+    response = await ac.get(
+        "/api/v1/requests/export",
+        params={"format": "ndjson", "status": RequestStatus.LOST},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["id"] == request_ids[1]
+    assert rows[0]["status"] == RequestStatus.LOST
+    assert rows[0]["note"] is None
+
+
+async def test_search_requests(ac, get_token, session):
+    token, _ = await get_token(perms=("request.get",))
+
+    client = await CRUDClient(session).create(
+        ClientCreate.model_validate({"first_name": "Ivan", "phone": "+79999999999"})
+    )
+    service = RequestService(name="test", display_name="test")
+    session.add_all((client, service))
+    await session.flush()
+    requests = [
+        Request(
+            client_id=client.id,
+            request_service_id=service.id,
+            note=note,
+            number_in_program=number_in_program,
+        )
+        for note, number_in_program in (
+            ("Кухня угловая, замер в пятницу", "АВ-1024"),
+            ("Шкаф-купе в прихожую", "1024"),
+            ("Две кухни с гарнитуром", None),
+            (None, None),
+        )
+    ]
+    request_ids = [str(request.id) for request in requests]
+    session.add_all(requests)
+    await session.commit()
+
+    async def search(q):
+        response = await ac.get(
+            "/api/v1/requests/search",
+            params={"q": q},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    # By word beginnings and by Russian stems
+    assert {result["request"]["id"] for result in await search("кухн")} == {
+        request_ids[0],
+        request_ids[2],
+    }
+    assert {result["request"]["id"] for result in await search("КУХНИ")} == {
+        request_ids[0],
+        request_ids[2],
+    }
+    results = await search("угловую кухню")
+    assert [result["request"]["id"] for result in results] == [request_ids[0]]
+    assert results[0]["note_headline"] == (
+        "<b>Кухня</b> <b>угловая</b>, замер в пятницу"
+    )
+
+    # Exact numbers first
+    results = await search("1024")
+    assert [result["request"]["id"] for result in results] == request_ids[1::-1]
+    assert results[0]["number_in_program_headline"] == "<b>1024</b>"
+    assert results[0]["request"]["client"]["user"]["first_name"] == "Ivan"
+
+    # Query syntax is ignored
+    results = await search("пятн:* | !диван")
+    assert [result["request"]["id"] for result in results] == []
+    results = await search("(пятниц)")
+    assert [result["request"]["id"] for result in results] == [request_ids[0]]
+    assert await search("!&|") == []
+    assert await search("диван") == []
+
+
+async def test_request_history(ac, get_token, session):
+    token, user = await get_token(perms=("request.get", "request.update"))
+    user_id = str(user.id)
+
+    req_service = RequestService(name="test", display_name="test")
+    session.add(req_service)
+    await session.commit()
+    await session.refresh(req_service)
+
+    request = await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "request_service_id": req_service.id,
+            }
+        )
+    )
+    request_id = request.id
+    dt_now = datetime.now()
+    session.add_all(
+        RequestHistory(
+            request_id=request_id, text=f"old {i}", created_at=dt_now - timedelta(i)
+        )
+        for i in range(1, 4)
+    )
+    await session.commit()
+
+    response = await ac.post(
+        f"/api/v1/requests/{request_id}/history",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"text": "new"},
+    )
+    assert response.status_code == 201
+    assert response.json()["author_id"] == user_id
+
+    texts = []
+    params = {"limit": 3}
+    while True:
+        response = await ac.get(
+            f"/api/v1/requests/{request_id}/history",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        texts += [record["text"] for record in response.json()["items"]]
+        if not response.json()["next_cursor"]:
+            break
+        params["cursor"] = response.json()["next_cursor"]
+
+    assert texts == ["new", "old 1", "old 2", "old 3"]
+
+    for cursor in ("invalid", encode_cursor("2024-01-01T00:00:00", 5)):
+        response = await ac.get(
+            f"/api/v1/requests/{request_id}/history",
+            params={"cursor": cursor},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 400
+
+    response = await ac.get(
+        f"/api/v1/requests/{request_id}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert "changes_history" not in response.json()
+
+
+async def test_request_history_with_un_existent_id(ac, get_token):
+    token, _ = await get_token(perms=("request.get", "request.update"))
+    un_existent_id = "9c6ff043-3f85-4db1-b6d8-c217d4aa8c1c"
+
+    response = await ac.get(
+        f"/api/v1/requests/{un_existent_id}/history",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 404
+
+    response = await ac.post(
+        f"/api/v1/requests/{un_existent_id}/history",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"text": "new"},
+    )
+    assert response.status_code == 404
@@ -0,0 +1,221 @@
+from datetime import date, datetime
+
+from sqlmodel import update
+
+from app.crud.client import CRUDClient
+from app.crud.request import CRUDRequest
+from app.models import Request, RequestService
+from app.models.request import RequestStatus
+from app.schemas.client import ClientCreate
+from app.schemas.request import RequestCreateWithNewClient
+
+
+async def test_get_requests_stats(ac, get_token, session):
+    token, _ = await get_token(perms=("request.get", "request.update"))
+
+    services = [RequestService(name=f"test{i}", display_name="test") for i in range(2)]
+    session.add_all(services)
+    await session.flush()
+    service_ids = [service.id for service in services]
+    await session.commit()
+
+    request = await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "request_service_id": service_ids[0],
+            }
+        )
+    )
+    client_id, request_id = request.client_id, request.id
+    requests = [
+        Request(
+            client_id=client_id,
+            request_service_id=service_ids[1],
+            status=RequestStatus.ORDER,
+            created_at=datetime(2024, month, 15),
+        )
+        for month in (1, 1, 2)
+    ]
+    removed_id = requests[-1].id
+    session.add_all(requests)
+    await session.commit()
+
+    response = await ac.patch(
+        "/api/v1/requests/bulk",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"ids": [str(request_id)], "data": {"status": RequestStatus.LOST}},
+    )
+    assert response.status_code == 200
+    await CRUDRequest(session).remove_many([removed_id])
+
+    response = await ac.get(
+        "/api/v1/stats/requests",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+
+    assert response.json() == {
+        "total": 3,
+        "by_status": [
+            {"status": RequestStatus.ORDER, "count": 2},
+            {"status": RequestStatus.LOST, "count": 1},
+        ],
+        "by_request_service": [
+            {"request_service_id": service_ids[0], "count": 1},
+            {"request_service_id": service_ids[1], "count": 2},
+        ],
+        "by_month": [
+            {"month": "2024-01-01", "count": 2},
+            {"month": date.today().replace(day=1).isoformat(), "count": 1},
+        ],
+    }
+
+    response = await ac.get(
+        "/api/v1/stats/requests",
+        params={"month_from": "2024-01-10", "month_to": "2024-12-01"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+    assert response.json()["by_status"] == [{"status": RequestStatus.ORDER, "count": 2}]
+
+
+async def test_get_requests_stats_empty(ac, get_token, session):
+    token, _ = await get_token(perms=("request.get",))
+    empty = {"total": 0, "by_status": [], "by_request_service": [], "by_month": []}
+
+    response = await ac.get(
+        "/api/v1/stats/requests",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == empty
+
+    service = RequestService(name="test", display_name="test")
+    session.add(service)
+    await session.flush()
+    service_id = service.id
+    await session.commit()
+    await CRUDRequest(session).create(
+        RequestCreateWithNewClient.model_validate(
+            {
+                "first_name": "Ivan",
+                "phone": "+79999999999",
+                "request_service_id": service_id,
+            }
+        )
+    )
+
+    response = await ac.get(
+        "/api/v1/stats/requests",
+        params={"month_from": "2000-01-01", "month_to": "2000-12-01"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == empty
+
+
+async def test_get_requests_status_times(ac, get_token, session):
+    token, _ = await get_token(perms=("request.get",))
+
+    client = await CRUDClient(session).create(
+        ClientCreate.model_validate({"first_name": "Ivan", "phone": "+79999999999"})
+    )
+    service = RequestService(name="test", display_name="test")
+    session.add_all((client, service))
+    await session.flush()
+    client_id, service_id = client.id, service.id
+
+    requests = [
+        Request(
+            client_id=client_id,
+            request_service_id=service_id,
+            created_at=datetime(2024, 1, 1),
+        )
+        for _ in range(2)
+    ]
+    request_ids = [request.id for request in requests]
+    session.add_all(requests)
+    await session.commit()
+
+    for request_id, changes in zip(
+        request_ids,
+        (
+            (
+                (1, RequestStatus.ON_MEASURE),
+                (1, RequestStatus.ON_MEASURE),
+                (3, RequestStatus.ORDER),
+            ),
+            ((3, RequestStatus.ON_MEASURE), (4, RequestStatus.LOST)),
+        ),
+        strict=True,
+    ):
+        for hour, status in changes:
+            await session.exec(
+                update(Request)
+                .where(Request.id == request_id)
+                .values(status=status, updated_at=datetime(2024, 1, 1, hour))
+            )
+            await session.commit()
+
+    response = await ac.get(
+        "/api/v1/stats/requests/statuses",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "status": RequestStatus.NEW,
+            "entered": 2,
+            "left": 2,
+            "avg_seconds": 7200,
+            "median_seconds": 7200,
+            "p90_seconds": 10080,
+            "next_statuses": [
+                {"status": RequestStatus.ON_MEASURE, "count": 2, "rate": 1},
+            ],
+        },
+        {
+            "status": RequestStatus.ON_MEASURE,
+            "entered": 2,
+            "left": 2,
+            "avg_seconds": 5400,
+            "median_seconds": 5400,
+            "p90_seconds": 6840,
+            "next_statuses": [
+                {"status": RequestStatus.ORDER, "count": 1, "rate": 0.5},
+                {"status": RequestStatus.LOST, "count": 1, "rate": 0.5},
+            ],
+        },
+        {
+            "status": RequestStatus.ORDER,
+            "entered": 1,
+            "left": 0,
+            "avg_seconds": None,
+            "median_seconds": None,
+            "p90_seconds": None,
+            "next_statuses": [],
+        },
+        {
+            "status": RequestStatus.LOST,
+            "entered": 1,
+            "left": 0,
+            "avg_seconds": None,
+            "median_seconds": None,
+            "p90_seconds": None,
+            "next_statuses": [],
+        },
+    ]
+
+    response = await ac.get(
+        "/api/v1/stats/requests/statuses",
+        params={"since": "2024-01-01T02:00:00", "until": "2024-01-01T04:00:00"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert [
+        (time["status"], time["entered"], time["left"], time["avg_seconds"])
+        for time in response.json()
+    ] == [(RequestStatus.ON_MEASURE, 1, 1, 3600), (RequestStatus.ORDER, 1, 0, None)]
@@ -0,0 +1,186 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.crud.client import CRUDClient
+from app.crud.request import CRUDRequest
+from app.db import connect_args
+from app.models import Attach, AttachGroup, Request, RequestService, User
+from app.schemas.client import ClientCreate
+from app.utils.cursor import encode_cursor
+from tests import conftest
+from tests.conftest import engine
+
+
+async def test_sync(ac, get_token, session, monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_OVERLAP", 0)
+    token, user = await get_token(perms=("request.get", "client.get", "attach.get"))
+    user_id = user.id
+
+    client = await CRUDClient(session).create(
+        ClientCreate.model_validate({"first_name": "Ivan", "phone": "+79999999999"})
+    )
+    client_id, client_user_id = client.id, client.user_id
+    service = RequestService(name="test", display_name="test")
+    group = AttachGroup(title="Photos")
+    session.add_all((service, group))
+    await session.flush()
+    service_id, group_id = service.id, group.id
+
+    requests = [
+        Request(client_id=client_id, request_service_id=service_id) for _ in range(2)
+    ]
+    request_ids = [request.id for request in requests]
+    session.add_all(requests)
+    await session.flush()
+    attach = Attach(
+        path="test.txt",
+        original_name="test.txt",
+        content_type="text/plain",
+        size=10,
+        creator_id=user_id,
+        group_id=group_id,
+        request_id=request_ids[0],
+    )
+    attach_id = attach.id
+    session.add(attach)
+    await session.commit()
+
+    # First sync, a page per object
+    synced: dict[str, list] = {
+        "requests": [],
+        "clients": [],
+        "attachs": [],
+        "attach_groups": [],
+    }
+    sync_token, pages = None, 0
+    while True:
+        response = await ac.get(
+            "/api/v1/sync",
+            params={"limit": 1} | ({"since": sync_token} if sync_token else {}),
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        pages += 1
+        for name, objs in synced.items():
+            objs.extend(obj["id"] for obj in response.json()[name])
+        assert response.json()["deleted"] == {
+            "requests": [],
+            "clients": [],
+            "attachs": [],
+            "attach_groups": [],
+        }
+        sync_token = response.json()["token"]
+        if not response.json()["has_more"]:
+            break
+
+    assert pages == 2
+    assert synced == {
+        "requests": [str(request_id) for request_id in request_ids],
+        "clients": [str(client_id)],
+        "attachs": [str(attach_id)],
+        "attach_groups": [group_id],
+    }
+
+    response = await ac.get(
+        "/api/v1/sync",
+        params={"since": sync_token},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert not response.json()["has_more"]
+    assert not any(response.json()[name] for name in synced)
+    sync_token = response.json()["token"]
+
+    # Only the user of the client is changed
+    await session.exec(
+        update(User).where(User.id == client_user_id).values(first_name="Petr")
+    )
+    await session.exec(
+        update(AttachGroup).where(AttachGroup.id == group_id).values(title="Docs")
+    )
+    await session.commit()
+    await CRUDRequest(session).remove_many([request_ids[1]])
+
+    response = await ac.get(
+        "/api/v1/sync",
+        params={"since": sync_token},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["requests"] == []
+    assert response.json()["attachs"] == []
+    assert [
+        (client["id"], client["user"]["first_name"])
+        for client in response.json()["clients"]
+    ] == [(str(client_id), "Petr")]
+    assert response.json()["attach_groups"] == [{"id": group_id, "title": "Docs"}]
+    assert response.json()["deleted"] == {
+        "requests": [str(request_ids[1])],
+        "clients": [],
+        "attachs": [],
+        "attach_groups": [],
+    }
+    assert not response.json()["has_more"]
+
+    response = await ac.get(
+        "/api/v1/sync",
+        params={"since": "invalid"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 400
+
+    # Tombstones of the deletions since then may be gone
+    expired = datetime.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION + 1)
+    response = await ac.get(
+        "/api/v1/sync",
+        params={"since": encode_cursor(expired, None, {})},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 410
+
+
+async def test_sync_with_database_in_other_time_zone(
+    ac, get_token, session, monkeypatch
+):
+    monkeypatch.setattr(settings, "SYNC_OVERLAP", 0)
+    token, _ = await get_token(perms=("request.get", "client.get", "attach.get"))
+
+    # The app in Moscow, the database server in UTC
+    monkeypatch.setenv("TZ", "Europe/Moscow")
+    time.tzset()
+    zoned_engine = create_async_engine(engine.url, connect_args=connect_args())
+    monkeypatch.setattr(conftest, "engine", zoned_engine)
+    try:
+        async with AsyncSession(zoned_engine) as zoned_session:
+            client = await CRUDClient(zoned_session).create(
+                ClientCreate.model_validate({"first_name": "Ivan", "phone": None})
+            )
+            service = RequestService(name="test", display_name="test")
+            zoned_session.add(service)
+            await zoned_session.flush()
+            request = Request(client_id=client.id, request_service_id=service.id)
+            request_id = request.id
+            zoned_session.add(request)
+            await zoned_session.commit()
+
+            response = await ac.get(
+                "/api/v1/sync", headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.json()["requests"][0]["id"] == str(request_id)
+
+            await CRUDRequest(zoned_session).remove_many([request_id])
+            response = await ac.get(
+                "/api/v1/sync",
+                params={"since": response.json()["token"]},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.json()["deleted"]["requests"] == [str(request_id)]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+        await zoned_engine.dispose()
@@ -1,3 +1,5 @@
+from uuid import uuid4
+
 from app.models import User
 
 
@@ -166,3 +168,42 @@ async def test_remove_user_with_un_existent_id(ac, get_token):
         headers={"Authorization": f"Bearer {token}"},
     )
     assert response.status_code == 404
+
+
+async def test_revoke_user_logins(ac, get_token, create_user, session):
+    token, _ = await get_token(perms=("user.update",))
+    user = await create_user("test_revoke_logins", "test")
+
+    user_tokens = []
+    for _ in range(2):
+        response = await ac.post(
+            "/api/v1/login", data={"username": "test_revoke_logins", "password": "test"}
+        )
+        user_tokens.append(response.json()["access_token"])
+
+    response = await ac.delete(
+        f"/api/v1/users/{user.id}/logins",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 204
+
+    for user_token in user_tokens:
+        response = await ac.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {user_token}"}
+        )
+        assert response.status_code == 401
+
+    response = await ac.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+
+
+async def test_revoke_user_logins_not_found(ac, get_token):
+    token, _ = await get_token(perms=("user.update",))
+
+    response = await ac.delete(
+        f"/api/v1/users/{uuid4()}/logins",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 404
@@ -11,13 +11,15 @@ from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.db import get_session
+from app.db import connect_args, get_session
 from app.main import app
 from app.models import *  # noqa: F403
 from app.utils.bcrypt import get_password_hash
 
 url = "http://test"
-engine = create_async_engine(os.getenv("TEST_DATABASE_URL"), echo=True, future=True)
+engine = create_async_engine(
+    os.getenv("TEST_DATABASE_URL"), echo=True, future=True, connect_args=connect_args()
+)
 
 
 async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -0,0 +1,56 @@
+from app.utils import cache as cache_module
+from app.utils.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_lru_cache_expires_values(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now)
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+
+    now += 9
+    assert cache.get("a") == 1
+    now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_pop_and_clear():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_evicts_tagged_values():
+    cache = LRUCache(maxsize=3, ttl=60)
+    cache.set("a", 1, tags=(("client", "1"), ("user", "1")))
+    cache.set("b", 2, tags=(("client", "2"),))
+    cache.set("c", 3, tags=(("user", "1"),))
+
+    cache.evict(("user", "1"))
+    cache.evict(("user", "missing"))
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (None, 2, None)
+
+    # Tags of replaced values are forgotten
+    cache.set("b", 4)
+    cache.evict(("client", "2"))
+    assert cache.get("b") == 4
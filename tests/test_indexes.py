@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Table, UniqueConstraint
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401
+
+
+def _column_names(columns) -> tuple[str, ...]:
+    return tuple(column.name for column in columns if isinstance(column, Column))
+
+
+def _leading_columns(table: Table) -> list[tuple[str, ...]]:
+    """Column lists usable for lookups: primary key, unique constraints, indexes."""
+    leading = [_column_names(table.primary_key.columns)]
+    leading += [
+        _column_names(constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+    leading += [_column_names(index.expressions) for index in table.indexes]
+    return leading
+
+
+def test_foreign_keys_are_indexed():
+    missing = []
+    for table in SQLModel.metadata.sorted_tables:
+        leading = _leading_columns(table)
+        for constraint in table.foreign_key_constraints:
+            columns = _column_names(constraint.columns)
+            if not any(index[: len(columns)] == columns for index in leading):
+                missing.append(f"{table.name}({', '.join(columns)})")
+
+    assert not missing, f"Foreign keys without an index: {', '.join(missing)}"
+
+
+def test_primary_keys_are_not_indexed_twice():
+    duplicates = [
+        index.name
+        for table in SQLModel.metadata.sorted_tables
+        for index in table.indexes
+        if _column_names(index.expressions) == _column_names(table.primary_key.columns)
+    ]
+
+    assert not duplicates, f"Indexes duplicating primary keys: {duplicates}"
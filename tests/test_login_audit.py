@@ -0,0 +1,104 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import func, select
+
+from app.core.audit import LoginAuditWriter
+from app.models import User, UserLoginSucceed
+from tests.conftest import engine
+
+
+async def test_login_audit_batches(session, tmp_path):
+    user = User(username="test_audit", first_name="Ivan")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    writer = LoginAuditWriter(
+        engine, batch_size=2, flush_interval=50, spool_path=tmp_path / "spool"
+    )
+    await writer.start()
+    for _ in range(3):
+        writer.write(UserLoginSucceed(user_id=user.id, agent_data={}), session)
+    assert not session.new
+
+    await asyncio.sleep(0.2)
+    query = select(func.count()).select_from(UserLoginSucceed)
+    assert (await session.exec(query)).one() == 3
+
+    writer.write(UserLoginSucceed(user_id=user.id, agent_data={}), session)
+    await writer.stop()
+    assert (await session.exec(query)).one() == 4
+    assert not (tmp_path / "spool").exists()
+
+
+async def test_login_audit_fallback_to_session(session, tmp_path):
+    writer = LoginAuditWriter(engine, max_size=1, spool_path=tmp_path / "spool")
+    record = UserLoginSucceed(user_id=None, agent_data={})
+
+    writer.write(record, session)
+    assert record in session.new
+    session.expunge(record)
+
+    await writer.start()
+    writer.write(UserLoginSucceed(user_id=None, agent_data={}), session)
+    writer.write(record, session)
+    assert record in session.new
+    session.expunge(record)
+    await writer.stop()
+
+
+async def test_login_audit_spool(session, tmp_path):
+    user = User(username="test_audit", first_name="Ivan")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    broken_engine = create_async_engine(
+        engine.url.set(database="not_existing_database")
+    )
+    writer = LoginAuditWriter(broken_engine, spool_path=tmp_path / "spool")
+    await writer.start()
+    record = UserLoginSucceed(user_id=user.id, agent_data={"user_agent": "test"})
+    writer.write(record, session)
+    await writer.stop()
+    await broken_engine.dispose()
+    assert (tmp_path / "spool").exists()
+
+    writer = LoginAuditWriter(engine, spool_path=tmp_path / "spool")
+    await writer.start()
+    await writer.stop()
+    assert not (tmp_path / "spool").exists()
+
+    user_login_succeed = await session.get(
+        UserLoginSucceed, (record.id, record.created_at)
+    )
+    assert user_login_succeed.user_id == user.id
+    assert user_login_succeed.agent_data == {"user_agent": "test"}
+
+
+async def test_login_audit_spool_replayed_once(session, tmp_path):
+    user = User(username="test_audit", first_name="Ivan")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    records = [UserLoginSucceed(user_id=user.id, agent_data={}) for _ in range(3)]
+    (tmp_path / "spool").write_text(
+        "".join(record.model_dump_json() + "\n" for record in records[:2])
+    )
+    # Left claimed by a worker which failed to replay it
+    (tmp_path / "spool.0123456789abcdef.replay").write_text(
+        records[2].model_dump_json() + "\n"
+    )
+
+    # Workers starting together
+    writers = [
+        LoginAuditWriter(engine, spool_path=tmp_path / "spool") for _ in range(3)
+    ]
+    await asyncio.gather(*(writer.start() for writer in writers))
+    await asyncio.gather(*(writer.stop() for writer in writers))
+
+    assert list(tmp_path.iterdir()) == []
+    query = select(func.count()).select_from(UserLoginSucceed)
+    assert (await session.exec(query)).one() == 3
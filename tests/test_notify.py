@@ -0,0 +1,125 @@
+import asyncio
+
+from sqlalchemy import insert, text
+from sqlmodel import update
+
+from app.core.notify import ChangeListener
+from app.crud.client import CRUDClient
+from app.crud.request import CRUDRequest
+from app.models import Client, Request, RequestService
+from app.schemas.client import ClientCreate
+from app.utils.cache import LRUCache
+from tests.conftest import engine
+
+
+async def test_change_listener(session):
+    client = await CRUDClient(session).create(
+        ClientCreate.model_validate({"first_name": "Ivan", "phone": "+79999999999"})
+    )
+    service = RequestService(name="test", display_name="test")
+    session.add(service)
+    await session.flush()
+    client_id, service_id = client.id, service.id
+    await session.commit()
+
+    listener = ChangeListener(
+        engine, buffer_size=2, check_interval=0.1, reconnect_interval=0.1
+    )
+    with (
+        listener.subscribe(frozenset({"request"})) as requests,
+        listener.subscribe(frozenset({"client"})) as clients,
+    ):
+        await listener.start()
+        try:
+            # Events before the connection can't be known
+            assert await asyncio.wait_for(requests.get(), 5) is None
+            assert await asyncio.wait_for(clients.get(), 5) is None
+
+            rows = [
+                Request(client_id=client_id, request_service_id=service_id)
+                for _ in range(150)
+            ]
+            request_ids = [str(row.id) for row in rows]
+            await session.exec(
+                insert(Request).values([row.model_dump() for row in rows])
+            )
+            await session.commit()
+            events = [await asyncio.wait_for(requests.get(), 5) for _ in range(2)]
+            assert [
+                (event.entity, event.action, len(event.ids)) for event in events
+            ] == [
+                ("request", "insert", 100),
+                ("request", "insert", 50),
+            ]
+            assert sorted(events[0].ids + events[1].ids) == sorted(request_ids)
+
+            await CRUDRequest(session).remove_many([request_ids[0]])
+            event = await asyncio.wait_for(requests.get(), 5)
+            assert (event.action, event.ids) == ("delete", [request_ids[0]])
+
+            # Too many events for the buffer of requests
+            for note in ("a", "b", "c"):
+                await CRUDRequest(session).update_many([request_ids[1]], {"note": note})
+            await session.exec(
+                update(Client).where(Client.id == client_id).values(note="test")
+            )
+            await session.commit()
+            event = await asyncio.wait_for(clients.get(), 5)
+            assert (event.entity, event.action, event.ids) == (
+                "client",
+                "update",
+                [str(client_id)],
+            )
+            assert await asyncio.wait_for(requests.get(), 5) is None
+
+            # Reconnected after the connection is lost
+            await session.exec(
+                text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE query IN ('LISTEN \"changes\"', 'SELECT 1')"
+                )
+            )
+            assert await asyncio.wait_for(clients.get(), 5) is None
+            assert listener.is_running
+        finally:
+            await listener.stop()
+
+
+async def test_change_listener_evicts_caches(session):
+    client = await CRUDClient(session).create(
+        ClientCreate.model_validate({"first_name": "Ivan", "phone": "+79999999999"})
+    )
+    await session.flush()
+    client_id, user_id = client.id, client.user_id
+    await session.commit()
+
+    cache = LRUCache(maxsize=10, ttl=60)
+    listener = ChangeListener(engine, check_interval=0.1, reconnect_interval=0.1)
+    listener.register_cache(cache, ("client", "user"))
+    with listener.subscribe(frozenset({"client", "user"})) as subscription:
+        await listener.start()
+        try:
+            assert await asyncio.wait_for(subscription.get(), 5) is None
+            cache.set("client", 1, tags=(("client", str(client_id)),))
+            cache.set("user", 2, tags=(("user", str(user_id)),))
+            cache.set("other", 3, tags=(("client", "other"),))
+
+            await session.exec(
+                update(Client).where(Client.id == client_id).values(note="test")
+            )
+            await session.commit()
+            await asyncio.wait_for(subscription.get(), 5)
+            assert (cache.get("client"), cache.get("user")) == (None, 2)
+            assert cache.get("other") == 3
+
+            # Changes could be missed while reconnecting
+            await session.exec(
+                text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE query IN ('LISTEN \"changes\"', 'SELECT 1')"
+                )
+            )
+            assert await asyncio.wait_for(subscription.get(), 5) is None
+            assert len(cache) == 0
+        finally:
+            await listener.stop()
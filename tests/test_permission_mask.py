@@ -0,0 +1,57 @@
+from sqlmodel import delete, select
+
+from app.models import Permission, Role, RolePermission, User, UserRoles
+
+
+async def _masks(session, user_id, role_ids) -> tuple[int, list[int]]:
+    session.expire_all()
+    user = await session.get(User, user_id)
+    roles = [await session.get(Role, role_id) for role_id in role_ids]
+    return user.permissions_mask, [role.permissions_mask for role in roles]
+
+
+async def test_permission_masks(session):
+    permissions = [Permission(name=f"test.permission_{i}") for i in range(3)]
+    roles = [Role(name="first"), Role(name="second")]
+    user = User(username="test_masks", first_name="Ivan")
+    session.add_all((*permissions, *roles, user))
+    await session.flush()
+    permission_ids = [permission.id for permission in permissions]
+    role_ids = [role.id for role in roles]
+    user_id = user.id
+    await session.commit()
+
+    bits = (await session.exec(select(Permission.bit).order_by(Permission.id))).all()
+    assert bits == [0, 1, 2]
+
+    session.add_all(
+        (
+            RolePermission(role_id=role_ids[0], permission_id=permission_ids[0]),
+            RolePermission(role_id=role_ids[0], permission_id=permission_ids[1]),
+            RolePermission(role_id=role_ids[1], permission_id=permission_ids[2]),
+            UserRoles(user_id=user_id, role_id=role_ids[0]),
+        )
+    )
+    await session.commit()
+    assert await _masks(session, user_id, role_ids) == (0b011, [0b011, 0b100])
+
+    session.add(UserRoles(user_id=user_id, role_id=role_ids[1]))
+    await session.commit()
+    assert await _masks(session, user_id, role_ids) == (0b111, [0b011, 0b100])
+
+    await session.exec(
+        delete(RolePermission).where(RolePermission.permission_id == permission_ids[1])
+    )
+    await session.commit()
+    assert await _masks(session, user_id, role_ids) == (0b101, [0b001, 0b100])
+
+    await session.exec(delete(Role).where(Role.id == role_ids[1]))
+    await session.commit()
+    assert await _masks(session, user_id, role_ids[:1]) == (0b001, [0b001])
+
+    # Bits of removed permissions are reused
+    await session.exec(delete(Permission).where(Permission.id == permission_ids[1]))
+    session.add(Permission(name="test.permission_new"))
+    await session.commit()
+    query = select(Permission.bit).where(Permission.name == "test.permission_new")
+    assert (await session.exec(query)).one() == 1
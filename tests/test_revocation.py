@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.core.revocation import RevocationFilter
+from app.models import RevokedLogin, User
+from tests.conftest import engine
+
+
+async def test_revocation_filter_refresh(session):
+    user = User(username="test_revocation", first_name="Ivan")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_id = user.id
+
+    dt_now = datetime.now()
+    revoked_id, expired_id, late_id = uuid4(), uuid4(), uuid4()
+    session.add_all(
+        (
+            RevokedLogin(
+                login_id=revoked_id,
+                user_id=user_id,
+                expires_at=dt_now + timedelta(hours=1),
+            ),
+            RevokedLogin(
+                login_id=expired_id,
+                user_id=user_id,
+                expires_at=dt_now - timedelta(minutes=1),
+            ),
+        )
+    )
+    await session.commit()
+
+    revocation_filter = RevocationFilter(engine, overlap=60)
+    await revocation_filter.refresh()
+    assert revoked_id in revocation_filter
+    assert expired_id not in revocation_filter
+
+    # Committed after the refresh, but created before it
+    session.add(
+        RevokedLogin(
+            login_id=late_id,
+            user_id=user_id,
+            expires_at=dt_now + timedelta(hours=1),
+            created_at=dt_now - timedelta(seconds=30),
+        )
+    )
+    await session.commit()
+
+    await revocation_filter.refresh()
+    assert revoked_id in revocation_filter
+    assert late_id in revocation_filter
+
+    login_id = uuid4()
+    revocation_filter.add(login_id, dt_now - timedelta(seconds=1))
+    assert login_id in revocation_filter
+    await revocation_filter.refresh()
+    assert login_id not in revocation_filter
@@ -0,0 +1,39 @@
+import random
+
+from sqlmodel import func, select
+
+from app.core.config import settings
+from app.core.seed import Seeder, SeedSize
+from app.models import Attach, Client, Request, User
+from tests.conftest import engine
+
+
+async def test_seed(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+    size = SeedSize(
+        users=3,
+        roles=2,
+        permissions=4,
+        clients=20,
+        request_services=2,
+        requests=50,
+        attach_groups=2,
+        attachs=10,
+        files=3,
+    )
+
+    counts = await Seeder(
+        engine, size, password="seed", batch_size=7, rnd=random.Random(1)
+    ).run()
+
+    assert counts["user"] == 23
+    assert counts["client"] == 20
+    assert counts["request"] == 50
+    assert 50 <= counts["request_history"] <= 250
+    assert counts["attach"] == 10
+    for model, count in ((User, 23), (Client, 20), (Request, 50), (Attach, 10)):
+        query = select(func.count()).select_from(model)
+        assert (await session.exec(query)).one() == count
+
+    attach = (await session.exec(select(Attach))).first()
+    assert attach.path.startswith(str(tmp_path))
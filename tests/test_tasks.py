@@ -0,0 +1,85 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlmodel import select
+
+from app.core import tasks
+from app.core.config import settings
+from app.core.tasks import (
+    _create_login_partition,
+    delete_expired_tombstones,
+    maintain_login_partitions,
+)
+from app.models import Tombstone, User, UserLoginSucceed
+from tests.conftest import engine
+
+
+async def _login_partitions() -> dict[str, int]:
+    async with engine.connect() as conn:
+        response = await conn.execute(
+            text(
+                "SELECT child.relname, "
+                "(SELECT count(*) FROM user_login_succeed "
+                "WHERE tableoid = child.oid) FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = 'user_login_succeed'::regclass"
+            )
+        )
+        return dict(response.all())
+
+
+async def test_maintain_login_partitions(session, monkeypatch):
+    monkeypatch.setattr(tasks, "engine", engine)
+    monkeypatch.setattr(settings, "LOGIN_PARTITIONS_AHEAD", 2)
+    monkeypatch.setattr(settings, "LOGIN_RETENTION_MONTHS", 12)
+
+    user = User(username="test_partitions", first_name="Ivan")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+    now = datetime.now()
+    expired = now - timedelta(days=2 * 365)
+    session.add_all(
+        UserLoginSucceed(user_id=user.id, agent_data={}, created_at=created_at)
+        for created_at in (now, now, now, expired)
+    )
+    await session.commit()
+
+    async with engine.begin() as conn:
+        await _create_login_partition(conn, date(expired.year, expired.month, 1))
+
+    # Run by all workers at once
+    await asyncio.gather(*(maintain_login_partitions() for _ in range(3)))
+
+    partitions = await _login_partitions()
+    current = f"user_login_succeed_y{now:%Y}m{now:%m}"
+    assert partitions[current] == 3
+    assert partitions["user_login_succeed_default"] == 0
+    assert f"user_login_succeed_y{expired:%Y}m{expired:%m}" not in partitions
+    assert len(partitions) == 4
+
+    # Idempotent
+    await maintain_login_partitions()
+    assert await _login_partitions() == partitions
+
+    response = await session.exec(select(UserLoginSucceed))
+    assert len(response.all()) == 3
+
+
+async def test_delete_expired_tombstones(session, monkeypatch):
+    monkeypatch.setattr(tasks, "engine", engine)
+    monkeypatch.setattr(settings, "SYNC_TOMBSTONE_RETENTION", 30)
+
+    now = datetime.now()
+    session.add_all(
+        Tombstone(table_name="request", row_id=str(i), deleted_at=deleted_at)
+        for i, deleted_at in enumerate((now, now - timedelta(days=31)))
+    )
+    await session.commit()
+
+    await delete_expired_tombstones()
+
+    response = await session.exec(select(Tombstone.row_id))
+    assert response.all() == ["0"]
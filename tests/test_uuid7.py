@@ -0,0 +1,34 @@
+import time
+from datetime import datetime, timedelta
+
+from app.utils import uuid7 as uuid7_module
+from app.utils.uuid7 import uuid7
+
+
+def test_uuid7_format():
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    created_at = datetime.fromtimestamp((value.int >> 80) / 1000)
+    assert abs(created_at - datetime.now()) < timedelta(seconds=1)
+
+
+def test_uuid7_monotonic():
+    values = [uuid7() for _ in range(10_000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_monotonic_on_counter_overflow_and_clock_change(monkeypatch):
+    now = time.time_ns()
+    monkeypatch.setattr(uuid7_module.time, "time_ns", lambda: now)
+    values = [uuid7() for _ in range(2 * uuid7_module.COUNTER_MAX)]
+    # Clock goes back
+    monkeypatch.setattr(uuid7_module.time, "time_ns", lambda: now - 10**9)
+    values += [uuid7() for _ in range(10)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert values[-1].int >> 80 > now // 1_000_000